@@ -0,0 +1,11 @@
+"""
+Набір навантажувальних тестів та бенчмарків платформи.
+
+    python -m benchmarks seed --users 10000 --posts 500000
+    python -m benchmarks run --mode client --output benchmarks/results/base.json
+    python -m benchmarks run --mode http --concurrency 16
+    python -m benchmarks compare benchmarks/results/base.json benchmarks/results/new.json
+
+Дані зберігаються в benchmarks/.data/ (SQLite) або в PostgreSQL за
+--database-url (локальний контейнер: benchmarks/docker-compose.yml).
+"""
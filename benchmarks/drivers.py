@@ -0,0 +1,249 @@
+"""
+Виконання сценаріїв: Flask test client та конкурентний HTTP-генератор.
+
+Для застосунку в тому ж процесі підключається інструментування: лічильник
+SQL-запитів на запит (заголовок X-Bench-Queries) та RSS процесу після
+кожного запиту. Для зовнішнього сервера (--url) вимірюються лише затримка
+та пропускна здатність.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import Flask, g
+from sqlalchemy import event
+
+from platform_app.core.database import db
+
+from benchmarks.scenarios import Sample, Scenario, login_form
+
+QUERIES_HEADER = "X-Bench-Queries"
+
+
+@dataclass
+class Measurement:
+    """Сирі результати одного сценарію"""
+
+    name: str
+    track_rss: bool = True
+    latencies: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    errors: int = 0
+    skipped: int = 0
+    rss_peak: int = 0
+    elapsed: float = 0.0
+    error_samples: List[str] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, latency: float, ok: bool, queries: Optional[int], detail: str) -> None:
+        rss = current_rss() if self.track_rss else 0
+        with self.lock:
+            self.latencies.append(latency)
+            if queries is not None:
+                self.queries.append(queries)
+            if rss > self.rss_peak:
+                self.rss_peak = rss
+            if not ok:
+                self.errors += 1
+                if len(self.error_samples) < 5:
+                    self.error_samples.append(detail)
+
+
+def current_rss() -> int:
+    """Поточний RSS процесу в байтах (0, якщо недоступно)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # ru_maxrss - пік, а не поточне значення (KB на Linux, байти на macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+    except (ImportError, AttributeError):
+        return 0
+
+
+def install_instrumentation(app: Flask) -> None:
+    """Лічильник SQL-запитів на HTTP-запит у заголовку X-Bench-Queries"""
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        if g:
+            g.bench_queries = g.get("bench_queries", 0) + 1
+
+    @app.after_request
+    def _queries_header(response):
+        response.headers[QUERIES_HEADER] = str(g.get("bench_queries", 0))
+        return response
+
+
+def _resolve(scenario: Scenario, sample: Sample) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
+    path = scenario.path(sample)
+    if path is None:
+        return None, None
+    return path, scenario.form(sample, path) if scenario.form else None
+
+
+def _detail(status: int, location: Optional[str]) -> str:
+    return f"{status} {location}" if location else str(status)
+
+
+# Flask test client
+
+
+class ClientDriver:
+    """Послідовні запити через app.test_client() - без мережі та сервера"""
+
+    def __init__(self, app: Flask, sample: Sample) -> None:
+        self.app = app
+        self.sample = sample
+        self.clients = {"anon": app.test_client(), "user": self._logged_in()}
+
+    def _logged_in(self):
+        client = self.app.test_client()
+        response = client.post("/auth/login", data=login_form())
+        if response.status_code != 302 or "/auth/" in response.headers.get("Location", ""):
+            raise RuntimeError("Не вдалося увійти користувачем бенчмарку")
+        return client
+
+    def _client_for(self, scenario: Scenario):
+        if scenario.client == "fresh":
+            return self.app.test_client()
+        if scenario.client == "login":
+            return self._logged_in()
+        return self.clients[scenario.client]
+
+    def run(self, scenario: Scenario, requests: int, warmup: int) -> Measurement:
+        measurement = Measurement(scenario.name)
+        for i in range(warmup + requests):
+            path, form = _resolve(scenario, self.sample)
+            if path is None:
+                measurement.skipped += 1
+                continue
+            client = self._client_for(scenario)
+
+            t0 = time.perf_counter()
+            response = client.open(path, method=scenario.method, data=form)
+            latency = time.perf_counter() - t0
+
+            location = response.headers.get("Location")
+            ok = scenario.is_ok(response.status_code, location)
+            if ok and location and scenario.on_redirect:
+                scenario.on_redirect(self.sample, location)
+            if i < warmup:
+                continue
+            # Запити послідовні: пропускна здатність рахується за часом самих запитів,
+            # без невимірюваної підготовки (вхід для сценарію виходу)
+            measurement.elapsed += latency
+            queries = response.headers.get(QUERIES_HEADER)
+            measurement.record(latency, ok, int(queries) if queries else None,
+                               _detail(response.status_code, location))
+        return measurement
+
+
+# HTTP
+
+
+def serve_in_thread(app: Flask, host: str = "127.0.0.1", port: int = 0):
+    """Запускає багатопотоковий werkzeug-сервер у фоновому потоці. Повертає (server, url)."""
+    from werkzeug.serving import make_server
+
+    # Журнал кожного запиту werkzeug спотворює вимірювання
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server(host, port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+class HttpDriver:
+    """Конкурентні HTTP-запити: кожен потік має власні сесії (requests.Session)"""
+
+    def __init__(self, base_url: str, sample: Sample, concurrency: int, timeout: float = 30.0,
+                 track_rss: bool = True) -> None:
+        import requests
+
+        self._requests = requests
+        self.base_url = base_url.rstrip("/")
+        self.sample = sample
+        self.timeout = timeout
+        self.track_rss = track_rss
+        self.local = threading.local()
+        # Пул живе весь прогін, щоб сесії потоків (і вхід) не створювались заново
+        self.pool = ThreadPoolExecutor(max_workers=concurrency)
+
+    def close(self) -> None:
+        self.pool.shutdown()
+
+    def _session(self, logged_in: bool):
+        session = self._requests.Session()
+        if logged_in:
+            response = session.post(f"{self.base_url}/auth/login", data=login_form(),
+                                    allow_redirects=False, timeout=self.timeout)
+            if response.status_code != 302 or "/auth/" in response.headers.get("Location", ""):
+                raise RuntimeError("Не вдалося увійти користувачем бенчмарку")
+        return session
+
+    def _session_for(self, scenario: Scenario):
+        if scenario.client == "fresh":
+            return self._session(False)
+        if scenario.client == "login":
+            return self._session(True)
+        sessions = getattr(self.local, "sessions", None)
+        if sessions is None:
+            sessions = self.local.sessions = {}
+        if scenario.client not in sessions:
+            sessions[scenario.client] = self._session(scenario.client == "user")
+        return sessions[scenario.client]
+
+    def _one(self, scenario: Scenario, measurement: Optional[Measurement]) -> None:
+        path, form = _resolve(scenario, self.sample)
+        if path is None:
+            if measurement is not None:
+                with measurement.lock:
+                    measurement.skipped += 1
+            return
+        session = self._session_for(scenario)
+
+        t0 = time.perf_counter()
+        try:
+            response = session.request(scenario.method, self.base_url + path, data=form,
+                                       allow_redirects=False, timeout=self.timeout)
+            status, location = response.status_code, response.headers.get("Location")
+            queries = response.headers.get(QUERIES_HEADER)
+        except self._requests.RequestException as e:
+            status, location, queries = 0, type(e).__name__, None
+        latency = time.perf_counter() - t0
+
+        ok = scenario.is_ok(status, location)
+        if ok and location and scenario.on_redirect:
+            scenario.on_redirect(self.sample, location)
+        if measurement is not None:
+            measurement.record(latency, ok, int(queries) if queries else None,
+                               _detail(status, location))
+
+    def run(self, scenario: Scenario, requests: int, warmup: int) -> Measurement:
+        measurement = Measurement(scenario.name, track_rss=self.track_rss)
+        list(self.pool.map(lambda _: self._one(scenario, None), range(warmup)))
+        started = time.perf_counter()
+        list(self.pool.map(lambda _: self._one(scenario, measurement), range(requests)))
+        measurement.elapsed = time.perf_counter() - started
+        return measurement
+
+
+def run_scenarios(driver, scenarios: List[Scenario], requests: int, warmup: int,
+                  report: Callable[[str], None] = print) -> List[Measurement]:
+    results = []
+    for scenario in scenarios:
+        measurement = driver.run(scenario, requests, warmup)
+        results.append(measurement)
+        report(f"  {scenario.name}: {len(measurement.latencies)} запитів, "
+               f"{measurement.errors} помилок, {measurement.elapsed:.2f} с")
+    return results
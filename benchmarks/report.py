@@ -0,0 +1,139 @@
+"""
+Зведення результатів у JSON та порівняння двох прогонів.
+
+Формат файлу:
+    {"meta": {...}, "endpoints": {"posts.view_post": {"requests": ..., "rps": ...,
+     "latency_ms": {"mean", "p50", "p95", "p99", "max"}, "queries": {"mean", "max"},
+     "rss_peak_mb": ..., "errors": ...}, ...}}
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from benchmarks.drivers import Measurement
+
+# Зміна p95 більша за поріг позначається в порівнянні
+REGRESSION_THRESHOLD = 0.10
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Перцентиль з лінійною інтерполяцією (values - відсортовані)"""
+    if not values:
+        return 0.0
+    k = (len(values) - 1) * p / 100
+    lower = int(k)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (k - lower)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize_measurement(m: Measurement) -> Dict:
+    latencies = sorted(m.latencies)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    result = {
+        "requests": len(latencies),
+        "errors": m.errors,
+        "skipped": m.skipped,
+        "rps": round(len(latencies) / m.elapsed, 2) if m.elapsed else 0.0,
+        "latency_ms": {
+            "mean": ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(latencies[-1]) if latencies else 0.0,
+        },
+        "queries": None,
+        "rss_peak_mb": round(m.rss_peak / 1024 / 1024, 1) if m.rss_peak else None,
+    }
+    if m.queries:
+        result["queries"] = {
+            "mean": round(sum(m.queries) / len(m.queries), 2),
+            "max": max(m.queries),
+        }
+    if m.error_samples:
+        result["error_samples"] = m.error_samples
+    return result
+
+
+def build_report(measurements: List[Measurement], meta: Dict) -> Dict:
+    meta = dict(meta)
+    meta.setdefault("created_at", datetime.now(timezone.utc).isoformat(timespec="seconds"))
+    meta.setdefault("git_commit", _git_commit())
+    meta.setdefault("python", sys.version.split()[0])
+    meta.setdefault("platform", platform.platform())
+    return {"meta": meta, "endpoints": {m.name: summarize_measurement(m) for m in measurements}}
+
+
+def write_report(report: Dict, path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def load_report(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def format_table(report: Dict) -> str:
+    lines = [
+        f"{'endpoint':<28} {'req':>5} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} "
+        f"{'q/req':>6} {'rss MB':>7}"
+    ]
+    for name, r in report["endpoints"].items():
+        lat = r["latency_ms"]
+        queries = f"{r['queries']['mean']:.1f}" if r["queries"] else "-"
+        rss = f"{r['rss_peak_mb']:.0f}" if r["rss_peak_mb"] else "-"
+        lines.append(
+            f"{name:<28} {r['requests']:>5} {r['errors']:>4} {r['rps']:>8.1f} {lat['p50']:>8.2f} "
+            f"{lat['p95']:>8.2f} {lat['p99']:>8.2f} {queries:>6} {rss:>7}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(base: Dict, new: Dict, threshold: float = REGRESSION_THRESHOLD) -> str:
+    """Таблиця змін p50/p95/rps/запитів між двома прогонами"""
+
+    def change(old: float, value: float) -> str:
+        if not old:
+            return "    n/a"
+        return f"{(value - old) / old * 100:+6.1f}%"
+
+    lines = [
+        f"base: {base['meta'].get('git_commit')} {base['meta'].get('created_at')} "
+        f"{base['meta'].get('mode')} {base['meta'].get('dataset')}",
+        f"new:  {new['meta'].get('git_commit')} {new['meta'].get('created_at')} "
+        f"{new['meta'].get('mode')} {new['meta'].get('dataset')}",
+        "",
+        f"{'endpoint':<28} {'p50 ms':>17} {'p95 ms':>17} {'rps':>17} {'q/req':>11}",
+    ]
+    for name, r in new["endpoints"].items():
+        old = base["endpoints"].get(name)
+        if old is None:
+            lines.append(f"{name:<28} (новий)")
+            continue
+        p50, p95 = r["latency_ms"]["p50"], r["latency_ms"]["p95"]
+        old_p50, old_p95 = old["latency_ms"]["p50"], old["latency_ms"]["p95"]
+        queries = (
+            f"{old['queries']['mean']:.1f}->{r['queries']['mean']:.1f}"
+            if r["queries"] and old["queries"] else "-"
+        )
+        flag = " !" if old_p95 and (p95 - old_p95) / old_p95 > threshold else ""
+        lines.append(
+            f"{name:<28} {p50:>8.2f} {change(old_p50, p50)} {p95:>8.2f} {change(old_p95, p95)} "
+            f"{r['rps']:>8.1f} {change(old['rps'], r['rps'])} {queries:>11}{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,170 @@
+"""
+Командний рядок бенчмарків: seed, run, compare.
+
+Змінні оточення застосунку (БД, шляхи кешів, фонові виконавці) задаються
+до імпорту platform_app, тож бенчмарк не торкається instance/ і робочої БД.
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCH_DIR, ".data")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+DEFAULT_DATABASE_URL = f"sqlite:///{os.path.join(DATA_DIR, 'bench.db')}"
+
+
+def _configure_environment(args) -> None:
+    os.makedirs(DATA_DIR, exist_ok=True)
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("PAGE_CACHE_PATH", os.path.join(DATA_DIR, "page_cache.sqlite"))
+    os.environ.setdefault("IDENTITY_CACHE_PATH", os.path.join(DATA_DIR, "identity_cache.sqlite"))
+    # Резюме ШІ в бенчмарку не генеруються - виконавці в процесі не запускаються
+    os.environ["SUMMARY_WORKER_INPROCESS"] = "false"
+    os.environ.setdefault("ROLLUP_RECONCILE_INTERVAL", "0")
+    if getattr(args, "no_page_cache", False):
+        os.environ["PAGE_CACHE_BACKEND"] = "none"
+
+
+def _reset_local_files(database_url: str) -> None:
+    """Видаляє файли SQLite бенчмарку та кеші"""
+    paths = [os.environ["PAGE_CACHE_PATH"], os.environ["IDENTITY_CACHE_PATH"]]
+    if database_url.startswith("sqlite:///"):
+        paths.append(database_url[len("sqlite:///"):])
+    for path in paths:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+def cmd_seed(args) -> None:
+    from flask_migrate import downgrade, upgrade
+
+    is_sqlite = args.database_url.startswith("sqlite")
+    if args.reset and is_sqlite:
+        _reset_local_files(args.database_url)
+
+    os.environ["SCHEMA_CHECK"] = "off"
+    from platform_app import create_application
+    from benchmarks.seed import seed_dataset
+
+    app = create_application()
+    with app.app_context():
+        if args.reset and not is_sqlite:
+            downgrade(revision="base")
+        upgrade()
+        started = time.perf_counter()
+        timings = seed_dataset(args.users, args.posts, args.batch_size, args.seed)
+    print(f"Готово за {time.perf_counter() - started:.1f} с: "
+          + ", ".join(f"{k} {v:.1f} с" for k, v in timings.items()))
+
+
+def cmd_run(args) -> None:
+    from platform_app import create_application
+    from platform_app.core.database import db
+    from platform_app.core.view_counter import view_counter
+    from benchmarks.drivers import ClientDriver, HttpDriver, install_instrumentation, run_scenarios, serve_in_thread
+    from benchmarks.report import build_report, format_table, write_report
+    from benchmarks.scenarios import build_scenarios, load_sample
+
+    app = create_application()
+    install_instrumentation(app)
+    with app.app_context():
+        sample = load_sample(args.sample_size)
+        users = db.session.execute(db.text("SELECT count(*) FROM user_accounts")).scalar()
+        posts = db.session.execute(db.text("SELECT count(*) FROM blog_posts")).scalar()
+
+    scenarios = build_scenarios(uuid.uuid4().hex[:8])
+    if args.only:
+        prefixes = tuple(p.strip() for p in args.only.split(","))
+        scenarios = [s for s in scenarios if s.name.startswith(prefixes)]
+    if args.skip_writes:
+        scenarios = [s for s in scenarios if not s.write]
+
+    server = None
+    if args.mode == "client":
+        driver = ClientDriver(app, sample)
+    else:
+        url = args.url
+        if url is None:
+            server, url = serve_in_thread(app)
+        driver = HttpDriver(url, sample, args.concurrency, track_rss=args.url is None)
+
+    print(f"Режим {args.mode}: {len(scenarios)} сценаріїв по {args.requests} запитів")
+    try:
+        measurements = run_scenarios(driver, scenarios, args.requests, args.warmup)
+    finally:
+        if isinstance(driver, HttpDriver):
+            driver.close()
+        if server is not None:
+            server.shutdown()
+        view_counter.flush()
+
+    report = build_report(measurements, {
+        "mode": args.mode,
+        "url": args.url,
+        "database": app.config["SQLALCHEMY_DATABASE_URI"].split(":", 1)[0],
+        "dataset": {"users": users, "posts": posts},
+        "options": {
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency if args.mode == "http" else 1,
+            "page_cache": os.environ.get("PAGE_CACHE_BACKEND", "sqlite"),
+        },
+    })
+    print(format_table(report))
+    output = args.output or os.path.join(RESULTS_DIR, f"{args.mode}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    write_report(report, output)
+    print(f"Результати: {output}")
+
+
+def cmd_compare(args) -> None:
+    from benchmarks.report import format_comparison, load_report
+
+    print(format_comparison(load_report(args.base), load_report(args.new), args.threshold))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Бенчмарки платформи")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def database_option(p):
+        p.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL))
+
+    seed = sub.add_parser("seed", help="Згенерувати синтетичний набір даних")
+    database_option(seed)
+    seed.add_argument("--users", type=int, default=10000)
+    seed.add_argument("--posts", type=int, default=500000)
+    seed.add_argument("--batch-size", type=int, default=5000)
+    seed.add_argument("--seed", type=int, default=42)
+    seed.add_argument("--reset", action="store_true", help="Очистити БД перед генерацією")
+    seed.set_defaults(handler=cmd_seed)
+
+    run = sub.add_parser("run", help="Прогнати сценарії всіх blueprint'ів")
+    database_option(run)
+    run.add_argument("--mode", choices=("client", "http"), default="client")
+    run.add_argument("--requests", type=int, default=200, help="Запитів на сценарій")
+    run.add_argument("--warmup", type=int, default=10)
+    run.add_argument("--concurrency", type=int, default=8, help="Потоків у режимі http")
+    run.add_argument("--url", help="Зовнішній сервер (за замовчуванням - вбудований)")
+    run.add_argument("--only", help="Префікси сценаріїв через кому, напр. posts.,stats.")
+    run.add_argument("--skip-writes", action="store_true")
+    run.add_argument("--no-page-cache", action="store_true")
+    run.add_argument("--sample-size", type=int, default=500)
+    run.add_argument("--output", help="JSON з результатами (за замовчуванням - benchmarks/results/)")
+    run.set_defaults(handler=cmd_run)
+
+    compare = sub.add_parser("compare", help="Порівняти два JSON-звіти")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=0.10)
+    compare.set_defaults(handler=cmd_compare)
+
+    args = parser.parse_args(argv)
+    if args.command != "compare":
+        _configure_environment(args)
+        # Корінь репозиторію - для імпорту platform_app при запуску з будь-якого каталогу
+        sys.path.insert(0, os.path.dirname(BENCH_DIR))
+    args.handler(args)
@@ -0,0 +1,220 @@
+"""
+Сценарії запитів до всіх blueprint'ів (main, posts, users, stats, auth).
+
+Сценарій описує один тип запиту: endpoint, метод, побудову URL та форми з
+вибірки реальних даних (Sample) і тип клієнта:
+  anon  - анонімна сесія (спільна для всіх запитів потоку),
+  user  - сесія автентифікованого користувача бенчмарку,
+  fresh - нова сесія на кожен запит (вхід, реєстрація),
+  login - нова сесія з невимірюваним входом перед запитом (вихід).
+"""
+import itertools
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlsplit
+
+from platform_app.core.database import db
+from platform_app.core.pagination import encode_cursor
+from platform_app.models.post import BlogPost
+from platform_app.models.tag import Tag
+from platform_app.models.user import UserAccount
+
+from benchmarks.seed import DEFAULT_PASSWORD, WORDS
+
+# Користувач, від імені якого виконуються запити "user" (найактивніший автор)
+BENCH_USERNAME = "user000000"
+
+# Текст для форм створення/редагування (мінімум 100 символів)
+FORM_CONTENT = " ".join(WORDS[:60]).capitalize() + "."
+
+
+@dataclass
+class Sample:
+    """Вибірка реальних значень з БД для побудови запитів"""
+
+    slugs: List[str]
+    usernames: List[str]
+    tags: List[str]
+    terms: List[str]
+    own_slugs: List[str]
+    deep_cursors: List[str]
+    # Slug'и постів, створених під час прогону (для сценарію видалення)
+    created: List[str] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    counter: itertools.count = field(default_factory=itertools.count)
+    rng: random.Random = field(default_factory=lambda: random.Random(7))
+
+    def pick(self, values: List[str]) -> str:
+        with self.lock:
+            return self.rng.choice(values)
+
+    def next_id(self) -> int:
+        with self.lock:
+            return next(self.counter)
+
+    def add_created(self, location: str) -> None:
+        slug = unquote(urlsplit(location).path.rstrip("/").rsplit("/", 1)[-1])
+        with self.lock:
+            self.created.append(slug)
+
+    def pop_created(self) -> Optional[str]:
+        with self.lock:
+            return self.created.pop() if self.created else None
+
+
+def load_sample(size: int = 500, seed: int = 7, per_page: int = 12) -> Sample:
+    """Вибірка slug'ів, авторів, тегів та курсорів глибоких сторінок (потрібен app context)"""
+    rng = random.Random(seed)
+    published = BlogPost.is_published == True
+
+    def _random_rows(stmt, count):
+        rows = db.session.execute(stmt.order_by(db.func.random()).limit(count)).all()
+        return [row[0] for row in rows]
+
+    slugs = _random_rows(db.select(BlogPost.slug).where(published), size)
+    usernames = _random_rows(
+        db.select(UserAccount.username).where(UserAccount.is_active == True), size
+    )
+    tags = _random_rows(db.select(Tag.name), min(size, 200))
+    if not slugs or not usernames:
+        raise RuntimeError("БД порожня - спочатку `python -m benchmarks seed`")
+
+    bench_id = db.session.execute(
+        db.select(UserAccount.id).where(UserAccount.username == BENCH_USERNAME)
+    ).scalar()
+    own_slugs = list(db.session.execute(
+        db.select(BlogPost.slug).where(BlogPost.author_id == bench_id).limit(size)
+    ).scalars())
+
+    # Курсори на сторінки 10..1000 (або скільки є) - ціна глибокої пагінації
+    total = db.session.execute(db.select(db.func.count()).where(published)).scalar()
+    deep_cursors = []
+    for page in sorted({10, 100, 1000}):
+        offset = page * per_page
+        if offset >= total:
+            break
+        row = db.session.execute(
+            db.select(BlogPost.published_at, BlogPost.id).where(published)
+            .order_by(BlogPost.published_at.desc(), BlogPost.id.desc())
+            .offset(offset - 1).limit(1)
+        ).first()
+        deep_cursors.append(encode_cursor(row.published_at, row.id, page + 1, "next"))
+
+    return Sample(
+        slugs=slugs,
+        usernames=usernames,
+        tags=tags or ["python"],
+        terms=rng.sample(WORDS, 40),
+        own_slugs=own_slugs,
+        deep_cursors=deep_cursors,
+    )
+
+
+@dataclass
+class Scenario:
+    """Один тип запиту"""
+
+    name: str
+    method: str
+    path: Callable[[Sample], Optional[str]]
+    # Форма будується з вибірки та вже обраного шляху
+    form: Optional[Callable[[Sample, str], Dict[str, str]]] = None
+    client: str = "anon"
+    write: bool = False
+    expect: Tuple[int, ...] = (200,)
+    # Редирект сюди означає помилку (наприклад, невдалий вхід)
+    fail_location: Optional[str] = None
+    # Викликається з Location успішної відповіді
+    on_redirect: Optional[Callable[[Sample, str], None]] = None
+
+    def is_ok(self, status: int, location: Optional[str]) -> bool:
+        if status not in self.expect:
+            return False
+        return not (self.fail_location and location and self.fail_location in location)
+
+
+def _post_form(sample: Sample, prefix: str) -> Dict[str, str]:
+    return {
+        "title": f"{prefix} {sample.next_id()} {sample.pick(WORDS)}",
+        "content": FORM_CONTENT,
+        "tags": f"{sample.pick(WORDS)}, benchmark",
+    }
+
+
+def _edit_form(sample: Sample, path: str) -> Dict[str, str]:
+    # Заголовок, з якого генерується той самий slug - інакше наступні запити отримають 404
+    slug = unquote(path.split("/")[2])
+    return {"title": slug.replace("-", " "), "content": FORM_CONTENT, "tags": "benchmark"}
+
+
+def _register_form(sample: Sample, run_id: str) -> Dict[str, str]:
+    name = f"bench{run_id}x{sample.next_id()}"
+    return {
+        "username": name,
+        "email": f"{name}@bench.local",
+        "password": DEFAULT_PASSWORD,
+        "password_confirm": DEFAULT_PASSWORD,
+        "full_name": "Benchmark",
+    }
+
+
+def build_scenarios(run_id: str) -> List[Scenario]:
+    """Усі сценарії: спершу читання, потім записи"""
+    S = Scenario
+    reads = [
+        S("main.home", "GET", lambda s: "/"),
+        S("main.home[user]", "GET", lambda s: "/", client="user"),
+        S("main.about", "GET", lambda s: "/about"),
+        S("posts.list_posts", "GET", lambda s: "/posts/"),
+        S("posts.list_posts[deep]", "GET",
+          lambda s: f"/posts/?cursor={s.pick(s.deep_cursors)}" if s.deep_cursors else None),
+        S("posts.list_posts[search]", "GET", lambda s: f"/posts/?q={quote(s.pick(s.terms))}"),
+        S("posts.list_by_tag", "GET", lambda s: f"/posts/tag/{quote(s.pick(s.tags))}"),
+        S("posts.tag_cloud", "GET", lambda s: "/posts/tags"),
+        S("posts.view_post", "GET", lambda s: f"/posts/{quote(s.pick(s.slugs))}"),
+        S("posts.view_post[user]", "GET", lambda s: f"/posts/{quote(s.pick(s.slugs))}", client="user"),
+        S("posts.show_create", "GET", lambda s: "/posts/create", client="user"),
+        S("posts.show_edit", "GET",
+          lambda s: f"/posts/{quote(s.pick(s.own_slugs))}/edit" if s.own_slugs else None, client="user"),
+        S("users.view_profile", "GET", lambda s: f"/users/{quote(s.pick(s.usernames))}"),
+        S("users.show_my_profile", "GET", lambda s: "/users/me", client="user"),
+        S("users.my_posts", "GET", lambda s: "/users/me/posts", client="user"),
+        S("stats.global_stats", "GET", lambda s: "/stats/global"),
+        S("feeds.site_rss", "GET", lambda s: "/feed.xml"),
+        S("feeds.author_rss", "GET", lambda s: f"/users/{quote(s.pick(s.usernames))}/feed.xml"),
+        S("feeds.tag_rss", "GET", lambda s: f"/posts/tag/{quote(s.pick(s.tags))}/feed.xml"),
+        S("feeds.sitemap_index", "GET", lambda s: "/sitemap.xml"),
+        S("feeds.sitemap_chunk", "GET", lambda s: "/sitemap-0.xml"),
+        S("stats.dashboard", "GET", lambda s: "/stats/", client="user"),
+        S("auth.show_login", "GET", lambda s: "/auth/login"),
+        S("auth.show_register", "GET", lambda s: "/auth/register"),
+    ]
+    writes = [
+        S("posts.process_create", "POST", lambda s: "/posts/create",
+          form=lambda s, path: _post_form(s, "Benchmark post"), client="user", write=True,
+          expect=(302,), fail_location="/create", on_redirect=Sample.add_created),
+        S("posts.process_edit", "POST",
+          lambda s: f"/posts/{quote(s.pick(s.own_slugs))}/edit" if s.own_slugs else None,
+          form=_edit_form, client="user", write=True, expect=(302,), fail_location="/edit"),
+        S("posts.process_delete", "POST",
+          lambda s: (lambda slug: f"/posts/{quote(slug)}/delete" if slug else None)(s.pop_created()),
+          client="user", write=True, expect=(302,)),
+        S("users.update_my_profile", "POST", lambda s: "/users/me",
+          form=lambda s, path: {"full_name": f"Автор {s.next_id()}", "about": FORM_CONTENT},
+          client="user", write=True, expect=(302,)),
+        S("auth.process_register", "POST", lambda s: "/auth/register",
+          form=lambda s, path: _register_form(s, run_id), client="fresh", write=True,
+          expect=(302,), fail_location="/auth/"),
+        S("auth.process_login", "POST", lambda s: "/auth/login",
+          form=lambda s, path: {"username": s.pick(s.usernames), "password": DEFAULT_PASSWORD},
+          client="fresh", write=True, expect=(302,), fail_location="/auth/"),
+        S("auth.process_logout", "POST", lambda s: "/auth/logout", client="login",
+          write=True, expect=(302,)),
+    ]
+    return reads + writes
+
+
+def login_form() -> Dict[str, str]:
+    return {"username": BENCH_USERNAME, "password": DEFAULT_PASSWORD}
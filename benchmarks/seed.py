@@ -0,0 +1,155 @@
+"""
+Генерація синтетичного набору даних.
+
+Користувачі та пости вставляються пакетами через executemany; тексти
+складаються з пулу згенерованих абзаців (розмір поста - логнормальний,
+медіана ~2 КБ), автори та перегляди мають "довгий хвіст". Після вставки
+перебудовуються пошуковий індекс, індекс тегів, зведені лічильники та
+схожі пости.
+Результат детермінований для однакового --seed.
+"""
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from werkzeug.security import generate_password_hash
+
+from platform_app.core.database import db
+from platform_app.models.post import BlogPost
+from platform_app.models.user import UserAccount
+
+# Пароль усіх згенерованих користувачів
+DEFAULT_PASSWORD = "benchmark"
+
+WORDS = (
+    "платформа блог стаття текст автор читач пост тема ідея досвід проєкт код дані "
+    "система сервер запит відповідь база індекс кеш швидкість пам'ять мережа браузер "
+    "сторінка шаблон функція модуль клас тест помилка рішення задача команда реліз "
+    "історія місто подорож книга музика фільм кава ранок вечір зима літо весна осінь "
+    "україна київ львів одеса харків дніпро море гори річка ліс поле небо сонце "
+    "python flask postgresql sqlite linux docker api http json html css javascript "
+    "алгоритм структура масив список словник рядок число вектор матриця модель "
+    "навчання аналіз статистика графік звіт метрика затримка пропускна здатність "
+    "новий старий великий малий швидкий повільний простий складний цікавий корисний "
+    "робити писати читати думати шукати знаходити будувати запускати перевіряти"
+).split()
+
+TAGS = (
+    "python flask sqlalchemy postgresql sqlite docker linux devops backend frontend "
+    "javascript css html api rest graphql кешування продуктивність безпека тестування "
+    "алгоритми дані аналітика машинне-навчання ші подорожі книги музика кіно фото "
+    "кава спорт здоров'я освіта кар'єра стартапи бізнес маркетинг дизайн ux "
+    "україна київ львів історія наука космос екологія технології гаджети ігри"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(WORDS, k=rng.randint(6, 16))
+    return " ".join(words).capitalize() + rng.choice((".", ".", ".", "!", "?"))
+
+
+def _paragraph_pool(rng: random.Random, size: int = 2000) -> List[str]:
+    return [" ".join(_sentence(rng) for _ in range(rng.randint(3, 8))) for _ in range(size)]
+
+
+def _content(rng: random.Random, pool: List[str]) -> str:
+    paragraphs = max(1, min(int(rng.lognormvariate(1.6, 0.6)), 40))
+    return "\n\n".join(rng.choices(pool, k=paragraphs))
+
+
+def _author(rng: random.Random, users: int) -> int:
+    """Id автора з розподілом Парето: кілька дуже активних авторів і довгий хвіст"""
+    return min(int(rng.paretovariate(1.16)) - 1, users - 1) + 1
+
+
+def seed_users(count: int, batch_size: int, report: Callable[[str], None]) -> None:
+    password_hash = generate_password_hash(DEFAULT_PASSWORD)
+    now = datetime.utcnow()
+    table = UserAccount.__table__
+    for start in range(0, count, batch_size):
+        db.session.execute(table.insert(), [
+            {
+                "username": f"user{i:06d}",
+                "email": f"user{i:06d}@bench.local",
+                "password_hash": password_hash,
+                "full_name": f"Автор {i}" if i % 3 else None,
+                "about": None,
+                "avatar_url": None,
+                "is_active": True,
+                "registered_at": now - timedelta(days=i % 700),
+                "last_login": None,
+            }
+            for i in range(start, min(start + batch_size, count))
+        ])
+        db.session.commit()
+        report(f"  користувачі: {min(start + batch_size, count)}/{count}")
+
+
+def seed_posts(count: int, users: int, batch_size: int, rng: random.Random,
+               report: Callable[[str], None]) -> None:
+    pool = _paragraph_pool(rng)
+    now = datetime.utcnow()
+    table = BlogPost.__table__
+    for start in range(0, count, batch_size):
+        rows = []
+        for i in range(start, min(start + batch_size, count)):
+            title = " ".join(rng.choices(WORDS, k=rng.randint(3, 9))).capitalize()
+            content = _content(rng, pool)
+            published_at = now - timedelta(seconds=rng.randint(0, 730 * 24 * 3600))
+            has_summary = rng.random() < 0.3
+            rows.append({
+                "title": title,
+                "slug": f"{BlogPost.generate_slug(title)[:300]}-{i}",
+                "content": content,
+                "summary": content[:200] if has_summary else None,
+                "author_id": _author(rng, users),
+                "is_published": rng.random() < 0.97,
+                "published_at": published_at,
+                "updated_at": published_at,
+                "view_count": int(rng.paretovariate(1.3) * 5) - 5,
+                "tags": ", ".join(rng.sample(TAGS, rng.randint(0, 5))) or None,
+                "featured_image": None,
+                "ai_summary": None,
+                "ai_generated": has_summary and rng.random() < 0.5,
+                "ai_status": None,
+            })
+        db.session.execute(table.insert(), rows)
+        db.session.commit()
+        report(f"  пости: {min(start + batch_size, count)}/{count}")
+
+
+def seed_dataset(users: int = 10000, posts: int = 500000, batch_size: int = 5000, seed: int = 42,
+                 report: Callable[[str], None] = print) -> Dict[str, float]:
+    """Заповнює порожню БД (схема вже на head). Повертає тривалість етапів."""
+    from platform_app.core.related import rebuild_related
+    from platform_app.core.rollups import rebuild_rollups
+    from platform_app.core.search import rebuild_search_index
+    from platform_app.core.tags import backfill_tags
+
+    if db.session.execute(db.select(UserAccount.id).limit(1)).first():
+        raise RuntimeError("БД не порожня - використайте --reset")
+
+    rng = random.Random(seed)
+    timings = {}
+
+    started = time.perf_counter()
+    seed_users(users, batch_size, report)
+    timings["users"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    seed_posts(posts, users, batch_size, rng, report)
+    timings["posts"] = time.perf_counter() - started
+
+    for name, step in (
+        ("search_index", lambda: rebuild_search_index(batch_size=batch_size)),
+        ("tag_index", lambda: backfill_tags(batch_size=batch_size)),
+        ("rollups", rebuild_rollups),
+        ("related", lambda: rebuild_related(batch_size=batch_size)),
+    ):
+        started = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - started
+        report(f"  {name}: {timings[name]:.1f} с")
+
+    return timings
@@ -0,0 +1,87 @@
+"""initial schema: user_accounts, blog_posts
+
+Бази, створені раніше через db.create_all(), вже можуть містити ці таблиці -
+тоді створюються лише відсутні таблиці та колонки ШІ (колишній
+migrate_add_ai_fields.py).
+
+Revision ID: 0001_initial_schema
+Revises: 
+Create Date: 2026-10-18 08:40:13.400295
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_initial_schema'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if 'user_accounts' not in tables:
+        op.create_table('user_accounts',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('username', sa.String(length=80), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('full_name', sa.String(length=150), nullable=True),
+        sa.Column('about', sa.Text(), nullable=True),
+        sa.Column('avatar_url', sa.String(length=500), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('registered_at', sa.DateTime(), nullable=False),
+        sa.Column('last_login', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('user_accounts', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_user_accounts_email'), ['email'], unique=True)
+            batch_op.create_index(batch_op.f('ix_user_accounts_username'), ['username'], unique=True)
+
+    if 'blog_posts' not in tables:
+        op.create_table('blog_posts',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('title', sa.String(length=300), nullable=False),
+        sa.Column('slug', sa.String(length=350), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('author_id', sa.Integer(), nullable=False),
+        sa.Column('is_published', sa.Boolean(), nullable=False),
+        sa.Column('published_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('view_count', sa.Integer(), nullable=False),
+        sa.Column('tags', sa.String(length=500), nullable=True),
+        sa.Column('featured_image', sa.String(length=500), nullable=True),
+        sa.Column('ai_summary', sa.Text(), nullable=True),
+        sa.Column('ai_generated', sa.Boolean(), server_default=sa.false(), nullable=False),
+        sa.ForeignKeyConstraint(['author_id'], ['user_accounts.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_blog_posts_author_id'), ['author_id'], unique=False)
+            batch_op.create_index(batch_op.f('ix_blog_posts_published_at'), ['published_at'], unique=False)
+            batch_op.create_index(batch_op.f('ix_blog_posts_slug'), ['slug'], unique=True)
+    else:
+        columns = {column['name'] for column in inspector.get_columns('blog_posts')}
+        if 'ai_summary' not in columns:
+            op.add_column('blog_posts', sa.Column('ai_summary', sa.Text(), nullable=True))
+        if 'ai_generated' not in columns:
+            op.add_column('blog_posts', sa.Column('ai_generated', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_blog_posts_slug'))
+        batch_op.drop_index(batch_op.f('ix_blog_posts_published_at'))
+        batch_op.drop_index(batch_op.f('ix_blog_posts_author_id'))
+
+    op.drop_table('blog_posts')
+    with op.batch_alter_table('user_accounts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_accounts_username'))
+        batch_op.drop_index(batch_op.f('ix_user_accounts_email'))
+
+    op.drop_table('user_accounts')
@@ -0,0 +1,261 @@
+"""search index, summary jobs/cache, rollups, tag index
+
+Додає таблиці, які раніше створювались при старті застосунку
+(db.create_all() та ensure_search_schema()), і складений індекс
+(author_id, published_at, id) для курсорної пагінації постів автора. Таблиці, що вже існують
+у базах зі старих версій, пропускаються. Після створення індекси пошуку
+та тегів і зведені лічильники статистики заповнюються з базових таблиць.
+
+Revision ID: 0002_performance_tables
+Revises: 0001_initial_schema
+Create Date: 2026-10-18 09:05:00.000000
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_performance_tables'
+down_revision = '0001_initial_schema'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_TABLE = 'post_search'
+
+# core/rollups.py::TOP_POSTS_CAPACITY на момент міграції
+TOP_POSTS_CAPACITY = 50
+
+
+def _tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _create_search_table(bind):
+    """Таблиця повнотекстового пошуку (tsvector/GIN або FTS5) з наповненням"""
+    if bind.dialect.name == 'postgresql':
+        op.execute(f"""
+            CREATE TABLE {SEARCH_TABLE} (
+                post_id INTEGER PRIMARY KEY REFERENCES blog_posts(id) ON DELETE CASCADE,
+                document TSVECTOR NOT NULL
+            )
+        """)
+        op.execute(f"CREATE INDEX ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)")
+        op.execute(f"""
+            INSERT INTO {SEARCH_TABLE} (post_id, document)
+            SELECT id,
+                   setweight(to_tsvector('simple', title), 'A')
+                   || setweight(to_tsvector('simple', content), 'B')
+            FROM blog_posts
+        """)
+    else:
+        op.execute(
+            f"CREATE VIRTUAL TABLE {SEARCH_TABLE} "
+            f"USING fts5(title, content, tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, content) "
+            f"SELECT id, title, content FROM blog_posts"
+        )
+
+
+def _parse_tags(raw):
+    """Копія core/tags.py::parse_tags на момент міграції"""
+    names = {}
+    for part in re.split(r'[,;]', raw or ''):
+        name = ' '.join(part.strip().lstrip('#').split()).lower()[:100]
+        if name:
+            names.setdefault(name)
+    return list(names)
+
+
+def _backfill_tags(bind):
+    """Заповнює tags/post_tags з рядкової колонки blog_posts.tags"""
+    rows = bind.execute(sa.text(
+        "SELECT id, tags FROM blog_posts WHERE tags IS NOT NULL AND tags != ''"
+    )).all()
+    parsed = {row.id: _parse_tags(row.tags) for row in rows}
+    names = sorted({name for tag_names in parsed.values() for name in tag_names})
+    if not names:
+        return
+
+    tags = sa.table('tags', sa.column('id', sa.Integer), sa.column('name', sa.String))
+    post_tags = sa.table('post_tags', sa.column('post_id', sa.Integer), sa.column('tag_id', sa.Integer))
+
+    existing = dict(bind.execute(sa.select(tags.c.name, tags.c.id)).all())
+    missing = [{'name': name} for name in names if name not in existing]
+    if missing:
+        op.bulk_insert(tags, missing)
+        existing = dict(bind.execute(sa.select(tags.c.name, tags.c.id)).all())
+
+    linked = set(bind.execute(sa.select(post_tags.c.post_id, post_tags.c.tag_id)).all())
+    links = [
+        {'post_id': post_id, 'tag_id': existing[name]}
+        for post_id, tag_names in parsed.items()
+        for name in tag_names
+        if (post_id, existing[name]) not in linked
+    ]
+    if links:
+        op.bulk_insert(post_tags, links)
+
+
+def _backfill_rollups(bind):
+    """Заповнює platform_counters, author_stats і top_posts (якщо вони порожні)"""
+    counters = sa.table('platform_counters', sa.column('name', sa.String), sa.column('value', sa.BigInteger))
+    names = ('users', 'posts', 'views', 'ai_posts')
+    existing = set(bind.execute(sa.select(counters.c.name).where(counters.c.name.in_(names))).scalars())
+    if not existing:
+        totals = bind.execute(sa.text("""
+            SELECT
+                (SELECT COUNT(*) FROM user_accounts) AS users,
+                (SELECT COUNT(*) FROM blog_posts WHERE is_published) AS posts,
+                (SELECT COALESCE(SUM(view_count), 0) FROM blog_posts) AS views,
+                (SELECT COUNT(*) FROM blog_posts WHERE is_published AND ai_generated) AS ai_posts
+        """)).one()
+        op.bulk_insert(counters, [{'name': name, 'value': int(getattr(totals, name) or 0)} for name in names])
+
+    if bind.execute(sa.text("SELECT COUNT(*) FROM author_stats")).scalar() == 0:
+        op.execute("""
+            INSERT INTO author_stats (author_id, post_count, view_count)
+            SELECT author_id, COUNT(id), COALESCE(SUM(view_count), 0)
+            FROM blog_posts WHERE is_published
+            GROUP BY author_id
+        """)
+
+    if bind.execute(sa.text("SELECT COUNT(*) FROM top_posts")).scalar() == 0:
+        op.execute(f"""
+            INSERT INTO top_posts (post_id, view_count)
+            SELECT id, COALESCE(view_count, 0) FROM blog_posts WHERE is_published
+            ORDER BY view_count DESC, id
+            LIMIT {TOP_POSTS_CAPACITY}
+        """)
+
+
+def upgrade():
+    bind = op.get_bind()
+    tables = _tables()
+
+    columns = {column['name'] for column in sa.inspect(bind).get_columns('blog_posts')}
+    if 'ai_status' not in columns:
+        op.add_column('blog_posts', sa.Column('ai_status', sa.String(length=20), nullable=True))
+
+    indexes = {index['name'] for index in sa.inspect(bind).get_indexes('blog_posts')}
+    if 'ix_blog_posts_author_published' not in indexes:
+        with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+            batch_op.create_index('ix_blog_posts_author_published', ['author_id', 'published_at', 'id'], unique=False)
+
+    if 'ai_summary_cache' not in tables:
+        op.create_table('ai_summary_cache',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('model', sa.String(length=200), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+        )
+
+    if 'summary_jobs' not in tables:
+        op.create_table('summary_jobs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('max_length', sa.Integer(), nullable=False),
+        sa.Column('min_length', sa.Integer(), nullable=False),
+        sa.Column('run_after', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['blog_posts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('summary_jobs', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_summary_jobs_post_id'), ['post_id'], unique=False)
+            batch_op.create_index('ix_summary_jobs_status_run_after', ['status', 'run_after'], unique=False)
+
+    if 'platform_counters' not in tables:
+        op.create_table('platform_counters',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+        )
+
+    if 'author_stats' not in tables:
+        op.create_table('author_stats',
+        sa.Column('author_id', sa.Integer(), nullable=False),
+        sa.Column('post_count', sa.Integer(), nullable=False),
+        sa.Column('view_count', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['author_id'], ['user_accounts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('author_id')
+        )
+        with op.batch_alter_table('author_stats', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_author_stats_post_count'), ['post_count'], unique=False)
+
+    if 'top_posts' not in tables:
+        op.create_table('top_posts',
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('view_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['blog_posts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('post_id')
+        )
+        with op.batch_alter_table('top_posts', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_top_posts_view_count'), ['view_count'], unique=False)
+
+    if 'tags' not in tables:
+        op.create_table('tags',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('tags', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_tags_name'), ['name'], unique=True)
+
+    if 'post_tags' not in tables:
+        op.create_table('post_tags',
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['blog_posts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('post_id', 'tag_id')
+        )
+        with op.batch_alter_table('post_tags', schema=None) as batch_op:
+            batch_op.create_index('ix_post_tags_tag_post', ['tag_id', 'post_id'], unique=False)
+
+    if SEARCH_TABLE not in tables:
+        _create_search_table(bind)
+
+    _backfill_tags(bind)
+    _backfill_rollups(bind)
+
+
+def downgrade():
+    op.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+    with op.batch_alter_table('post_tags', schema=None) as batch_op:
+        batch_op.drop_index('ix_post_tags_tag_post')
+
+    op.drop_table('post_tags')
+    with op.batch_alter_table('tags', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tags_name'))
+
+    op.drop_table('tags')
+    with op.batch_alter_table('top_posts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_top_posts_view_count'))
+
+    op.drop_table('top_posts')
+    with op.batch_alter_table('author_stats', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_author_stats_post_count'))
+
+    op.drop_table('author_stats')
+    op.drop_table('platform_counters')
+    with op.batch_alter_table('summary_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_summary_jobs_status_run_after')
+        batch_op.drop_index(batch_op.f('ix_summary_jobs_post_id'))
+
+    op.drop_table('summary_jobs')
+    op.drop_table('ai_summary_cache')
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_blog_posts_author_published')
+        batch_op.drop_column('ai_status')
@@ -0,0 +1,66 @@
+"""related posts: post vectors, neighbor lists, model parameters
+
+Таблиці заповнюються командою `flask related rebuild`.
+
+Revision ID: 0003_related_posts
+Revises: 0002_performance_tables
+Create Date: 2026-10-18 14:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_related_posts'
+down_revision = '0002_performance_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('related_posts',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.SmallInteger(), nullable=False),
+    sa.Column('related_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['blog_posts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['related_id'], ['blog_posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id', 'rank')
+    )
+    with op.batch_alter_table('related_posts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_related_posts_related_id'), ['related_id'], unique=False)
+
+    op.create_table('post_vectors',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('cluster', sa.Integer(), nullable=False),
+    sa.Column('digest', sa.String(length=32), nullable=False),
+    sa.Column('vector', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['blog_posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+    with op.batch_alter_table('post_vectors', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_post_vectors_cluster'), ['cluster'], unique=False)
+
+    op.create_table('related_models',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('dimensions', sa.Integer(), nullable=False),
+    sa.Column('documents', sa.Integer(), nullable=False),
+    sa.Column('idf', sa.LargeBinary(), nullable=False),
+    sa.Column('centroids', sa.LargeBinary(), nullable=False),
+    sa.Column('built_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('related_models')
+    with op.batch_alter_table('post_vectors', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_post_vectors_cluster'))
+
+    op.drop_table('post_vectors')
+    with op.batch_alter_table('related_posts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_related_posts_related_id'))
+
+    op.drop_table('related_posts')
@@ -0,0 +1,49 @@
+"""trending posts: hourly view buckets and persisted top-K
+
+Revision ID: 0004_trending_posts
+Revises: 0003_related_posts
+Create Date: 2026-10-18 16:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_trending_posts'
+down_revision = '0003_related_posts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('post_view_hours',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('hour', sa.Integer(), nullable=False),
+    sa.Column('views', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['blog_posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id', 'hour')
+    )
+    with op.batch_alter_table('post_view_hours', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_post_view_hours_hour'), ['hour'], unique=False)
+
+    op.create_table('trending_posts',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['blog_posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+    with op.batch_alter_table('trending_posts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_trending_posts_score'), ['score'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('trending_posts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_trending_posts_score'))
+
+    op.drop_table('trending_posts')
+    with op.batch_alter_table('post_view_hours', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_post_view_hours_hour'))
+
+    op.drop_table('post_view_hours')
@@ -5,8 +5,21 @@ from flask import Flask
 
 from platform_app.core.config import AppConfig
 from platform_app.core.database import init_database
+from platform_app.core.routing import init_replica_routing
+from platform_app.core.metrics import init_metrics
+from platform_app.core.schema import check_schema
 from platform_app.core.auth_manager import init_auth
+from platform_app.core.view_counter import init_view_counter
+from platform_app.core.page_cache import init_page_cache
+from platform_app.core.conditional import init_conditional_get
+from platform_app.core.assets import init_assets
+from platform_app.core.rollups import init_rollups
+from platform_app.core.related import init_related
+from platform_app.core.trending import init_trending
+from platform_app.core.feeds import init_feeds
+from platform_app.ai.jobs import init_summary_worker
 from platform_app.blueprints import register_blueprints
+from platform_app.cli import register_commands
 
 
 def create_application() -> Flask:
@@ -18,41 +31,26 @@ def create_application() -> Flask:
     
     # Ініціалізація розширень
     init_database(app)
+    init_replica_routing(app)
+    init_metrics(app)
     init_auth(app)
+    init_view_counter(app)
+    init_page_cache(app)
+    init_conditional_get(app)
+    init_assets(app)
+    init_rollups(app)
+    init_related(app)
+    init_trending(app)
+    init_feeds(app)
+    init_summary_worker(app)
     
     # Реєстрація blueprint'ів
     register_blueprints(app)
+    register_commands(app)
     
-    # Створення таблиць БД при першому запуску
-    with app.app_context():
-        from platform_app.core.database import db
-        db.create_all()
-        
-        # Додаємо нові колонки для ШІ, якщо їх немає (міграція)
-        try:
-            from sqlalchemy import inspect, text
-            inspector = inspect(db.engine)
-            
-            # Перевіряємо, чи існує таблиця
-            if 'blog_posts' in inspector.get_table_names():
-                columns = [col['name'] for col in inspector.get_columns('blog_posts')]
-                
-                if 'ai_summary' not in columns:
-                    db.session.execute(text("ALTER TABLE blog_posts ADD COLUMN ai_summary TEXT"))
-                    print("✓ Додано колонку ai_summary")
-                
-                if 'ai_generated' not in columns:
-                    db.session.execute(text("ALTER TABLE blog_posts ADD COLUMN ai_generated BOOLEAN DEFAULT FALSE"))
-                    print("✓ Додано колонку ai_generated")
-                
-                db.session.commit()
-        except Exception as e:
-            # Якщо таблиця ще не існує або інша помилка - ігноруємо
-            print(f"Міграція (можливо таблиця ще не створена): {e}")
-            try:
-                db.session.rollback()
-            except:
-                pass
+    # Схема БД змінюється лише командою `flask db upgrade` (крок деплою);
+    # при старті лише перевіряємо, що вона на останній ревізії
+    check_schema(app)
     
     return app
 
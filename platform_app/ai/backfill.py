@@ -0,0 +1,194 @@
+"""
+Масова генерація ai_summary для існуючих постів.
+
+Пости без резюме читаються порціями за id (keyset), тексти групуються
+в пакетні запити (inputs - список), кілька запитів виконуються паралельно
+через спільну сесію з пулом з'єднань, результати записуються пакетним
+UPDATE. Прогрес (останній оброблений id) зберігається у файл, тому
+перерваний запуск можна продовжити. Якщо запобіжник API відкривається,
+запуск зупиняється, не позначаючи решту постів як оброблені. Прогрес не
+переходить за перший пост з помилкою - продовжений запуск повторить його.
+"""
+import json
+import os
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+from flask import current_app
+from sqlalchemy import func, update
+
+from platform_app.ai.summarizer import CircuitOpenError, SummarizerError, TextSummarizer, get_summarizer
+from platform_app.core import rollups
+from platform_app.core.database import db
+from platform_app.core.signals import post_changed
+from platform_app.models.post import BlogPost
+
+
+@dataclass
+class BackfillStats:
+    """Підсумки запуску"""
+
+    processed: int = 0
+    summarized: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    last_id: int = 0
+    first_failed_id: Optional[int] = None
+    stopped: Optional[str] = None
+
+    @property
+    def rate(self) -> float:
+        """Постів за секунду"""
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+
+_posts = BlogPost.__table__
+
+# Пакетний UPDATE результатів (executemany); ручне резюме автора не перезаписується
+_SUMMARY_UPDATE = (
+    update(_posts)
+    .where(_posts.c.id == db.bindparam("post_id"))
+    .values(
+        ai_summary=db.bindparam("new_summary"),
+        ai_generated=True,
+        ai_status="done",
+        summary=func.coalesce(_posts.c.summary, db.bindparam("new_summary")),
+        updated_at=db.bindparam("changed_at"),
+    )
+)
+
+
+def _load_progress(path: str) -> int:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return int(json.load(f).get("last_id", 0))
+    except (OSError, ValueError):
+        return 0
+
+
+def _save_progress(path: str, last_id: int) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"last_id": last_id}, f)
+    os.replace(tmp_path, path)
+
+
+def _summarize_batch(app, summarizer: TextSummarizer, rows: Sequence, max_length: int,
+                     min_length: int) -> List[Optional[str]]:
+    """Пакетний запит; при помилці пакета повертає None для всіх постів"""
+    try:
+        # Контекст застосунку потрібен кешу резюме (таблиця ai_summary_cache)
+        with app.app_context():
+            return summarizer.summarize_batch(
+                [row.content for row in rows], max_length=max_length, min_length=min_length
+            )
+    except CircuitOpenError:
+        raise
+    except SummarizerError as e:
+        print(f"Backfill batch error (ids {rows[0].id}-{rows[-1].id}): {e}")
+        return [None] * len(rows)
+
+
+def run_backfill(
+    chunk_size: int = 200,
+    batch_size: int = 8,
+    concurrency: int = 4,
+    max_length: int = 200,
+    min_length: int = 50,
+    progress_path: Optional[str] = None,
+    resume: bool = True,
+    limit: Optional[int] = None,
+    summarizer: Optional[TextSummarizer] = None,
+    report: Callable[[BackfillStats], None] = lambda stats: None,
+) -> BackfillStats:
+    """
+    Генерує резюме для постів з порожнім ai_summary.
+
+    Args:
+        chunk_size: скільки постів читати з БД за раз (і комітити разом)
+        batch_size: скільки текстів в одному HTTP-запиті
+        concurrency: максимум одночасних HTTP-запитів
+        progress_path: файл прогресу (за замовчуванням instance/summary_backfill.json)
+        resume: продовжити з останнього збереженого id
+        limit: максимальна кількість постів за запуск
+        report: викликається після кожної порції з поточною статистикою
+    """
+    summarizer = summarizer or get_summarizer()
+    progress_path = progress_path or os.path.join(current_app.instance_path, "summary_backfill.json")
+    app = current_app._get_current_object()
+
+    stats = BackfillStats(last_id=_load_progress(progress_path) if resume else 0)
+    cursor = stats.last_id
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="summary-backfill") as pool:
+        while limit is None or stats.processed < limit:
+            size = chunk_size if limit is None else min(chunk_size, limit - stats.processed)
+            rows = db.session.execute(
+                db.select(
+                    BlogPost.id, BlogPost.slug, BlogPost.author_id, BlogPost.content,
+                    BlogPost.is_published, BlogPost.ai_generated,
+                )
+                .where(BlogPost.id > cursor)
+                .where(BlogPost.ai_summary.is_(None))
+                .order_by(BlogPost.id)
+                .limit(size)
+            ).all()
+            if not rows:
+                break
+
+            batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+            results = pool.map(
+                lambda batch: _summarize_batch(app, summarizer, batch, max_length, min_length),
+                batches,
+            )
+            try:
+                summaries = [summary for batch_result in results for summary in batch_result]
+            except CircuitOpenError as e:
+                # Порцію не зараховуємо: наступний запуск з прогресом почне з неї
+                stats.stopped = f"{e} (retry in {e.estimated_time or 0:.0f} s)"
+                break
+
+            now = datetime.utcnow()
+            updates = [
+                {"post_id": row.id, "new_summary": summary, "changed_at": now}
+                for row, summary in zip(rows, summaries)
+                if summary
+            ]
+            if updates:
+                db.session.execute(_SUMMARY_UPDATE, updates)
+                rollups.ai_posts_changed(sum(
+                    1 for row, summary in zip(rows, summaries)
+                    if summary and row.is_published and not row.ai_generated
+                ))
+            db.session.commit()
+
+            for row, summary in zip(rows, summaries):
+                if summary:
+                    post_changed.send(
+                        app, post_id=row.id, slug=row.slug, author_id=row.author_id,
+                        action="updated",
+                    )
+
+            stats.processed += len(rows)
+            stats.summarized += len(updates)
+            stats.failed += len(rows) - len(updates)
+            cursor = rows[-1].id
+            if stats.first_failed_id is None:
+                failed_ids = [row.id for row, summary in zip(rows, summaries) if not summary]
+                if failed_ids:
+                    # Прогрес лишається перед першою помилкою: --resume повторить ці пости
+                    stats.first_failed_id = failed_ids[0]
+                    stats.last_id = failed_ids[0] - 1
+                else:
+                    stats.last_id = cursor
+            stats.elapsed = time.perf_counter() - started
+            _save_progress(progress_path, stats.last_id)
+            report(stats)
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
@@ -0,0 +1,156 @@
+"""
+Запобіжник (circuit breaker) для звернень до API генерації резюме.
+
+Стани:
+  - closed - запити йдуть до API, послідовні збої рахуються;
+  - open - після SUMMARIZER_BREAKER_THRESHOLD збоїв поспіль (або 503 з
+    estimated_time) запити не надсилаються до opened_until;
+  - half_open - після opened_until рівно один виклик отримує пробний токен;
+    успіх закриває запобіжник, збій відкриває його знову.
+
+Стан зберігається у сховищі core/cache (SqliteCache за замовчуванням), тож
+усі воркери gunicorn і фонові виконавці бачать той самий стан: коли API
+недоступне, його не перевіряє кожен процес окремо.
+"""
+import os
+import time
+from typing import Any, Dict, Optional
+
+from flask import current_app, has_app_context
+
+from platform_app.core.cache import MemoryCache, create_cache
+from platform_app.core.metrics import metrics
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Скільки зберігається запис стану у сховищі (оновлюється при кожній зміні)
+STATE_TTL = 7 * 24 * 3600
+
+
+class CircuitBreaker:
+    """Запобіжник зі спільним для процесів станом"""
+
+    def __init__(
+        self,
+        name: str,
+        backend=None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        max_open_time: float = 600.0,
+        probe_timeout: float = 60.0,
+    ) -> None:
+        self.name = name
+        self.backend = backend if backend is not None else MemoryCache(max_entries=16)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_open_time = max_open_time
+        # Пробний токен звільняється сам, якщо процес з ним завершився
+        self.probe_timeout = probe_timeout
+        self._key = f"breaker:{name}"
+        self._probe_key = f"breaker:{name}:probe"
+
+    # Стан
+
+    def _load(self) -> Dict[str, Any]:
+        return self.backend.get(self._key) or {
+            "state": STATE_CLOSED, "failures": 0, "opened_until": 0.0, "reason": None,
+        }
+
+    def _save(self, state: Dict[str, Any]) -> None:
+        self.backend.set(self._key, state, STATE_TTL)
+
+    def state(self) -> Dict[str, Any]:
+        """Поточний стан (для CLI та діагностики)"""
+        state = self._load()
+        if state["state"] == STATE_OPEN and state["opened_until"] <= time.time():
+            state["state"] = STATE_HALF_OPEN
+        state["retry_after"] = max(state["opened_until"] - time.time(), 0.0)
+        return state
+
+    # Виклики
+
+    def allow(self) -> Optional[float]:
+        """
+        Чи можна звертатися до API.
+        Повертає None, якщо можна, або кількість секунд до наступної спроби.
+        """
+        state = self._load()
+        if state["state"] == STATE_CLOSED:
+            return None
+
+        now = time.time()
+        if state["opened_until"] > now:
+            metrics.breaker_short_circuits.inc(self.name)
+            return state["opened_until"] - now
+
+        # half-open: пробний запит робить лише той, хто першим отримав токен
+        if self.backend.add(self._probe_key, os.getpid(), self.probe_timeout):
+            metrics.breaker_transitions.inc(self.name, STATE_HALF_OPEN)
+            return None
+        metrics.breaker_short_circuits.inc(self.name)
+        return min(self.reset_timeout, self.probe_timeout)
+
+    def record_success(self) -> None:
+        state = self._load()
+        if state["state"] == STATE_CLOSED and not state["failures"]:
+            return
+        if state["state"] != STATE_CLOSED:
+            metrics.breaker_transitions.inc(self.name, STATE_CLOSED)
+            print(f"Circuit {self.name} closed")
+        self._save({"state": STATE_CLOSED, "failures": 0, "opened_until": 0.0, "reason": None})
+        self.backend.delete(self._probe_key)
+
+    def record_failure(self, reason: str) -> None:
+        state = self._load()
+        failures = state["failures"] + 1
+        if state["state"] == STATE_CLOSED and failures < self.failure_threshold:
+            state["failures"] = failures
+            self._save(state)
+            return
+        self.open(self.reset_timeout, reason, failures)
+
+    def open(self, seconds: float, reason: str, failures: Optional[int] = None) -> None:
+        """Відкриває запобіжник на seconds (обмежено max_open_time)"""
+        seconds = min(max(seconds, 1.0), self.max_open_time)
+        state = self._load()
+        opened_until = time.time() + seconds
+        was_open = state["state"] == STATE_OPEN and state["opened_until"] > time.time()
+        self._save({
+            "state": STATE_OPEN,
+            "failures": failures if failures is not None else state["failures"],
+            "opened_until": max(opened_until, state["opened_until"]) if was_open else opened_until,
+            "reason": reason[:300],
+        })
+        self.backend.delete(self._probe_key)
+        if not was_open:
+            metrics.breaker_transitions.inc(self.name, STATE_OPEN)
+            print(f"Circuit {self.name} open for {seconds:.0f} s: {reason[:300]}")
+
+    def reset(self) -> None:
+        """Примусово закриває запобіжник"""
+        self.backend.delete(self._key)
+        self.backend.delete(self._probe_key)
+
+
+def create_breaker(name: str) -> CircuitBreaker:
+    """
+    Запобіжник з налаштувань оточення.
+    SUMMARIZER_BREAKER_BACKEND: sqlite (спільний для процесів) | memory.
+    """
+    backend_name = os.getenv("SUMMARIZER_BREAKER_BACKEND", "sqlite")
+    path = os.getenv("SUMMARIZER_BREAKER_PATH")
+    if backend_name == "sqlite" and not path:
+        if has_app_context():
+            path = os.path.join(current_app.instance_path, "summarizer_breaker.sqlite")
+        else:
+            backend_name = "memory"
+    backend = create_cache(backend_name, path or "", max_entries=64, max_bytes=1024 * 1024)
+    return CircuitBreaker(
+        name,
+        backend=backend,
+        failure_threshold=int(os.getenv("SUMMARIZER_BREAKER_THRESHOLD", "5")),
+        reset_timeout=float(os.getenv("SUMMARIZER_BREAKER_RESET", "30")),
+        max_open_time=float(os.getenv("SUMMARIZER_BREAKER_MAX_OPEN", "600")),
+    )
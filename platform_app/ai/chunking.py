@@ -0,0 +1,100 @@
+"""
+Розбиття довгих текстів на фрагменти в межах бюджету токенів.
+
+Моделі на кшталт BART обрізають вхід після ~1024 токенів, тому довгий пост
+ділиться на фрагменти по межах абзаців; абзац, що не вміщується, ділиться
+по реченнях, надто довге речення - по словах, а слово довше за бюджет
+(URL, base64) - по символах. Фрагменти пакуються жадібно
+в порядку тексту: правка всередині абзацу зазвичай змінює лише його фрагмент,
+а резюме решти фрагментів беруться з кешу.
+"""
+from typing import List, Tuple
+
+from platform_app.ai.extractive import _PARAGRAPH_RE, split_sentences
+
+# Приблизна кількість символів на токен BPE: латиниця ~4, кирилиця та інші ~2
+ASCII_CHARS_PER_TOKEN = 4
+OTHER_CHARS_PER_TOKEN = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Оцінка кількості токенів без токенізатора моделі"""
+    # Для не-ASCII символів UTF-8 займає 2+ байти - різниця дає їх кількість
+    other = min(len(text.encode("utf-8")) - len(text), len(text))
+    ascii_chars = len(text) - other
+    return -(-ascii_chars // ASCII_CHARS_PER_TOKEN) + -(-other // OTHER_CHARS_PER_TOKEN)
+
+
+def _split_chars(word: str, max_tokens: int) -> List[str]:
+    """Слово довше за бюджет (URL, base64) ділиться по символах"""
+    max_tokens = max(max_tokens, 1)
+    pieces: List[str] = []
+    start = 0
+    while start < len(word):
+        end = min(len(word), start + max_tokens * ASCII_CHARS_PER_TOKEN)
+        while end - start > 1 and estimate_tokens(word[start:end]) > max_tokens:
+            excess = estimate_tokens(word[start:end]) - max_tokens
+            end = max(start + 1, end - excess * OTHER_CHARS_PER_TOKEN)
+        pieces.append(word[start:end])
+        start = end
+    return pieces
+
+
+def _split_words(sentence: str, max_tokens: int) -> List[str]:
+    """Останній засіб: речення довше за бюджет ділиться по словах"""
+    pieces: List[str] = []
+    current: List[str] = []
+    tokens = 0
+    for word in sentence.split():
+        if estimate_tokens(word) > max_tokens:
+            if current:
+                pieces.append(" ".join(current))
+                current, tokens = [], 0
+            pieces.extend(_split_chars(word, max_tokens))
+            continue
+        word_tokens = estimate_tokens(word) + 1
+        if current and tokens + word_tokens > max_tokens:
+            pieces.append(" ".join(current))
+            current, tokens = [], 0
+        current.append(word)
+        tokens += word_tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def _units(text: str, max_tokens: int) -> List[Tuple[str, int, bool]]:
+    """Одиниці пакування: (текст, токени, чи починає новий абзац)"""
+    units: List[Tuple[str, int, bool]] = []
+    for paragraph in _PARAGRAPH_RE.split(text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        tokens = estimate_tokens(paragraph)
+        if tokens <= max_tokens:
+            units.append((paragraph, tokens, True))
+            continue
+        first = True
+        for sentence in split_sentences(paragraph):
+            parts = [sentence] if estimate_tokens(sentence) <= max_tokens else _split_words(sentence, max_tokens)
+            for part in parts:
+                units.append((part, estimate_tokens(part), first))
+                first = False
+    return units
+
+
+def split_chunks(text: str, max_tokens: int) -> List[str]:
+    """Ділить текст на фрагменти не довші за max_tokens (за оцінкою estimate_tokens)"""
+    chunks: List[str] = []
+    current = ""
+    current_tokens = 0
+    for unit, tokens, new_paragraph in _units(text, max_tokens):
+        separator = "\n\n" if new_paragraph else " "
+        if current and current_tokens + tokens + 1 > max_tokens:
+            chunks.append(current)
+            current, current_tokens = "", 0
+        current = f"{current}{separator}{unit}" if current else unit
+        current_tokens += tokens + (1 if current_tokens else 0)
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,165 @@
+"""
+Локальний екстрактивний summarizer (без мережі).
+
+Текст розбивається на речення (з урахуванням кирилиці та скорочень),
+речення представляються TF-IDF векторами, матриця косинусної подібності
+задає граф речень, а важливість речень рахується TextRank (степеневий
+метод) матричними операціями NumPy. У резюме потрапляють найважливіші
+речення в початковому порядку, в межах бюджету слів та речень.
+"""
+import re
+from typing import List
+
+import numpy as np
+
+# Скорочення, після яких крапка не завершує речення
+ABBREVIATIONS = {
+    "т", "п", "д", "ін", "др", "і", "тис", "млн", "млрд", "грн", "коп", "р", "рр", "ст",
+    "вул", "просп", "пл", "буд", "кв", "обл", "м", "с", "див", "напр", "англ", "укр", "рос",
+    "проф", "акад", "доц", "канд", "наук", "ім", "св", "зв", "табл", "рис", "мал", "гл",
+    "e.g", "i.e", "etc", "vs", "mr", "mrs", "ms", "dr", "prof", "inc", "ltd", "jr", "sr", "no",
+}
+
+STOPWORDS = {
+    # українські
+    "і", "й", "та", "а", "але", "в", "у", "на", "з", "із", "зі", "до", "від", "по", "за",
+    "про", "для", "що", "як", "це", "цей", "ця", "ці", "той", "та", "ті", "так", "не", "ні",
+    "же", "ж", "би", "б", "чи", "то", "його", "її", "їх", "він", "вона", "воно", "вони", "ми",
+    "ви", "я", "ти", "є", "був", "була", "було", "були", "бути", "також", "вже", "ще", "при",
+    "через", "під", "над", "між", "якщо", "коли", "який", "яка", "яке", "які", "тому", "де",
+    "або", "лише", "тільки", "може", "можна", "треба", "свій", "своїх", "своє", "своя",
+    # англійські
+    "the", "a", "an", "and", "or", "but", "of", "to", "in", "on", "for", "with", "is", "are",
+    "was", "were", "be", "been", "it", "this", "that", "as", "at", "by", "from", "not", "we",
+    "you", "they", "he", "she", "his", "her", "their", "its", "our", "has", "have", "had",
+}
+
+# Межа речення: кінцевий розділовий знак, пробіли, далі велика літера, цифра, лапки або тире
+_BOUNDARY_RE = re.compile(r"([.!?…]+)([\"»”')\]]*)\s+(?=[\"«“'(\[—–-]?\s*[A-ZА-ЯІЇЄҐ0-9])")
+_WORD_RE = re.compile(r"[^\W\d_]+(?:['’ʼ][^\W\d_]+)*", re.UNICODE)
+_PARAGRAPH_RE = re.compile(r"\n\s*\n|\r\n\s*\r\n")
+
+# Довжина префікса слова, що використовується замість стемінгу
+STEM_LENGTH = 6
+
+
+def split_sentences(text: str) -> List[str]:
+    """Розбиває текст на речення"""
+    sentences: List[str] = []
+    for paragraph in _PARAGRAPH_RE.split(text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+
+        start = 0
+        for match in _BOUNDARY_RE.finditer(paragraph):
+            end = match.end(2)
+            candidate = paragraph[start:end]
+            # Не розриваємо після скорочень та ініціалів ("т. д.", "Т. Г. Шевченко")
+            last_word = candidate[: match.start(1) - start].rsplit(maxsplit=1)
+            token = last_word[-1].rstrip(".") if last_word else ""
+            is_initial = len(token) == 1 and token.isupper()
+            if match.group(1) == "." and (token.lower() in ABBREVIATIONS or is_initial):
+                continue
+            sentences.append(candidate.strip())
+            start = match.end()
+
+        tail = paragraph[start:].strip()
+        if tail:
+            sentences.append(tail)
+    return sentences
+
+
+def _terms(sentence: str) -> List[str]:
+    words = (word.lower() for word in _WORD_RE.findall(sentence))
+    return [word[:STEM_LENGTH] for word in words if len(word) > 2 and word not in STOPWORDS]
+
+
+def rank_sentences(sentences: List[str], damping: float = 0.85,
+                   iterations: int = 50, tolerance: float = 1e-6) -> np.ndarray:
+    """Повертає оцінку TextRank для кожного речення"""
+    count = len(sentences)
+    if count == 0:
+        return np.zeros(0)
+
+    vocabulary = {}
+    rows, cols = [], []
+    for row, sentence in enumerate(sentences):
+        for term in _terms(sentence):
+            rows.append(row)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+
+    if not vocabulary:
+        return np.ones(count) / count
+
+    # Матриця частот термінів (речення × терміни)
+    size = len(vocabulary)
+    flat = np.asarray(rows, dtype=np.int64) * size + np.asarray(cols, dtype=np.int64)
+    tf = np.bincount(flat, minlength=count * size).reshape(count, size).astype(np.float32)
+
+    # TF-IDF з логарифмічним TF та згладженим IDF
+    document_frequency = np.count_nonzero(tf, axis=0)
+    idf = np.log((1.0 + count) / (1.0 + document_frequency)) + 1.0
+    weights = np.log1p(tf) * idf.astype(np.float32)
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    weights /= np.where(norms == 0, 1.0, norms)
+
+    # Граф подібності: косинус між реченнями без петель
+    similarity = weights @ weights.T
+    np.fill_diagonal(similarity, 0.0)
+
+    # Стохастична матриця переходів; "висячі" речення ведуть рівномірно в усі
+    out_degree = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(
+        similarity, out_degree, out=np.full_like(similarity, 1.0 / count), where=out_degree > 0
+    )
+
+    scores = np.full(count, 1.0 / count, dtype=np.float32)
+    teleport = (1.0 - damping) / count
+    for _ in range(iterations):
+        updated = teleport + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < tolerance:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+class ExtractiveSummarizer:
+    """Екстрактивне резюме з бюджетом у реченнях та словах"""
+
+    def __init__(self, max_sentences: int = 3, max_words: int = 120, position_weight: float = 0.1):
+        self.max_sentences = max_sentences
+        self.max_words = max_words
+        self.position_weight = position_weight
+
+    def summarize(self, text: str) -> str:
+        if not text:
+            return ""
+
+        sentences = split_sentences(text)
+        if len(sentences) <= self.max_sentences:
+            return " ".join(sentences)
+
+        scores = rank_sentences(sentences)
+        # Невеликий бонус реченням на початку тексту (там зазвичай головна думка)
+        position = 1.0 / np.arange(1, len(sentences) + 1)
+        scores = scores / scores.max() + self.position_weight * position
+
+        chosen: List[int] = []
+        words = 0
+        for index in np.argsort(-scores, kind="stable"):
+            length = len(sentences[index].split())
+            if chosen and words + length > self.max_words:
+                continue
+            chosen.append(int(index))
+            words += length
+            if len(chosen) >= self.max_sentences:
+                break
+
+        return " ".join(sentences[index] for index in sorted(chosen))
+
+
+def extractive_summary(text: str, max_sentences: int = 3, max_words: int = 120) -> str:
+    """Зручна функція для екстрактивного резюме"""
+    return ExtractiveSummarizer(max_sentences=max_sentences, max_words=max_words).summarize(text)
@@ -0,0 +1,274 @@
+"""
+Фонова черга генерації ШІ-резюме.
+
+Пост зберігається одразу зі статусом ai_status="pending", а в таблицю
+summary_jobs додається завдання. Пул потоків (у процесі веб-застосунку або
+окремою командою `flask summaries worker`) забирає завдання, викликає
+Hugging Face API та повторює спроби з експоненційною затримкою. Поки
+запобіжник API відкритий, завдання відкладаються без витрати спроб.
+Будь-яка інша помилка витрачає спробу; після SUMMARY_JOB_MAX_ATTEMPTS
+завдання закривається зі статусом failed (зокрема й покинуте виконавцем).
+"""
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from flask import Flask
+from sqlalchemy import update
+
+from platform_app.ai.summarizer import CircuitOpenError, SummarizerError, get_summarizer
+from platform_app.core import rollups
+from platform_app.core.database import db
+from platform_app.core.signals import post_changed
+from platform_app.models.post import BlogPost
+from platform_app.models.summary_job import SummaryJob
+
+# Завдання у стані running довше цього часу вважаються покинутими
+STALE_JOB_TIMEOUT = timedelta(minutes=10)
+
+# Межа затримки між спробами (секунди)
+MAX_BACKOFF = 600.0
+
+
+def enqueue_summary(post: BlogPost, max_length: int = 200, min_length: int = 50) -> SummaryJob:
+    """Додає завдання генерації резюме в поточну сесію (commit робить викликач)"""
+    post.ai_status = SummaryJob.STATUS_PENDING
+    job = SummaryJob(max_length=max_length, min_length=min_length)
+    post.summary_jobs.append(job)
+    db.session.add(job)
+    return job
+
+
+def backoff_delay(attempt: int, base: float, estimated_time: Optional[float] = None) -> float:
+    """Затримка перед наступною спробою; для 503 враховує estimated_time від API"""
+    delay = min(base * (2 ** max(attempt - 1, 0)), MAX_BACKOFF)
+    if estimated_time:
+        delay = max(delay, min(estimated_time, MAX_BACKOFF))
+    return delay
+
+
+def _release_stale_jobs(max_attempts: int) -> None:
+    """
+    Повертає в чергу завдання, чий виконавець зник (наприклад, воркер перезапущено).
+    Завдання з вичерпаними спробами закриваються: інакше пост, на якому падає
+    виконавець, повторювався б безкінечно.
+    """
+    stale = (
+        (SummaryJob.status == SummaryJob.STATUS_RUNNING)
+        & (SummaryJob.updated_at < datetime.utcnow() - STALE_JOB_TIMEOUT)
+    )
+    exhausted = stale & (SummaryJob.attempts >= max_attempts)
+    db.session.execute(
+        update(BlogPost)
+        .where(BlogPost.id.in_(db.select(SummaryJob.post_id).where(exhausted)))
+        .values(ai_status=SummaryJob.STATUS_FAILED),
+        execution_options={"synchronize_session": False},
+    )
+    db.session.execute(
+        update(SummaryJob)
+        .where(exhausted)
+        .values(status=SummaryJob.STATUS_FAILED, last_error="Worker stopped while running the job"),
+        execution_options={"synchronize_session": False},
+    )
+    db.session.execute(
+        update(SummaryJob).where(stale).values(status=SummaryJob.STATUS_PENDING),
+        execution_options={"synchronize_session": False},
+    )
+    db.session.commit()
+
+
+def claim_jobs(limit: int) -> List[int]:
+    """
+    Атомарно забирає до limit готових до виконання завдань.
+    Умовний UPDATE гарантує, що кожне завдання отримає лише один виконавець.
+    """
+    now = datetime.utcnow()
+    candidates = db.session.execute(
+        db.select(SummaryJob.id)
+        .where(SummaryJob.status == SummaryJob.STATUS_PENDING)
+        .where(SummaryJob.run_after <= now)
+        .order_by(SummaryJob.run_after)
+        .limit(limit)
+    ).scalars().all()
+
+    claimed = []
+    for job_id in candidates:
+        result = db.session.execute(
+            update(SummaryJob)
+            .where(SummaryJob.id == job_id, SummaryJob.status == SummaryJob.STATUS_PENDING)
+            .values(
+                status=SummaryJob.STATUS_RUNNING,
+                attempts=SummaryJob.attempts + 1,
+                updated_at=now,
+            )
+        )
+        if result.rowcount == 1:
+            claimed.append(job_id)
+    db.session.commit()
+    return claimed
+
+
+def _complete(job: SummaryJob, summary: Optional[str], generated: bool, app: Flask) -> None:
+    """Записує результат у пост і закриває завдання"""
+    post = job.post
+    was_generated = bool(post.ai_generated)
+    post.ai_summary = summary
+    post.ai_generated = generated and bool(summary)
+    if post.is_published and post.ai_generated != was_generated:
+        rollups.ai_posts_changed(1 if post.ai_generated else -1)
+    post.ai_status = SummaryJob.STATUS_DONE if generated else SummaryJob.STATUS_FAILED
+    if not post.summary and summary:
+        post.summary = summary
+    job.status = SummaryJob.STATUS_DONE if generated else SummaryJob.STATUS_FAILED
+    db.session.commit()
+
+    post_changed.send(
+        app, post_id=post.id, slug=post.slug, author_id=post.author_id, action="updated"
+    )
+
+
+def _retry_or_fail(job: SummaryJob, error: Exception, max_attempts: int, base_delay: float,
+                   summarizer, app: Flask) -> None:
+    """Відкладає завдання з затримкою або, якщо спроби вичерпано, закриває його fallback-резюме"""
+    job.last_error = (str(error) or type(error).__name__)[:1000]
+
+    if job.attempts >= max_attempts:
+        # Спроби вичерпано - використовуємо простий fallback
+        try:
+            fallback = summarizer.summarize_fallback(job.post.content)
+        except Exception as e:
+            print(f"Summary fallback error (post {job.post_id}): {e}")
+            fallback = None
+        _complete(job, fallback or None, generated=False, app=app)
+        return
+
+    job.status = SummaryJob.STATUS_PENDING
+    job.run_after = datetime.utcnow() + timedelta(
+        seconds=backoff_delay(job.attempts, base_delay, getattr(error, "estimated_time", None))
+    )
+    db.session.commit()
+
+
+def process_job(job_id: int, app: Flask) -> None:
+    """Виконує одне завдання (очікується, що воно вже забране claim_jobs)"""
+    job = db.session.get(SummaryJob, job_id)
+    if job is None:
+        return
+    if job.post is None:
+        # Пост видалено, а каскад FK не спрацював - завдання не виконується
+        job.status = SummaryJob.STATUS_FAILED
+        job.last_error = "Post was deleted"
+        db.session.commit()
+        return
+
+    summarizer = get_summarizer()
+    max_attempts = app.config.get("SUMMARY_JOB_MAX_ATTEMPTS", 5)
+    base_delay = app.config.get("SUMMARY_JOB_RETRY_DELAY", 15.0)
+
+    try:
+        summary = summarizer.request_summary(
+            job.post.content, max_length=job.max_length, min_length=job.min_length
+        )
+    except CircuitOpenError as e:
+        # Запит не надсилався - спроба не рахується, повертаємось після відкриття запобіжника
+        job.attempts -= 1
+        job.status = SummaryJob.STATUS_PENDING
+        job.run_after = datetime.utcnow() + timedelta(seconds=e.estimated_time or base_delay)
+        db.session.commit()
+        return
+    except Exception as e:
+        # SummarizerError та непередбачені помилки витрачають спробу
+        if not isinstance(e, SummarizerError):
+            print(f"Summary job {job_id} error: {type(e).__name__}: {e}")
+        db.session.rollback()
+        _retry_or_fail(job, e, max_attempts, base_delay, summarizer, app)
+        return
+
+    try:
+        _complete(job, summary, generated=summary is not None, app=app)
+    except Exception as e:
+        db.session.rollback()
+        print(f"Summary job {job_id} error: {type(e).__name__}: {e}")
+        # Помилка після commit (у обробнику сигналу) - результат уже записано
+        if job.status == SummaryJob.STATUS_RUNNING:
+            _retry_or_fail(job, e, max_attempts, base_delay, summarizer, app)
+
+
+class SummaryWorker:
+    """Пул потоків, що виконує завдання з таблиці summary_jobs"""
+
+    def __init__(self) -> None:
+        self._app: Optional[Flask] = None
+        self._threads: List[threading.Thread] = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self.poll_interval = 5.0
+
+    def init_app(self, app: Flask) -> None:
+        self._app = app
+        self.poll_interval = app.config.get("SUMMARY_WORKER_POLL_INTERVAL", self.poll_interval)
+
+    def start(self, threads: int) -> None:
+        """Запускає потоки-виконавці (один раз на процес)"""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f"summary-worker-{i}", daemon=True)
+                for i in range(threads)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def notify(self) -> None:
+        """Будить виконавців після додавання нового завдання"""
+        self._wake.set()
+
+    def run_pending(self, limit: int = 10) -> int:
+        """Виконує готові завдання в поточному потоці. Повертає їх кількість."""
+        with self._app.app_context():
+            _release_stale_jobs(self._app.config.get("SUMMARY_JOB_MAX_ATTEMPTS", 5))
+            job_ids = claim_jobs(limit)
+            for job_id in job_ids:
+                try:
+                    process_job(job_id, self._app)
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Summary job {job_id} error: {e}")
+            return len(job_ids)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.run_pending(limit=1)
+            except Exception as e:
+                print(f"Summary worker error: {e}")
+                processed = 0
+            if not processed:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+
+# Глобальний виконавець
+summary_worker = SummaryWorker()
+
+
+def init_summary_worker(app: Flask) -> None:
+    """Підключає чергу; у режимі in-process потоки стартують з першим запитом воркера"""
+    summary_worker.init_app(app)
+
+    if app.config.get("SUMMARY_WORKER_INPROCESS", True):
+        threads = app.config.get("SUMMARY_WORKER_THREADS", 2)
+
+        @app.before_request
+        def _start_summary_worker() -> None:
+            summary_worker.start(threads)
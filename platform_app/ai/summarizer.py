@@ -1,34 +1,125 @@
 """
 Модуль штучного інтелекту для генерації резюме текстів.
 Використовує Hugging Face Inference API для summarization.
+
+Звернення до API обмежені запобіжником (ai/breaker.py) та бюджетом часу
+SUMMARIZER_LATENCY_BUDGET: коли API деградує, виклики одразу завершуються
+помилкою (або локальним резюме в summarize), а не чекають повний тайм-аут.
+
+Довгі тексти (понад SUMMARIZER_CHUNK_TOKENS) резюмуються map-reduce:
+фрагменти (ai/chunking.py) паралельно, потім - об'єднані часткові резюме.
 """
 import os
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from platform_app.ai.breaker import STATE_CLOSED, CircuitBreaker, create_breaker
+from platform_app.ai.chunking import estimate_tokens, split_chunks
+from platform_app.ai.extractive import ExtractiveSummarizer
+from platform_app.ai.summary_cache import SummaryCache, get_summary_cache
+from platform_app.core.metrics import metrics
+
+
+class SummarizerError(Exception):
+    """Помилка звернення до API генерації резюме"""
+
+
+class ModelLoadingError(SummarizerError):
+    """Модель ще завантажується (HTTP 503); estimated_time - підказка API в секундах"""
+
+    def __init__(self, message: str, estimated_time: Optional[float] = None):
+        super().__init__(message)
+        self.estimated_time = estimated_time
+
+
+class CircuitOpenError(SummarizerError):
+    """Запит не надіслано: запобіжник відкритий; estimated_time - секунди до наступної спроби"""
+
+    def __init__(self, message: str, estimated_time: Optional[float] = None):
+        super().__init__(message)
+        self.estimated_time = estimated_time
+
+
+class BudgetExceededError(SummarizerError):
+    """Бюджет часу виклику вичерпано"""
+
+
+# Менше цього часу на запит не починаємо - відповідь однаково не встигне
+MIN_ATTEMPT_TIME = 1.0
+
+# Максимум рівнів reduce: часткові резюме, що не вміщуються, резюмуються ще раз
+MAX_REDUCE_LEVELS = 3
 
 
 class TextSummarizer:
     """
     Клас для генерації коротких резюме текстів за допомогою Hugging Face API.
     Використовує модель facebook/bart-large-cnn для англійської мови.
+    
+    SUMMARIZER_ENGINE=local вмикає локальний екстрактивний режим (без мережі).
     """
     
     DEFAULT_MODEL = "facebook/bart-large-cnn"
     BASE_URL = "https://api-inference.huggingface.co/models"
     
-    def __init__(self, api_token: Optional[str] = None, model: Optional[str] = None):
+    ENGINE_HUGGINGFACE = "huggingface"
+    ENGINE_LOCAL = "local"
+    
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        model: Optional[str] = None,
+        cache: Optional[SummaryCache] = None,
+        engine: Optional[str] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
         """
         Ініціалізація summarizer.
         
         Args:
             api_token: Hugging Face API token (рекомендовано для стабільності)
             model: Назва моделі (за замовчуванням: facebook/bart-large-cnn)
+            cache: Кеш резюме (за замовчуванням - глобальний get_summary_cache())
+            engine: huggingface (за замовчуванням) або local
+            breaker: Запобіжник (за замовчуванням - create_breaker("summarizer"))
         """
+        self.engine = (engine or os.getenv("SUMMARIZER_ENGINE", self.ENGINE_HUGGINGFACE)).lower()
         self.api_token = api_token or os.getenv("HUGGINGFACE_API_TOKEN")
         self.model = model or os.getenv("HUGGINGFACE_MODEL", self.DEFAULT_MODEL)
+        self.base_url = os.getenv("HUGGINGFACE_API_URL", self.BASE_URL).rstrip("/")
+        self.cache = cache if cache is not None else get_summary_cache()
+        self.breaker = breaker if breaker is not None else create_breaker("summarizer")
+        
+        # Тайм-аути одного HTTP-запиту та бюджет усього виклику (секунди)
+        self.connect_timeout = float(os.getenv("SUMMARIZER_CONNECT_TIMEOUT", "3.05"))
+        self.timeout = float(os.getenv("SUMMARIZER_TIMEOUT", "20"))
+        self.latency_budget = float(os.getenv("SUMMARIZER_LATENCY_BUDGET", "30"))
+        
+        # Довгі тексти: бюджет токенів фрагмента та паралельні запити фрагментів
+        self.chunk_tokens = int(os.getenv("SUMMARIZER_CHUNK_TOKENS", "900"))
+        self.chunk_concurrency = int(os.getenv("SUMMARIZER_CHUNK_CONCURRENCY", "4"))
+        self._chunk_pool: Optional[ThreadPoolExecutor] = None
+        self._chunk_pool_lock = threading.Lock()
+        
+        # Одна сесія з пулом з'єднань: TCP/TLS не відкривається заново на кожен запит
+        pool_size = int(os.getenv("HUGGINGFACE_POOL_SIZE", "10"))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if self.api_token:
+            self.session.headers["Authorization"] = f"Bearer {self.api_token}"
         
-        if not self.api_token and os.getenv("FLASK_ENV") == "production":
+        if (
+            self.engine == self.ENGINE_HUGGINGFACE
+            and not self.api_token
+            and os.getenv("FLASK_ENV") == "production"
+        ):
             print(
                 "WARNING: HUGGINGFACE_API_TOKEN не вказано. "
                 "API може працювати повільніше або з обмеженнями."
@@ -50,62 +141,289 @@ class TextSummarizer:
             
         Returns:
             Резюме тексту або None у разі помилки
+            (локальне резюме, якщо API недоступне за запобіжником чи бюджетом)
+        """
+        try:
+            return self.request_summary(text, max_length=max_length, min_length=min_length)
+        except (CircuitOpenError, BudgetExceededError):
+            # API деградувало - не чекаємо, а одразу рахуємо локально
+            return self.summarize_local(text, max_length=max_length) or None
+        except ModelLoadingError:
+            # Модель ще завантажується
+            return None
+        except SummarizerError as e:
+            print(f"Hugging Face API error: {e}")
+            return None
+    
+    def request_summary(
+        self,
+        text: str,
+        max_length: int = 150,
+        min_length: int = 50,
+        budget: Optional[float] = None,
+    ) -> Optional[str]:
         """
+        Те саме, що summarize, але помилки API передаються як винятки.
+        budget - бюджет часу в секундах (за замовчуванням SUMMARIZER_LATENCY_BUDGET).
+        
+        Raises:
+            ModelLoadingError: модель ще завантажується (можна повторити пізніше)
+            CircuitOpenError: запобіжник відкритий, запит не надсилався
+            BudgetExceededError: бюджет часу вичерпано
+            SummarizerError: інша помилка API або мережі
+        """
+        deadline = time.monotonic() + (budget or self.latency_budget)
         if not text or len(text.strip()) < 50:
             return None
         
-        url = f"{self.BASE_URL}/{self.model}"
+        if self.engine == self.ENGINE_LOCAL:
+            return self.summarize_local(text, max_length=max_length) or None
         
-        headers = {}
-        if self.api_token:
-            headers["Authorization"] = f"Bearer {self.api_token}"
+        cached = self.cache.get(self.model, text, max_length, min_length)
+        if cached is not None:
+            return cached
+        
+        if estimate_tokens(text) > self.chunk_tokens:
+            summary = self._summarize_long(text, max_length, min_length, deadline)
+        else:
+            summary = self._call_api(text, max_length, min_length, deadline)
+        if summary:
+            self.cache.set(self.model, text, max_length, min_length, summary)
+        return summary
+    
+    def summarize_batch(
+        self,
+        texts: List[str],
+        max_length: int = 150,
+        min_length: int = 50,
+        budget: Optional[float] = None,
+    ) -> List[Optional[str]]:
+        """
+        Генерує резюме для кількох текстів одним запитом (inputs - список).
+        Тексти, що вже є в кеші, до API не надсилаються.
+        
+        Raises:
+            ModelLoadingError, SummarizerError - як у request_summary
+        """
+        deadline = time.monotonic() + (budget or self.latency_budget)
+        if self.engine == self.ENGINE_LOCAL:
+            return [
+                self.summarize_local(text, max_length=max_length) or None
+                if text and len(text.strip()) >= 50 else None
+                for text in texts
+            ]
+        
+        results: List[Optional[str]] = [None] * len(texts)
+        missing = []
+        long_texts = []
+        for index, text in enumerate(texts):
+            if not text or len(text.strip()) < 50:
+                continue
+            cached = self.cache.get(self.model, text, max_length, min_length)
+            if cached is not None:
+                results[index] = cached
+            elif estimate_tokens(text) > self.chunk_tokens:
+                long_texts.append(index)
+            else:
+                missing.append(index)
+        
+        # Довгі тексти не вміщуються в один inputs - резюмуються окремо map-reduce
+        for index in long_texts:
+            summary = self._summarize_long(texts[index], max_length, min_length, deadline)
+            if summary:
+                results[index] = summary
+                self.cache.set(self.model, texts[index], max_length, min_length, summary)
+        
+        if not missing:
+            return results
+        
+        result = self._post({
+            "inputs": [texts[index] for index in missing],
+            "parameters": {
+                "max_length": max_length,
+                "min_length": min_length,
+                "do_sample": False,
+            },
+        }, deadline)
+        if not isinstance(result, list) or len(result) != len(missing):
+            raise SummarizerError("Unexpected batch response from Hugging Face API")
+        
+        for index, item in zip(missing, result):
+            # Залежно від pipeline елемент може бути словником або списком з одного словника
+            if isinstance(item, list) and item:
+                item = item[0]
+            summary = item.get("summary_text", "").strip() if isinstance(item, dict) else ""
+            if summary:
+                results[index] = summary
+                self.cache.set(self.model, texts[index], max_length, min_length, summary)
+        return results
+    
+    def _summarize_long(self, text: str, max_length: int, min_length: int, deadline: float) -> Optional[str]:
+        """
+        Map-reduce: резюме фрагментів паралельно, потім резюме їх об'єднання.
+        Час виклику визначає найповільніший фрагмент, а не сума всіх.
+        """
+        for _ in range(MAX_REDUCE_LEVELS):
+            chunks = split_chunks(text, self.chunk_tokens)
+            if len(chunks) <= 1:
+                break
+            partials = self._map_chunks(chunks, max_length, min_length, deadline)
+            text = "\n\n".join(partial for partial in partials if partial)
+            if estimate_tokens(text) <= self.chunk_tokens:
+                break
+        if not text:
+            return None
+        return self._call_api(text, max_length, min_length, deadline)
+    
+    def _map_chunks(self, chunks: List[str], max_length: int, min_length: int,
+                    deadline: float) -> List[Optional[str]]:
+        """
+        Резюме фрагментів. Кеш перевіряється та оновлюється в потоці викликача
+        (постійний кеш потребує контексту застосунку), у пулі - лише HTTP-запити.
+        Успішні фрагменти кешуються навіть при помилці інших: повтор
+        надсилає лише ті, що не вдалися. Якщо запобіжник не закритий, спершу
+        надсилається один фрагмент (пробний запит), решта - лише після його успіху.
+        """
+        results: List[Optional[str]] = [
+            self.cache.get(self.model, chunk, max_length, min_length) for chunk in chunks
+        ]
+        missing = [index for index, summary in enumerate(results) if summary is None]
+        if not missing:
+            return results
+        
+        batches = [missing]
+        if len(missing) > 1 and self.breaker.state()["state"] != STATE_CLOSED:
+            # Пробний токен напіввідкритого запобіжника отримує лише один запит
+            batches = [missing[:1], missing[1:]]
+        
+        pool = self._get_chunk_pool()
+        errors: Dict[int, SummarizerError] = {}
+        for batch in batches:
+            futures = {
+                index: pool.submit(self._call_api, chunks[index], max_length, min_length, deadline)
+                for index in batch
+            }
+            for index, future in futures.items():
+                try:
+                    results[index] = future.result()
+                except SummarizerError as e:
+                    errors[index] = e
+                    continue
+                if results[index]:
+                    self.cache.set(self.model, chunks[index], max_length, min_length, results[index])
+            if errors:
+                break
         
-        payload = {
+        if errors:
+            raise errors[min(errors)]
+        return results
+    
+    def _get_chunk_pool(self) -> ThreadPoolExecutor:
+        """Спільний пул запитів фрагментів: обмежує паралельність для всіх викликачів"""
+        if self._chunk_pool is None:
+            with self._chunk_pool_lock:
+                if self._chunk_pool is None:
+                    self._chunk_pool = ThreadPoolExecutor(
+                        max_workers=self.chunk_concurrency, thread_name_prefix="summary-chunk"
+                    )
+        return self._chunk_pool
+    
+    def _call_api(self, text: str, max_length: int, min_length: int, deadline: float) -> Optional[str]:
+        """Один запит до Hugging Face Inference API"""
+        result = self._post({
             "inputs": text,
             "parameters": {
                 "max_length": max_length,
                 "min_length": min_length,
                 "do_sample": False,
             },
-        }
+        }, deadline)
+        if isinstance(result, list) and len(result) > 0:
+            summary = result[0].get("summary_text", "")
+            return summary.strip() if summary else None
+        elif isinstance(result, dict) and "summary_text" in result:
+            return result["summary_text"].strip()
+        return None
+    
+    def _post(self, payload: dict, deadline: float) -> Any:
+        """
+        POST до моделі через сесію з пулом з'єднань; повертає розібраний JSON.
+        Тайм-аут читання обмежений залишком бюджету до deadline (time.monotonic).
+        """
+        url = f"{self.base_url}/{self.model}"
+        
+        # Бюджет - до запобіжника: інакше пробний токен half-open лишився б зайнятим
+        remaining = deadline - time.monotonic()
+        if remaining < MIN_ATTEMPT_TIME:
+            metrics.budget_exceeded.inc("summarizer")
+            raise BudgetExceededError("Latency budget exhausted before calling Hugging Face API")
+        
+        retry_after = self.breaker.allow()
+        if retry_after is not None:
+            raise CircuitOpenError("Hugging Face API circuit is open", estimated_time=retry_after)
+        
+        read_timeout = min(self.timeout, remaining)
         
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    summary = result[0].get("summary_text", "")
-                    return summary.strip() if summary else None
-                elif isinstance(result, dict) and "summary_text" in result:
-                    return result["summary_text"].strip()
-            elif response.status_code == 503:
-                # Модель ще завантажується
-                return None
-            else:
-                print(f"Hugging Face API error: {response.status_code} - {response.text}")
-                return None
-                
+            with metrics.outbound("summarizer"):
+                response = self.session.post(
+                    url, json=payload, timeout=(min(self.connect_timeout, read_timeout), read_timeout)
+                )
         except requests.exceptions.RequestException as e:
-            print(f"Error calling Hugging Face API: {e}")
-            return None
+            self.breaker.record_failure(f"{type(e).__name__}: {e}")
+            if isinstance(e, requests.exceptions.Timeout) and read_timeout < self.timeout:
+                metrics.budget_exceeded.inc("summarizer")
+                raise BudgetExceededError(f"Hugging Face API did not answer within budget: {e}") from e
+            raise SummarizerError(f"Error calling Hugging Face API: {e}") from e
+        
+        if response.status_code == 200:
+            self.breaker.record_success()
+            try:
+                return response.json()
+            except ValueError as e:
+                raise SummarizerError(f"Invalid JSON from Hugging Face API: {e}") from e
+        
+        if response.status_code == 503:
+            estimated_time = None
+            try:
+                estimated_time = float(response.json().get("estimated_time"))
+            except (ValueError, TypeError, AttributeError):
+                pass
+            if estimated_time:
+                # Модель завантажується - до estimated_time запити не надсилаємо взагалі
+                self.breaker.open(estimated_time, "model is loading")
+            else:
+                self.breaker.record_failure("503 Service Unavailable")
+            raise ModelLoadingError("Model is loading", estimated_time=estimated_time)
+        
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_header = response.headers.get("Retry-After", "")
+            if response.status_code == 429 and retry_header.isdigit():
+                self.breaker.open(float(retry_header), "rate limited")
+            else:
+                self.breaker.record_failure(f"HTTP {response.status_code}")
+        else:
+            # 4xx - помилка запиту, а не недоступність API
+            self.breaker.record_success()
+        
+        raise SummarizerError(f"{response.status_code} - {response.text}")
     
     def summarize_fallback(self, text: str, max_sentences: int = 3) -> str:
         """
-        Просте резюме без ШІ (fallback метод).
+        Екстрактивне резюме без мережі (fallback метод, див. ai/extractive.py).
         Використовується, якщо API недоступне.
         """
         if not text:
             return ""
         
-        sentences = text.split(". ")
-        if len(sentences) <= max_sentences:
-            return text
-        
-        summary = ". ".join(sentences[:max_sentences])
-        if not summary.endswith("."):
-            summary += "."
-        return summary
+        return ExtractiveSummarizer(max_sentences=max_sentences).summarize(text)
+    
+    def summarize_local(self, text: str, max_length: int = 150) -> str:
+        """
+        Локальне екстрактивне резюме (TextRank), без звернення до мережі.
+        max_length інтерпретується як бюджет у словах.
+        """
+        return ExtractiveSummarizer(max_sentences=5, max_words=max_length).summarize(text)
 
 
 # Глобальний екземпляр
@@ -0,0 +1,153 @@
+"""
+Кеш резюме за хешем вмісту.
+
+Два рівні:
+- LRU у пам'яті процесу з обмеженням розміру та TTL;
+- постійна таблиця ai_summary_cache у БД, спільна для воркерів і переживає рестарт.
+
+Ключ - sha256 від (модель, max_length, min_length, текст), тому повторне
+надсилання того самого тексту не звертається до API.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from flask import has_app_context
+from sqlalchemy.exc import SQLAlchemyError
+
+from platform_app.core.database import db
+from platform_app.models.summary_cache import SummaryCacheEntry
+
+
+def make_key(model: str, text: str, max_length: int, min_length: int) -> str:
+    """Хеш параметрів генерації"""
+    digest = hashlib.sha256()
+    digest.update(f"{model}\0{max_length}\0{min_length}\0".encode())
+    digest.update(text.encode())
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """Дворівневий кеш резюме"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0, persistent: bool = True) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persistent = persistent
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+    def get(self, model: str, text: str, max_length: int, min_length: int) -> Optional[str]:
+        """Повертає збережене резюме або None"""
+        key = make_key(model, text, max_length, min_length)
+
+        summary = self._memory_get(key)
+        if summary is not None:
+            self.stats["memory_hits"] += 1
+            return summary
+
+        summary = self._persistent_get(key)
+        if summary is not None:
+            self.stats["persistent_hits"] += 1
+            self._memory_set(key, summary)
+            return summary
+
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, model: str, text: str, max_length: int, min_length: int, summary: str) -> None:
+        """Зберігає резюме в обидва рівні"""
+        key = make_key(model, text, max_length, min_length)
+        self._memory_set(key, summary)
+        self._persistent_set(key, model, summary)
+        self.stats["stores"] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = dict(self.stats)
+        stats["memory_entries"] = len(self._memory)
+        return stats
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    # Рівень пам'яті
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            summary, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._memory[key]
+                self.stats["evictions"] += 1
+                return None
+            self._memory.move_to_end(key)
+            return summary
+
+    def _memory_set(self, key: str, summary: str) -> None:
+        with self._lock:
+            self._memory[key] = (summary, time.monotonic() + self.ttl)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    # Постійний рівень (окреме з'єднання, щоб не зачіпати транзакцію запиту)
+
+    def _persistent_get(self, key: str) -> Optional[str]:
+        if not self.persistent or not has_app_context():
+            return None
+        try:
+            with db.engine.connect() as conn:
+                return conn.execute(
+                    db.select(SummaryCacheEntry.summary).where(SummaryCacheEntry.key == key)
+                ).scalar()
+        except SQLAlchemyError as e:
+            print(f"Summary cache read error: {e}")
+            return None
+
+    def _persistent_set(self, key: str, model: str, summary: str) -> None:
+        if not self.persistent or not has_app_context():
+            return
+        table = SummaryCacheEntry.__table__
+        try:
+            with db.engine.begin() as conn:
+                exists = conn.execute(
+                    db.select(table.c.key).where(table.c.key == key)
+                ).first()
+                if exists is None:
+                    conn.execute(table.insert().values(
+                        key=key, model=model, summary=summary, created_at=datetime.utcnow()
+                    ))
+        except SQLAlchemyError as e:
+            # Наприклад, інший воркер вставив той самий ключ одночасно
+            print(f"Summary cache write error: {e}")
+
+
+# Глобальний кеш
+_cache_instance: Optional[SummaryCache] = None
+
+
+def get_summary_cache() -> SummaryCache:
+    """Отримує або створює глобальний кеш резюме (налаштування з оточення)"""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = SummaryCache(
+            max_entries=int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "1024")),
+            ttl=float(os.getenv("SUMMARY_CACHE_TTL", "3600")),
+            persistent=os.getenv("SUMMARY_CACHE_PERSISTENT", "True").lower() == "true",
+        )
+    return _cache_instance
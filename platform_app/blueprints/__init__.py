@@ -7,6 +7,7 @@ from platform_app.blueprints.auth import auth_bp
 from platform_app.blueprints.posts import posts_bp
 from platform_app.blueprints.users import users_bp
 from platform_app.blueprints.statistics import stats_bp
+from platform_app.blueprints.feeds import feeds_bp
 
 
 def register_blueprints(app: Flask) -> None:
@@ -15,6 +16,7 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(posts_bp, url_prefix="/posts")
     app.register_blueprint(users_bp, url_prefix="/users")
     app.register_blueprint(stats_bp)
+    app.register_blueprint(feeds_bp)
     
     # Головна сторінка
     from platform_app.blueprints.main import main_bp
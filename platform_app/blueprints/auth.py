@@ -6,6 +6,7 @@ from flask_login import login_user, logout_user, login_required, current_user
 
 from platform_app.models.user import UserAccount
 from platform_app.core.database import db
+from platform_app.core import rollups
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -102,6 +103,7 @@ def process_register():
     new_user.set_password(password)
     
     db.session.add(new_user)
+    rollups.user_created()
     db.session.commit()
     
     login_user(new_user)
@@ -0,0 +1,83 @@
+"""
+Blueprint стрічок RSS/Atom, карти сайту та robots.txt
+
+Відповіді - готові файли з core/feeds.py, тож пошукові роботи та
+агрегатори не проходять динамічні сторінки списків.
+"""
+from flask import Blueprint, Response, url_for
+
+from platform_app.core.feeds import ATOM, MIMETYPES, RSS, feeds
+from platform_app.core.routing import replica_router
+
+feeds_bp = Blueprint("feeds", __name__)
+
+
+@feeds_bp.route("/feed.xml")
+@replica_router.replica_reads
+def site_rss():
+    """Загальна стрічка RSS"""
+    return feeds.serve(feeds.site_feed(RSS), MIMETYPES[RSS])
+
+
+@feeds_bp.route("/feed.atom")
+@replica_router.replica_reads
+def site_atom():
+    """Загальна стрічка Atom"""
+    return feeds.serve(feeds.site_feed(ATOM), MIMETYPES[ATOM])
+
+
+@feeds_bp.route("/users/<username>/feed.xml")
+@replica_router.replica_reads
+def author_rss(username: str):
+    """Стрічка RSS автора"""
+    return feeds.serve(feeds.author_feed(RSS, username), MIMETYPES[RSS])
+
+
+@feeds_bp.route("/users/<username>/feed.atom")
+@replica_router.replica_reads
+def author_atom(username: str):
+    """Стрічка Atom автора"""
+    return feeds.serve(feeds.author_feed(ATOM, username), MIMETYPES[ATOM])
+
+
+@feeds_bp.route("/posts/tag/<path:tag>/feed.xml")
+@replica_router.replica_reads
+def tag_rss(tag: str):
+    """Стрічка RSS тегу"""
+    return feeds.serve(feeds.tag_feed(RSS, tag), MIMETYPES[RSS])
+
+
+@feeds_bp.route("/posts/tag/<path:tag>/feed.atom")
+@replica_router.replica_reads
+def tag_atom(tag: str):
+    """Стрічка Atom тегу"""
+    return feeds.serve(feeds.tag_feed(ATOM, tag), MIMETYPES[ATOM])
+
+
+@feeds_bp.route("/sitemap.xml")
+@replica_router.replica_reads
+def sitemap_index():
+    """Індекс карти сайту"""
+    return feeds.serve(feeds.sitemap_index(), MIMETYPES["sitemap"])
+
+
+@feeds_bp.route("/sitemap-<int:chunk>.xml")
+@replica_router.replica_reads
+def sitemap_chunk(chunk: int):
+    """Частина карти сайту"""
+    return feeds.serve(feeds.sitemap_chunk(chunk), MIMETYPES["sitemap"])
+
+
+@feeds_bp.route("/robots.txt")
+def robots():
+    """Спрямовує роботів на карту сайту замість сторінок пошуку та пагінації"""
+    lines = [
+        "User-agent: *",
+        f"Disallow: {url_for('posts.list_posts')}?q=",
+        "",
+        f"Sitemap: {feeds.base_url()}{url_for('feeds.sitemap_index')}",
+    ]
+    response = Response("\n".join(lines) + "\n", mimetype="text/plain")
+    response.cache_control.public = True
+    response.cache_control.max_age = feeds.max_age
+    return response
@@ -3,23 +3,23 @@
 """
 from flask import Blueprint, render_template
 
-from platform_app.models.post import BlogPost
-from platform_app.core.database import db
 from platform_app.core.config import AppConfig
+from platform_app.core.listings import latest_cards
+from platform_app.core.page_cache import page_cache, LISTING_TAG, author_tag
+from platform_app.core.conditional import conditional_get, listing_validator
+from platform_app.core.routing import replica_router
 
 main_bp = Blueprint("main", __name__)
 
 
 @main_bp.route("/")
+@replica_router.replica_reads
+@conditional_get.conditional(listing_validator)
+@page_cache.cached(tags=[LISTING_TAG])
 def home():
     """Головна сторінка зі списком останніх постів"""
-    posts = (
-        BlogPost.query
-        .filter_by(is_published=True)
-        .order_by(BlogPost.published_at.desc())
-        .limit(AppConfig.POSTS_PER_PAGE)
-        .all()
-    )
+    posts = latest_cards(AppConfig.POSTS_PER_PAGE, is_published=True)
+    page_cache.tag(*(author_tag(post.author_id) for post in posts))
     
     return render_template("main/home.html", posts=posts)
 
@@ -1,53 +1,179 @@
 """
 Blueprint для роботи з блог-постами
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, abort
+from datetime import datetime, timezone
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash, abort, current_app
 from flask_login import login_required, current_user
-from sqlalchemy import or_
+from sqlalchemy import func
 
 from platform_app.models.post import BlogPost
 from platform_app.models.user import UserAccount
+from platform_app.models.related import RelatedPost
+from platform_app.models.rollups import PlatformCounter
+from platform_app.models.trending import TrendingPost
 from platform_app.core.database import db
 from platform_app.core.config import AppConfig
-from sqlalchemy import func
+from platform_app.core import related as related_index, rollups, search, tags as tag_index
+from platform_app.core.listings import card_select, post_criteria, count_select
+from platform_app.core.pagination import paginate_keyset, invalidate_counts
+from platform_app.core.page_cache import page_cache, LISTING_TAG, RELATED_TAG, post_tag, author_tag
+from platform_app.core.signals import post_changed
+from platform_app.core.conditional import (
+    Validator, conditional_get, listing_validator, author_generation_column, generation_time,
+)
+from platform_app.core.routing import replica_router
+from platform_app.core.trending import trending, current_hour, TRENDING_TAG
+from platform_app.core.view_counter import view_counter
+from platform_app.ai.jobs import enqueue_summary, summary_worker
 
 posts_bp = Blueprint("posts", __name__)
 
 
 @posts_bp.route("/")
+@replica_router.replica_reads
+@conditional_get.conditional(
+    lambda: None if request.args.get("q", "").strip() else listing_validator()
+)
+@page_cache.cached(tags=[LISTING_TAG], unless=lambda: bool(request.args.get("q", "").strip()))
 def list_posts():
     """Список всіх опублікованих постів з пагінацією"""
-    page = request.args.get("page", 1, type=int)
     search_query = request.args.get("q", "").strip()
     
-    query = BlogPost.query.filter_by(is_published=True)
-    
     if search_query:
-        query = query.filter(
-            or_(
-                BlogPost.title.ilike(f"%{search_query}%"),
-                BlogPost.content.ilike(f"%{search_query}%")
-            )
-        )
-    
-    posts = query.order_by(BlogPost.published_at.desc()).paginate(
-        page=page,
+        # Пошук по індексу з ранжуванням за релевантністю
+        page = request.args.get("page", 1, type=int)
+        posts = search.search_posts(search_query, page=page, per_page=AppConfig.POSTS_PER_PAGE)
+        return render_template("posts/list.html", posts=posts, search_query=search_query)
+    
+    # Курсорна пагінація: вартість сторінки не залежить від її номера
+    posts = paginate_keyset(
+        card_select().where(*post_criteria(is_published=True)),
+        cursor=request.args.get("cursor"),
         per_page=AppConfig.POSTS_PER_PAGE,
-        error_out=False
+        count_key="published",
+        count_stmt=count_select(is_published=True),
+        page=request.args.get("page", type=int),
     )
+    page_cache.tag(*(author_tag(post.author_id) for post in posts))
     
     return render_template("posts/list.html", posts=posts, search_query=search_query)
 
 
+@posts_bp.route("/tag/<path:tag>")  # назва тегу може містити "/"
+@replica_router.replica_reads
+@conditional_get.conditional(listing_validator)
+@page_cache.cached(tags=[LISTING_TAG])
+def list_by_tag(tag: str):
+    """Пости з тегом (вибірка по індексу post_tags)"""
+    tag_item = tag_index.get_tag(tag)
+    if tag_item is None:
+        abort(404)
+    
+    criteria = tag_index.post_criteria_for_tag(tag_item.id)
+    posts = paginate_keyset(
+        card_select().where(*criteria),
+        cursor=request.args.get("cursor"),
+        per_page=AppConfig.POSTS_PER_PAGE,
+        count_key=f"tag:{tag_item.id}",
+        count_stmt=db.select(func.count(BlogPost.id)).where(*criteria),
+        page=request.args.get("page", type=int),
+    )
+    page_cache.tag(*(author_tag(post.author_id) for post in posts))
+    
+    return render_template("posts/tag.html", tag=tag_item, posts=posts)
+
+
+@posts_bp.route("/tags")
+@replica_router.replica_reads
+@conditional_get.conditional(listing_validator)
+@page_cache.cached(tags=[LISTING_TAG])
+def tag_cloud():
+    """Хмара тегів"""
+    cloud = tag_index.tag_cloud(limit=100)
+    max_count = max((count for _, count in cloud), default=1)
+    return render_template("posts/tags.html", cloud=cloud, max_count=max_count)
+
+
+def _trending_validator():
+    """
+    Валідатор популярного: id top-K, max(updated_at) їх рядків trending_posts,
+    покоління gen:listing та поточна година (показана оцінка згасає з часом)
+    """
+    ids = [post_id for post_id, _ in trending.top(AppConfig.TRENDING_LIMIT)]
+    updated_at = None
+    if ids:
+        updated_at = db.session.execute(
+            db.select(func.max(TrendingPost.updated_at)).where(TrendingPost.post_id.in_(ids))
+        ).scalar()
+    updated_at = updated_at.replace(tzinfo=timezone.utc) if updated_at else None
+    listing = listing_validator()
+    hour = current_hour()
+    changed = [listing.last_modified, updated_at, datetime.fromtimestamp(hour * 3600, tz=timezone.utc)]
+    return Validator(
+        state=f"T{listing.state}:{hour}:{','.join(map(str, ids))}:"
+              f"{updated_at.timestamp() if updated_at else 0}",
+        last_modified=max(value for value in changed if value),
+    )
+
+
+@posts_bp.route("/trending")
+@replica_router.replica_reads
+@conditional_get.conditional(_trending_validator)
+@page_cache.cached(tags=[LISTING_TAG, TRENDING_TAG])
+def trending_posts():
+    """Популярне зараз: пости з найвищою згаслою оцінкою переглядів (top-K з пам'яті)"""
+    entries = trending.cards(AppConfig.TRENDING_LIMIT)
+    page_cache.tag(*(author_tag(post.author_id) for post, _ in entries))
+    return render_template("posts/trending.html", entries=entries)
+
+
+def _record_cached_view(meta: dict) -> None:
+    """Зараховує перегляд сторінки, відданої з кешу"""
+    if meta.get("post_id"):
+        view_counter.record(meta["post_id"])
+
+
+def _post_validator(slug: str):
+    """Валідатор сторінки поста: updated_at поста, покоління автора та час списку схожих (один запит)"""
+    related_at = (
+        db.select(func.max(RelatedPost.computed_at))
+        .where(RelatedPost.post_id == BlogPost.id)
+        .scalar_subquery()
+    )
+    row = db.session.execute(
+        db.select(BlogPost.id, BlogPost.updated_at, PlatformCounter.value, related_at.label("related_at"))
+        .outerjoin(PlatformCounter, PlatformCounter.name == author_generation_column(BlogPost.author_id))
+        .where(BlogPost.slug == slug, BlogPost.is_published == True)
+    ).first()
+    if row is None:
+        return None
+    updated_at = row.updated_at.replace(tzinfo=timezone.utc)
+    author_changed = generation_time(row.value)
+    related_at = row.related_at.replace(tzinfo=timezone.utc) if row.related_at else None
+    return Validator(
+        state=f"P{row.id}:{updated_at.timestamp()}:{row.value or 0}:"
+              f"{related_at.timestamp() if related_at else 0}",
+        last_modified=max(filter(None, (updated_at, author_changed, related_at))),
+        meta={"post_id": row.id},
+    )
+
+
 @posts_bp.route("/<slug>")
+@replica_router.replica_reads
+@conditional_get.conditional(_post_validator, on_not_modified=_record_cached_view)
+@page_cache.cached(tags=lambda slug: [post_tag(slug)], on_hit=_record_cached_view)
 def view_post(slug: str):
     """Перегляд окремого поста"""
     post = BlogPost.query.filter_by(slug=slug, is_published=True).first_or_404()
     
     # Збільшуємо лічильник переглядів
     post.increment_views()
+    related = related_index.related_cards(post.id, AppConfig.RELATED_POSTS_LIMIT)
+    page_cache.tag(author_tag(post.author_id), RELATED_TAG)
+    page_cache.set_meta(post_id=post.id)
     
-    return render_template("posts/view.html", post=post)
+    return render_template("posts/view.html", post=post, related=related)
 
 
 @posts_bp.route("/create", methods=["GET"])
@@ -75,18 +201,8 @@ def process_create():
         flash("Текст поста має бути мінімум 100 символів", "error")
         return redirect(url_for("posts.show_create"))
     
-    # Генерація резюме за допомогою ШІ, якщо не вказано вручну
-    ai_summary = None
-    ai_generated = False
-    if use_ai and not summary and len(content) > 200:
-        try:
-            from platform_app.ai.summarizer import summarize_text
-            ai_summary = summarize_text(content, max_length=200, min_length=50)
-            if ai_summary:
-                summary = ai_summary
-                ai_generated = True
-        except Exception as e:
-            print(f"AI summarization error: {e}")
+    # Генерація резюме за допомогою ШІ виконується у фоні, якщо не вказано вручну
+    queue_ai = use_ai and not summary and len(content) > 200
     
     slug = BlogPost.generate_slug(title)
     
@@ -102,15 +218,25 @@ def process_create():
         summary=summary,
         tags=tags,
         author_id=current_user.id,
-        ai_summary=ai_summary,
-        ai_generated=ai_generated
     )
     
     db.session.add(new_post)
+    if queue_ai:
+        enqueue_summary(new_post, max_length=200, min_length=50)
+    search.index_post(new_post)
+    tag_index.set_post_tags(new_post, tags)
+    rollups.post_created(new_post)
     db.session.commit()
+    if queue_ai:
+        summary_worker.notify()
+    invalidate_counts()
+    post_changed.send(
+        current_app._get_current_object(),
+        post_id=new_post.id, slug=new_post.slug, author_id=new_post.author_id, action="created",
+    )
     
-    if ai_generated:
-        flash("Пост успішно створено! Резюме згенеровано за допомогою ШІ.", "success")
+    if queue_ai:
+        flash("Пост успішно створено! Резюме генерується за допомогою ШІ.", "success")
     else:
         flash("Пост успішно створено!", "success")
     
@@ -151,6 +277,8 @@ def process_edit(slug: str):
         flash("Текст поста має бути мінімум 100 символів", "error")
         return redirect(url_for("posts.show_edit", slug=slug))
     
+    old_slug = post.slug
+    
     # Оновлюємо slug якщо заголовок змінився
     new_slug = BlogPost.generate_slug(title)
     if new_slug != post.slug:
@@ -164,7 +292,15 @@ def process_edit(slug: str):
     post.summary = summary
     post.tags = tags
     
+    search.index_post(post)
+    tag_index.set_post_tags(post, tags)
     db.session.commit()
+    invalidate_counts()
+    post_changed.send(
+        current_app._get_current_object(),
+        post_id=post.id, slug=post.slug, author_id=post.author_id, action="updated",
+        old_slug=old_slug,
+    )
     
     flash("Пост успішно оновлено!", "success")
     return redirect(url_for("posts.view_post", slug=post.slug))
@@ -179,8 +315,21 @@ def process_delete(slug: str):
     if post.author_id != current_user.id:
         abort(403)
     
+    post_id, post_slug, author_id = post.id, post.slug, post.author_id
+    search.remove_post(post.id)
+    tag_index.remove_post_tags(post.id)
+    # Похідні таблиці чистимо в тій самій транзакції: SQLite не виконує ON DELETE CASCADE
+    related_changed = related_index.remove_post(post.id)
+    trending.post_deleted(post.id)
+    rollups.post_deleted(post)
     db.session.delete(post)
     db.session.commit()
+    invalidate_counts()
+    post_changed.send(
+        current_app._get_current_object(),
+        post_id=post_id, slug=post_slug, author_id=author_id, action="deleted",
+        related_changed=related_changed,
+    )
     
     flash("Пост успішно видалено", "success")
     return redirect(url_for("main.home"))
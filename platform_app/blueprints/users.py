@@ -1,30 +1,54 @@
 """
 Blueprint для роботи з профілями користувачів
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
 from flask_login import login_required, current_user
 
 from platform_app.models.user import UserAccount
-from platform_app.models.post import BlogPost
 from platform_app.core.database import db
+from platform_app.core.config import AppConfig
+from platform_app.core import rollups
+from platform_app.core.listings import card_select, post_criteria, count_select
+from platform_app.core.pagination import paginate_keyset
+from platform_app.core.signals import user_changed
+from platform_app.core.conditional import (
+    Validator, conditional_get, author_generation_column, generation_time,
+)
+from platform_app.core.routing import replica_router
+from platform_app.models.rollups import PlatformCounter
 
 users_bp = Blueprint("users", __name__)
 
 
+def _profile_validator(username: str):
+    """Валідатор профілю: покоління автора (один запит)"""
+    row = db.session.execute(
+        db.select(UserAccount.id, PlatformCounter.value)
+        .outerjoin(PlatformCounter, PlatformCounter.name == author_generation_column(UserAccount.id))
+        .where(UserAccount.username == username)
+    ).first()
+    if row is None:
+        return None
+    return Validator(state=f"U{row.id}:{row.value or 0}", last_modified=generation_time(row.value))
+
+
 @users_bp.route("/<username>")
+@replica_router.replica_reads
+@conditional_get.conditional(_profile_validator)
 def view_profile(username: str):
     """Перегляд профілю користувача"""
     user = UserAccount.query.filter_by(username=username).first_or_404()
     
-    posts = (
-        BlogPost.query
-        .filter_by(author_id=user.id, is_published=True)
-        .order_by(BlogPost.published_at.desc())
-        .limit(20)
-        .all()
+    posts = paginate_keyset(
+        card_select().where(*post_criteria(author_id=user.id, is_published=True)),
+        cursor=request.args.get("cursor"),
+        per_page=AppConfig.POSTS_PER_PAGE,
+        count_key=f"author:{user.id}:published",
+        count_stmt=count_select(author_id=user.id, is_published=True),
+        page=request.args.get("page", type=int),
     )
     
-    total_views = sum(post.view_count for post in posts)
+    _, total_views = rollups.author_totals(user.id)
     
     return render_template("users/profile.html", user=user, posts=posts, total_views=total_views)
 
@@ -33,7 +57,7 @@ def view_profile(username: str):
 @login_required
 def show_my_profile():
     """Мій профіль (редагування)"""
-    return render_template("users/edit_profile.html", user=current_user)
+    return render_template("users/edit_profile.html", user=current_user.load_account())
 
 
 @users_bp.route("/me", methods=["POST"])
@@ -47,24 +71,30 @@ def update_my_profile():
         flash("Ім'я занадто довге (максимум 150 символів)", "error")
         return redirect(url_for("users.show_my_profile"))
     
-    current_user.full_name = full_name
-    current_user.about = about
+    account = current_user.load_account()
+    account.full_name = full_name
+    account.about = about
     
     db.session.commit()
+    user_changed.send(
+        current_app._get_current_object(), user_id=account.id, username=account.username
+    )
     
     flash("Профіль оновлено", "success")
-    return redirect(url_for("users.view_profile", username=current_user.username))
+    return redirect(url_for("users.view_profile", username=account.username))
 
 
 @users_bp.route("/me/posts")
 @login_required
 def my_posts():
     """Список моїх постів"""
-    posts = (
-        BlogPost.query
-        .filter_by(author_id=current_user.id)
-        .order_by(BlogPost.published_at.desc())
-        .all()
+    posts = paginate_keyset(
+        card_select().where(*post_criteria(author_id=current_user.id)),
+        cursor=request.args.get("cursor"),
+        per_page=AppConfig.POSTS_PER_PAGE,
+        count_key=f"author:{current_user.id}:all",
+        count_stmt=count_select(author_id=current_user.id),
+        page=request.args.get("page", type=int),
     )
     
     return render_template("users/my_posts.html", posts=posts)
@@ -0,0 +1,366 @@
+"""
+CLI команди застосунку (flask --app run <команда>)
+"""
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+search_cli = AppGroup("search", help="Повнотекстовий пошуковий індекс")
+
+
+@search_cli.command("rebuild")
+@click.option("--batch-size", default=500, show_default=True, help="Розмір пакета")
+def search_rebuild(batch_size: int) -> None:
+    """Перебудовує пошуковий індекс для всіх постів"""
+    from platform_app.core.search import rebuild_search_index
+
+    total = rebuild_search_index(batch_size=batch_size)
+    click.echo(f"✓ Проіндексовано постів: {total}")
+
+
+@search_cli.command("tags")
+@click.option("--batch-size", default=500, show_default=True, help="Розмір пакета")
+def search_tags(batch_size: int) -> None:
+    """Перебудовує індекс тегів з колонки blog_posts.tags"""
+    from platform_app.core.tags import backfill_tags
+
+    total = backfill_tags(batch_size=batch_size)
+    click.echo(f"✓ Теги оновлено для постів: {total}")
+
+
+summaries_cli = AppGroup("summaries", help="Фонова генерація ШІ-резюме")
+
+
+@summaries_cli.command("worker")
+@click.option("--threads", default=2, show_default=True, help="Кількість потоків-виконавців")
+def summaries_worker(threads: int) -> None:
+    """Запускає виконавців черги резюме окремим процесом"""
+    import time
+    from platform_app.ai.jobs import summary_worker
+
+    summary_worker.start(threads)
+    click.echo(f"✓ Виконавці черги резюме запущені ({threads} потоків). Ctrl+C - зупинка.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        summary_worker.stop()
+
+
+@summaries_cli.command("run-once")
+@click.option("--limit", default=50, show_default=True, help="Максимум завдань")
+def summaries_run_once(limit: int) -> None:
+    """Виконує готові завдання черги резюме і завершується"""
+    from platform_app.ai.jobs import summary_worker
+
+    processed = summary_worker.run_pending(limit=limit)
+    click.echo(f"✓ Оброблено завдань: {processed}")
+
+
+@summaries_cli.command("breaker")
+@click.option("--reset", is_flag=True, help="Примусово закрити запобіжник")
+def summaries_breaker(reset: bool) -> None:
+    """Стан запобіжника звернень до API резюме"""
+    from platform_app.ai.summarizer import get_summarizer
+
+    breaker = get_summarizer().breaker
+    if reset:
+        breaker.reset()
+        click.echo("✓ Запобіжник закрито")
+        return
+    state = breaker.state()
+    click.echo(f"Стан: {state['state']}, збоїв поспіль: {state['failures']}")
+    if state["state"] != "closed":
+        click.echo(f"  причина: {state['reason']}, наступна спроба через {state['retry_after']:.0f} с")
+
+
+@summaries_cli.command("backfill")
+@click.option("--chunk-size", default=200, show_default=True, help="Постів за одне читання/commit")
+@click.option("--batch-size", default=8, show_default=True, help="Текстів в одному HTTP-запиті")
+@click.option("--concurrency", default=4, show_default=True, help="Одночасних HTTP-запитів")
+@click.option("--limit", type=int, default=None, help="Максимум постів за запуск")
+@click.option("--restart", is_flag=True, help="Почати спочатку, ігноруючи збережений прогрес")
+def summaries_backfill(chunk_size: int, batch_size: int, concurrency: int,
+                       limit: int, restart: bool) -> None:
+    """Генерує ai_summary для постів, у яких його ще немає"""
+    from platform_app.ai.backfill import run_backfill
+
+    def report(stats) -> None:
+        click.echo(
+            f"  id ≤ {stats.last_id}: оброблено {stats.processed}, "
+            f"резюме {stats.summarized}, помилок {stats.failed} "
+            f"({stats.rate:.1f} постів/с)"
+        )
+
+    stats = run_backfill(
+        chunk_size=chunk_size,
+        batch_size=batch_size,
+        concurrency=concurrency,
+        limit=limit,
+        resume=not restart,
+        report=report,
+    )
+    if stats.stopped:
+        click.echo(f"! Зупинено: {stats.stopped}", err=True)
+    if stats.first_failed_id is not None:
+        click.echo(
+            f"! Помилки починаючи з id {stats.first_failed_id}: прогрес збережено до id "
+            f"{stats.last_id}, повторний запуск обробить пости без резюме", err=True,
+        )
+    click.echo(
+        f"✓ Готово: {stats.summarized} з {stats.processed} постів "
+        f"за {stats.elapsed:.1f} с ({stats.rate:.1f} постів/с)"
+    )
+
+
+rollups_cli = AppGroup("rollups", help="Зведені лічильники глобальної статистики")
+
+
+@rollups_cli.command("rebuild")
+def rollups_rebuild() -> None:
+    """Перераховує зведені лічильники з базових таблиць"""
+    from platform_app.core.rollups import rebuild_rollups
+
+    totals = rebuild_rollups()
+    click.echo(
+        f"✓ Користувачів: {totals['users']}, постів: {totals['posts']}, "
+        f"переглядів: {totals['views']}, постів з ШІ: {totals['ai_posts']}"
+    )
+
+
+related_cli = AppGroup("related", help="Схожі пости")
+
+
+@related_cli.command("rebuild")
+@click.option("--neighbors", default=10, show_default=True, help="Сусідів на пост")
+@click.option("--batch-size", default=2000, show_default=True, help="Постів за одне читання/commit")
+@click.option("--workers", type=int, default=None, help="Процесів токенізації (за замовчуванням - CPU)")
+def related_rebuild(neighbors: int, batch_size: int, workers: int) -> None:
+    """Перебудовує вектори постів та списки схожих постів"""
+    from platform_app.core.related import rebuild_related
+
+    timings = rebuild_related(
+        neighbors=neighbors, batch_size=batch_size, workers=workers, report=click.echo
+    )
+    click.echo(
+        f"✓ Готово за {sum(timings.values()):.1f} с: "
+        + ", ".join(f"{name} {seconds:.1f} с" for name, seconds in timings.items())
+    )
+
+
+trending_cli = AppGroup("trending", help="Популярне зараз")
+
+
+@trending_cli.command("rebuild")
+def trending_rebuild() -> None:
+    """Перераховує top-K популярних зараз постів з погодинних кошиків"""
+    from platform_app.core.trending import trending
+
+    scored = trending.rebuild()
+    click.echo(f"✓ Оцінено постів: {scored}, у рейтингу: {min(scored, trending.capacity)}")
+
+
+@trending_cli.command("show")
+@click.option("--limit", default=20, show_default=True)
+def trending_show(limit: int) -> None:
+    """Показує поточний рейтинг"""
+    from platform_app.core.trending import trending
+
+    for position, (post, heat) in enumerate(trending.cards(limit), 1):
+        click.echo(f"{position:3}. {heat:8.1f}  {post.slug}")
+
+
+feeds_cli = AppGroup("feeds", help="Стрічки RSS/Atom та карта сайту")
+
+
+@feeds_cli.command("build")
+def feeds_build() -> None:
+    """Будує загальні стрічки та карту сайту заздалегідь (адреси - з SITE_URL)"""
+    from flask import current_app
+    from platform_app.core.feeds import feeds
+
+    if not feeds.site_url:
+        click.echo("⚠ SITE_URL не задано - адреса сайту підставлятиметься з кожного запиту (без .gz)")
+    with current_app.test_request_context(base_url=feeds.site_url or "http://localhost/"):
+        built = feeds.build_all()
+    click.echo(f"✓ Стрічок: {built['feeds']}, частин карти сайту: {built['sitemap_chunks']}")
+
+
+@feeds_cli.command("clear")
+def feeds_clear() -> None:
+    """Видаляє готові стрічки та карту сайту"""
+    from platform_app.core.feeds import feeds
+
+    click.echo(f"✓ Видалено файлів: {feeds.clear()}")
+
+
+assets_cli = AppGroup("assets", help="Статичні ресурси")
+
+
+@assets_cli.command("build")
+def assets_build() -> None:
+    """Збирає ресурси з відбитками вмісту та стиснені варіанти"""
+    from flask import current_app
+    from platform_app.core.assets import brotli, build_assets
+
+    manifest = build_assets(current_app.static_folder)
+    for name, hashed in manifest.items():
+        click.echo(f"  {name} → {hashed}")
+    click.echo(f"✓ Зібрано ресурсів: {len(manifest)}" + ("" if brotli else " (без brotli)"))
+
+
+replicas_cli = AppGroup("replicas", help="Репліки БД для читання")
+
+
+@replicas_cli.command("status")
+def replicas_status() -> None:
+    """Перевіряє доступність і відставання реплік"""
+    from platform_app.core.routing import replica_router
+
+    if not replica_router.bind_keys:
+        click.echo("Репліки не налаштовані (SQLALCHEMY_REPLICA_URLS)")
+        return
+    for key in replica_router.bind_keys:
+        result = replica_router.probe(key)
+        if not result["ok"]:
+            click.echo(f"✗ {key}: {result['error']}")
+            continue
+        lag = f", відставання {result['lag_seconds']:.1f} с" if result["lag_seconds"] is not None else ""
+        click.echo(f"✓ {key}: {result['latency_ms']:.1f} мс{lag}")
+
+
+@replicas_cli.command("sync")
+def replicas_sync() -> None:
+    """Копіює основну SQLite-БД у файли реплік (для локальної перевірки)"""
+    import sqlite3
+    from platform_app.core.database import db
+    from platform_app.core.routing import replica_router
+
+    engines = db.engines
+    if db.engine.dialect.name != "sqlite":
+        raise click.ClickException("sync підтримується лише для SQLite; PostgreSQL реплікує сервер")
+    source = sqlite3.connect(db.engine.url.database)
+    try:
+        for key in replica_router.bind_keys:
+            engines[key].dispose()
+            target = sqlite3.connect(engines[key].url.database)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+            click.echo(f"✓ {key}: {engines[key].url.database}")
+    finally:
+        source.close()
+
+
+data_cli = AppGroup("data", help="Потоковий імпорт та експорт користувачів і постів")
+
+ENTITIES = click.Choice(["users", "posts"])
+FORMATS = click.Choice(["jsonl", "csv"])
+
+
+def _open_stream(path: str, mode: str):
+    """Файл або stdin/stdout для '-'"""
+    if path == "-":
+        return click.get_text_stream("stdin" if mode == "r" else "stdout", encoding="utf-8")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+@data_cli.command("export")
+@click.argument("entity", type=ENTITIES)
+@click.argument("path", default="-")
+@click.option("--format", "fmt", type=FORMATS, default=None, help="За замовчуванням - за розширенням")
+@click.option("--batch-size", default=1000, show_default=True, help="Рядків за одне читання з БД")
+def data_export(entity: str, path: str, fmt: str, batch_size: int) -> None:
+    """Експортує users або posts у JSONL/CSV (PATH '-' - stdout)"""
+    from platform_app.core import transfer
+
+    export = transfer.export_users if entity == "users" else transfer.export_posts
+    with _open_stream(path, "w") as stream:
+        total = export(stream, transfer.detect_format(path, fmt), batch_size=batch_size)
+    click.echo(f"✓ Експортовано записів: {total}", err=path == "-")
+
+
+@data_cli.command("import")
+@click.argument("entity", type=ENTITIES)
+@click.argument("path")
+@click.option("--format", "fmt", type=FORMATS, default=None, help="За замовчуванням - за розширенням")
+@click.option("--batch-size", default=5000, show_default=True, help="Рядків в одній транзакції")
+@click.option("--defer-indexes", is_flag=True, help="Будувати вторинні індекси постів після завантаження")
+@click.option("--no-copy", is_flag=True, help="Не використовувати COPY на PostgreSQL")
+@click.option(
+    "--on-conflict", type=click.Choice(["skip", "rename"]), default="skip", show_default=True,
+    help="Пост зі slug, що вже є в БД: пропустити або додати зі slug base-2",
+)
+def data_import(entity: str, path: str, fmt: str, batch_size: int,
+                defer_indexes: bool, no_copy: bool, on_conflict: str) -> None:
+    """Імпортує users або posts з JSONL/CSV (PATH '-' - stdin)"""
+    from platform_app.core import transfer
+
+    def report(stats) -> None:
+        click.echo(
+            f"  прочитано {stats.read}, додано {stats.inserted}, пропущено {stats.skipped} "
+            f"({stats.rate:.0f} записів/с)"
+        )
+
+    fmt = transfer.detect_format(path, fmt)
+    with _open_stream(path, "r") as stream:
+        if entity == "users":
+            stats = transfer.import_users(stream, fmt, batch_size=batch_size, report=report)
+        else:
+            stats = transfer.import_posts(
+                stream, fmt, batch_size=batch_size, defer_indexes=defer_indexes,
+                use_copy=False if no_copy else None, on_conflict=on_conflict, report=report,
+            )
+    click.echo(
+        f"✓ Додано: {stats.inserted}, пропущено: {stats.skipped} "
+        f"за {stats.elapsed:.1f} с ({stats.rate:.0f} записів/с)"
+    )
+
+
+users_cli = AppGroup("users", help="Керування акаунтами")
+
+
+def _set_user_active(username: str, active: bool) -> None:
+    from flask import current_app
+    from platform_app.core.database import db
+    from platform_app.core.signals import user_changed
+    from platform_app.models.user import UserAccount
+
+    user = UserAccount.query.filter_by(username=username).first()
+    if user is None:
+        raise click.ClickException(f"Користувача {username} не знайдено")
+    user.is_active = active
+    db.session.commit()
+    # Інвалідує кешований знімок - активні сесії користувача одразу побачать зміну
+    user_changed.send(current_app._get_current_object(), user_id=user.id, username=user.username)
+
+
+@users_cli.command("deactivate")
+@click.argument("username")
+def users_deactivate(username: str) -> None:
+    """Деактивує акаунт і завершує його сесії"""
+    _set_user_active(username, False)
+    click.echo(f"✓ Акаунт {username} деактивовано")
+
+
+@users_cli.command("activate")
+@click.argument("username")
+def users_activate(username: str) -> None:
+    """Знову активує акаунт"""
+    _set_user_active(username, True)
+    click.echo(f"✓ Акаунт {username} активовано")
+
+
+def register_commands(app: Flask) -> None:
+    """Реєструє CLI команди в застосунку"""
+    app.cli.add_command(search_cli)
+    app.cli.add_command(summaries_cli)
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(related_cli)
+    app.cli.add_command(trending_cli)
+    app.cli.add_command(feeds_cli)
+    app.cli.add_command(users_cli)
+    app.cli.add_command(assets_cli)
+    app.cli.add_command(data_cli)
+    app.cli.add_command(replicas_cli)
@@ -0,0 +1,207 @@
+"""
+Статичні ресурси з відбитком вмісту та стиснення відповідей.
+
+`flask assets build` (або старт застосунку, якщо збірка відсутня чи застаріла)
+копіює файли зі static/ у static/dist/ під іменами з хешем вмісту
+(main.3f2a9c1b7d0e.css), поруч кладе стиснені варіанти .gz та .br
+(brotli - якщо встановлено пакет brotli) і пише manifest.json.
+Шаблони отримують URL через asset_url('main.css'); такі файли віддаються
+з Cache-Control: immutable на рік, стиснений варіант - за Accept-Encoding.
+
+HTML-відповіді понад COMPRESS_MIN_SIZE байт стискаються gzip на льоту.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+from typing import Dict, Optional
+
+from flask import Flask, Response, abort, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # необов'язкова залежність
+    brotli = None
+
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# Файли, які не є ресурсами сайту
+SKIP_EXTENSIONS = {".py", ".pyc", ".gz", ".br"}
+
+# Типи, які має сенс стискати
+COMPRESSIBLE_TYPES = {
+    "text/html", "text/css", "text/plain", "text/xml", "application/javascript",
+    "text/javascript", "application/json", "application/xml", "application/rss+xml",
+    "application/atom+xml", "image/svg+xml",
+}
+
+# Рік у секундах
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _source_files(static_folder: str):
+    """Відносні шляхи ресурсів у static/ (без каталогу збірки)"""
+    for root, dirs, files in os.walk(static_folder):
+        dirs[:] = [d for d in dirs if d != DIST_DIR and not d.startswith((".", "__"))]
+        for name in files:
+            if os.path.splitext(name)[1] in SKIP_EXTENSIONS or name.startswith("."):
+                continue
+            path = os.path.join(root, name)
+            yield os.path.relpath(path, static_folder).replace(os.sep, "/")
+
+
+def build_assets(static_folder: str, min_size: int = 256) -> Dict[str, str]:
+    """Збирає ресурси з відбитками та стисненими варіантами. Повертає маніфест."""
+    dist = os.path.join(static_folder, DIST_DIR)
+    manifest: Dict[str, str] = {}
+
+    for name in sorted(_source_files(static_folder)):
+        with open(os.path.join(static_folder, name), "rb") as f:
+            data = f.read()
+
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        stem, ext = os.path.splitext(name)
+        hashed = f"{stem}.{digest}{ext}"
+        target = os.path.join(dist, hashed)
+        manifest[name] = hashed
+        if os.path.exists(target):
+            continue
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        _write_atomic(target, data)
+
+        mimetype = mimetypes.guess_type(name)[0] or ""
+        if mimetype in COMPRESSIBLE_TYPES and len(data) >= min_size:
+            _write_atomic(f"{target}.gz", gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                _write_atomic(f"{target}.br", brotli.compress(data, quality=11))
+
+    os.makedirs(dist, exist_ok=True)
+    _write_atomic(
+        os.path.join(dist, MANIFEST_NAME),
+        json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"),
+    )
+    return manifest
+
+
+def _manifest_is_stale(static_folder: str) -> bool:
+    """Маніфест відсутній або старіший за будь-який вихідний файл"""
+    path = os.path.join(static_folder, DIST_DIR, MANIFEST_NAME)
+    try:
+        built_at = os.path.getmtime(path)
+    except OSError:
+        return True
+    return any(
+        os.path.getmtime(os.path.join(static_folder, name)) > built_at
+        for name in _source_files(static_folder)
+    )
+
+
+class AssetPipeline:
+    """Маніфест ресурсів, helper asset_url та маршрут для файлів з відбитками"""
+
+    def __init__(self) -> None:
+        self.static_folder: Optional[str] = None
+        self.manifest: Dict[str, str] = {}
+        self.compress_min_size = 1024
+        self.compress_level = 6
+
+    def init_app(self, app: Flask) -> None:
+        self.static_folder = app.static_folder
+        self.compress_min_size = app.config.get("COMPRESS_MIN_SIZE", self.compress_min_size)
+        self.compress_level = app.config.get("COMPRESS_LEVEL", self.compress_level)
+
+        if app.config.get("ASSETS_BUILD_ON_START", True) and _manifest_is_stale(self.static_folder):
+            try:
+                build_assets(self.static_folder)
+            except OSError as e:
+                # Каталог static/ може бути лише для читання - тоді URL без відбитків
+                print(f"Asset build error: {e}")
+        self.manifest = self._load_manifest()
+
+        app.add_url_rule(
+            f"{app.static_url_path}/{DIST_DIR}/<path:filename>",
+            endpoint="assets",
+            view_func=self.serve,
+        )
+        app.jinja_env.globals["asset_url"] = self.asset_url
+
+        if self.compress_min_size > 0:
+            app.after_request(self.compress_response)
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(os.path.join(self.static_folder, DIST_DIR, MANIFEST_NAME), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def asset_url(self, filename: str) -> str:
+        """URL ресурсу з відбитком (або звичайний static, якщо збірки немає)"""
+        hashed = self.manifest.get(filename)
+        if hashed is None:
+            return url_for("static", filename=filename)
+        return url_for("assets", filename=hashed)
+
+    def serve(self, filename: str) -> Response:
+        """Віддає ресурс з відбитком, за можливості - попередньо стиснений"""
+        dist = os.path.join(self.static_folder, DIST_DIR)
+        if filename == MANIFEST_NAME or os.path.splitext(filename)[1] in SKIP_EXTENSIONS:
+            abort(404)
+
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        encoding = None
+        for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if candidate in request.accept_encodings and os.path.isfile(os.path.join(dist, filename + suffix)):
+                encoding = candidate
+                filename = filename + suffix
+                break
+
+        response = send_from_directory(dist, filename, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        response.vary.add("Accept-Encoding")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        return response
+
+    def compress_response(self, response: Response) -> Response:
+        """Стискає динамічні текстові відповіді gzip"""
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        if "gzip" not in request.accept_encodings:
+            return response
+
+        data = response.get_data()
+        if len(data) < self.compress_min_size:
+            return response
+
+        response.set_data(gzip.compress(data, compresslevel=self.compress_level, mtime=0))
+        response.headers["Content-Encoding"] = "gzip"
+        return response
+
+
+# Глобальний конвеєр ресурсів
+assets = AssetPipeline()
+
+
+def init_assets(app: Flask) -> None:
+    """Підключає ресурси з відбитками та стиснення відповідей"""
+    assets.init_app(app)
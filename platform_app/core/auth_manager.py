@@ -4,6 +4,8 @@
 from flask import Flask
 from flask_login import LoginManager
 
+from platform_app.core.identity import identity_cache
+
 login_manager = LoginManager()
 
 
@@ -14,14 +16,18 @@ def init_auth(app: Flask) -> None:
     login_manager.login_message = "Будь ласка, увійдіть для доступу до цієї сторінки."
     login_manager.login_message_category = "info"
     
-    # Завантажувач користувача
+    identity_cache.init_app(app)
+    
+    # Завантажувач користувача: кешований знімок замість ORM-об'єкта
     @login_manager.user_loader
     def load_user(user_id: str):
-        from platform_app.models.user import UserAccount
-        from platform_app.core.database import db
         try:
-            return db.session.get(UserAccount, int(user_id))
+            identity = identity_cache.get(int(user_id))
         except (ValueError, TypeError):
             return None
+        # Деактивований акаунт завершує всі сесії
+        if identity is None or not identity.is_active:
+            return None
+        return identity
 
 
@@ -0,0 +1,232 @@
+"""
+Сховища кешу з підтримкою тегів-версій.
+
+MemoryCache - LRU у пам'яті процесу з обмеженням кількості записів та байтів.
+SqliteCache - локальний файл SQLite, спільний для всіх воркерів gunicorn.
+
+Інвалідація через теги: запис зберігає версії своїх тегів на момент
+збереження, а bump_tags() збільшує версію тегу - всі залежні записи стають
+неактуальними без перебору ключів.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+
+class CacheStats:
+    """Лічильники влучань/промахів кешу"""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class MemoryCache:
+    """LRU кеш у пам'яті процесу (окремий для кожного воркера)"""
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tags: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, size = entry
+            if expires_at < time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float, size: int = 0) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.time() + ttl, size)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Зберігає значення, лише якщо ключа немає (або він прострочений)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] >= time.time():
+                    return False
+                self._remove(key)
+            self._entries[key] = (value, time.time() + ttl, 0)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        return {tag: self._tags.get(tag, 0) for tag in tags}
+
+    def bump_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._tags[tag] = self._tags.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+
+class SqliteCache:
+    """Кеш у локальному файлі SQLite, спільний для процесів на одній машині"""
+
+    def __init__(self, path: str, max_entries: int = 10000, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_stored ON cache_entries (stored_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_tags (
+                    tag TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        """З'єднання на потік (і на процес - після fork створюється нове)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] < time.time():
+            self.delete(key)
+            return None
+        return pickle.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float, size: int = 0) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, size, expires_at, stored_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, blob, len(blob), now + ttl, now),
+        )
+        self._evict(conn)
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Атомарно зберігає значення, лише якщо ключа немає (або він прострочений)"""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        cursor = self._connect().execute(
+            "INSERT INTO cache_entries (key, value, size, expires_at, stored_at) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+            "expires_at = excluded.expires_at, stored_at = excluded.stored_at "
+            "WHERE cache_entries.expires_at < ?",
+            (key, blob, len(blob), now + ttl, now, now),
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        tags = list(tags)
+        versions = dict.fromkeys(tags, 0)
+        if tags:
+            placeholders = ",".join("?" * len(tags))
+            versions.update(self._connect().execute(
+                f"SELECT tag, version FROM cache_tags WHERE tag IN ({placeholders})", tags
+            ).fetchall())
+        return versions
+
+    def bump_tags(self, tags: Iterable[str]) -> None:
+        self._connect().executemany(
+            "INSERT INTO cache_tags (tag, version) VALUES (?, 1) "
+            "ON CONFLICT(tag) DO UPDATE SET version = version + 1",
+            [(tag,) for tag in tags],
+        )
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM cache_entries")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Видаляє прострочені та найстаріші записи понад ліміти"""
+        conn.execute("DELETE FROM cache_entries WHERE expires_at < ?", (time.time(),))
+        count, total = conn.execute(
+            "SELECT count(*), coalesce(sum(size), 0) FROM cache_entries"
+        ).fetchone()
+        excess = max(count - self.max_entries, 0)
+        if total > self.max_bytes:
+            excess = max(excess, count // 10 or 1)
+        if excess:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key IN "
+                "(SELECT key FROM cache_entries ORDER BY stored_at LIMIT ?)",
+                (excess,),
+            )
+            self.stats.evictions += excess
+
+
+def create_cache(backend: str, path: str, max_entries: int, max_bytes: int):
+    """Створює сховище за назвою: memory | sqlite | none"""
+    if backend == "memory":
+        return MemoryCache(max_entries=max_entries, max_bytes=max_bytes)
+    if backend == "sqlite":
+        return SqliteCache(path, max_entries=max_entries, max_bytes=max_bytes)
+    return None
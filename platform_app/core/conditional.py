@@ -0,0 +1,190 @@
+"""
+Умовні GET-запити (ETag / Last-Modified / 304) для анонімних сторінок.
+
+Валідатор сторінки обчислюється одним індексованим запитом без рендерингу:
+updated_at поста та лічильники поколінь у таблиці platform_counters
+(gen:listing - будь-яка зміна постів, gen:author:<id> - пости або профіль
+автора). Значення покоління - час останньої зміни в мілісекундах, тож воно
+ж дає Last-Modified. Покоління збільшуються сигналами з core/signals.py.
+"""
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Callable, Dict, NamedTuple, Optional
+
+from flask import Flask, Response, current_app, request, session
+from flask_login import current_user
+from sqlalchemy import String, case, cast, literal
+from sqlalchemy.exc import SQLAlchemyError
+
+from platform_app.core.database import db, dialect_insert
+from platform_app.core.signals import post_changed, user_changed
+from platform_app.models.rollups import PlatformCounter
+
+LISTING_GENERATION = "gen:listing"
+
+
+def author_generation(author_id: int) -> str:
+    return f"gen:author:{author_id}"
+
+
+def author_generation_column(author_id_column):
+    """SQL-вираз імені лічильника автора - для JOIN з platform_counters"""
+    return literal("gen:author:").concat(cast(author_id_column, String))
+
+
+def generation_time(value: Optional[int]) -> Optional[datetime]:
+    """Час зміни з значення покоління (мілісекунди)"""
+    if not value:
+        return None
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+
+
+class Validator(NamedTuple):
+    """Валідатор сторінки: стан для ETag, час зміни та дані для обробника 304"""
+
+    state: str
+    last_modified: Optional[datetime] = None
+    meta: Dict = {}
+
+
+def listing_validator(**kwargs) -> Validator:
+    """Валідатор списків постів: покоління gen:listing"""
+    value = ConditionalGet.generation(LISTING_GENERATION)
+    return Validator(state=f"L{value}", last_modified=generation_time(value))
+
+
+class ConditionalGet:
+    """Відповіді 304 без рендерингу та заголовки Cache-Control"""
+
+    def __init__(self) -> None:
+        self.max_age = 0
+        self.shared_max_age = 30
+
+    def init_app(self, app: Flask) -> None:
+        self.max_age = app.config.get("HTTP_CACHE_MAX_AGE", self.max_age)
+        self.shared_max_age = app.config.get("HTTP_CACHE_SHARED_MAX_AGE", self.shared_max_age)
+        post_changed.connect(self._on_post_changed, weak=False)
+        user_changed.connect(self._on_user_changed, weak=False)
+
+    # Покоління
+
+    @staticmethod
+    def bump(*names: str) -> None:
+        """Збільшує покоління (окрема коротка транзакція, викликається після commit)"""
+        now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+        table = PlatformCounter.__table__
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"value": case(
+                (stmt.excluded.value > table.c.value, stmt.excluded.value),
+                else_=table.c.value + 1,
+            )},
+        )
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(stmt, [{"name": name, "value": now_ms} for name in sorted(set(names))])
+        except SQLAlchemyError as e:
+            print(f"Generation bump error: {e}")
+
+    @staticmethod
+    def generation(name: str) -> int:
+        return db.session.execute(
+            db.select(PlatformCounter.value).where(PlatformCounter.name == name)
+        ).scalar() or 0
+
+    def _on_post_changed(self, sender, author_id=None, **extra) -> None:
+        self.bump(LISTING_GENERATION, author_generation(author_id))
+
+    def _on_user_changed(self, sender, user_id=None, **extra) -> None:
+        # Ім'я автора показується і в списках постів
+        self.bump(LISTING_GENERATION, author_generation(user_id))
+
+    # Декоратор
+
+    @staticmethod
+    def _conditional_allowed() -> bool:
+        return (
+            request.method in ("GET", "HEAD")
+            and not current_user.is_authenticated
+            and not session.get("_flashes")
+        )
+
+    @staticmethod
+    def _make_etag(state: str) -> str:
+        args = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+        raw = f"{request.endpoint}?{args}|{state}"
+        return hashlib.sha1(raw.encode()).hexdigest()[:20]
+
+    @staticmethod
+    def _not_modified(etag: str, last_modified: Optional[datetime]) -> bool:
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(etag)
+        since = request.if_modified_since
+        return bool(since and last_modified and last_modified.replace(microsecond=0) <= since)
+
+    def _cache_headers(self, response: Response, public: bool) -> None:
+        response.vary.add("Cookie")
+        if not public:
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return
+        response.cache_control.public = True
+        response.cache_control.max_age = self.max_age
+        if self.shared_max_age:
+            response.cache_control.s_maxage = self.shared_max_age
+        response.cache_control.must_revalidate = True
+
+    def conditional(self, validator: Callable[..., Optional[Validator]],
+                    on_not_modified: Optional[Callable[[Dict], None]] = None):
+        """
+        Декоратор view.
+
+        validator - функція від аргументів view, повертає Validator або None
+        (наприклад, якщо запис не знайдено - тоді view обробить запит як звичайно).
+        on_not_modified - викликається з Validator.meta при відповіді 304.
+        """
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self._conditional_allowed():
+                    response = current_app.make_response(view(*args, **kwargs))
+                    self._cache_headers(response, public=False)
+                    return response
+
+                # Валідатор обчислюється до рендерингу: якщо дані зміняться під час
+                # рендерингу, ETag буде старішим за вміст і наступний запит отримає 200
+                current = validator(**kwargs)
+                if current is None:
+                    return view(*args, **kwargs)
+
+                etag = self._make_etag(current.state)
+                if self._not_modified(etag, current.last_modified):
+                    if on_not_modified is not None:
+                        on_not_modified(current.meta)
+                    response = Response(status=304)
+                else:
+                    response = current_app.make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+
+                response.set_etag(etag, weak=True)
+                if current.last_modified:
+                    response.last_modified = current.last_modified
+                self._cache_headers(response, public="Set-Cookie" not in response.headers)
+                return response
+
+            return wrapper
+
+        return decorator
+
+
+# Глобальний обробник умовних запитів
+conditional_get = ConditionalGet()
+
+
+def init_conditional_get(app: Flask) -> None:
+    """Ініціалізує умовні GET-запити"""
+    conditional_get.init_app(app)
@@ -5,10 +5,8 @@ import os
 from typing import Optional
 
 
-def _get_database_url() -> str:
-    """Отримує URL бази даних з оточення та нормалізує його"""
-    db_url = os.getenv("DATABASE_URL", "sqlite:///blog_platform.db")
-    
+def normalize_database_url(db_url: str) -> str:
+    """Нормалізує URL бази даних (драйвер psycopg для PostgreSQL)"""
     # Нормалізація для PostgreSQL (Render використовує postgres://)
     if db_url.startswith("postgres://"):
         db_url = db_url.replace("postgres://", "postgresql+psycopg://", 1)
@@ -18,6 +16,18 @@ def _get_database_url() -> str:
     return db_url
 
 
+def _get_database_url() -> str:
+    """Отримує URL бази даних з оточення та нормалізує його"""
+    return normalize_database_url(os.getenv("DATABASE_URL", "sqlite:///blog_platform.db"))
+
+
+def _get_replica_binds() -> dict:
+    """Binds replica_0, replica_1... з SQLALCHEMY_REPLICA_URLS"""
+    from platform_app.core.routing import replica_binds
+    
+    return replica_binds(os.getenv("SQLALCHEMY_REPLICA_URLS"))
+
+
 class AppConfig:
     """Налаштування застосунку"""
     
@@ -29,11 +39,87 @@ class AppConfig:
     SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
     SQLALCHEMY_ECHO: bool = False
     
+    # Репліки для читання (URL через кому); записи та читання після запису - на основній БД
+    SQLALCHEMY_BINDS: dict = _get_replica_binds()
+    REPLICA_STICKY_SECONDS: float = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+    REPLICA_RETRY_INTERVAL: float = float(os.getenv("REPLICA_RETRY_INTERVAL", "30"))
+    
+    # Перевірка версії схеми при старті: warn | strict | off (міграції - `flask db upgrade`)
+    SCHEMA_CHECK: str = os.getenv("SCHEMA_CHECK", "warn")
+    
     # Flask налаштування
     TESTING: bool = False
     DEBUG: bool = os.getenv("FLASK_DEBUG", "False").lower() == "true"
     
     # Пагінація
     POSTS_PER_PAGE: int = 12
+    
+    # Схожі пости на сторінці поста (списки будує `flask related rebuild`)
+    RELATED_POSTS_LIMIT: int = int(os.getenv("RELATED_POSTS_LIMIT", "5"))
+    
+    # Лічильник переглядів (секунди між записами в БД; 0 - запис одразу)
+    VIEW_COUNTER_FLUSH_INTERVAL: float = float(os.getenv("VIEW_COUNTER_FLUSH_INTERVAL", "5"))
+    VIEW_COUNTER_FLUSH_THRESHOLD: int = int(os.getenv("VIEW_COUNTER_FLUSH_THRESHOLD", "500"))
+    
+    # Стрічки RSS/Atom та карта сайту (готові файли в instance/feeds)
+    # SITE_URL - адреса для абсолютних посилань; без неї адреса запиту підставляється
+    # в кожну відповідь (без .gz) - задавайте SITE_URL у production
+    SITE_URL: Optional[str] = os.getenv("SITE_URL")
+    FEEDS_PATH: Optional[str] = os.getenv("FEEDS_PATH")
+    FEED_SIZE: int = int(os.getenv("FEED_SIZE", "20"))
+    SITEMAP_CHUNK_SIZE: int = int(os.getenv("SITEMAP_CHUNK_SIZE", "10000"))
+    FEEDS_MAX_AGE: int = int(os.getenv("FEEDS_MAX_AGE", "300"))
+    
+    # Популярне зараз: згасання переглядів (години), вікно кошиків, розмір top-K,
+    # кількість постів на сторінці та як часто воркер перечитує top-K (секунди)
+    TRENDING_HALF_LIFE_HOURS: float = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "12"))
+    TRENDING_WINDOW_HOURS: int = int(os.getenv("TRENDING_WINDOW_HOURS", "72"))
+    TRENDING_CAPACITY: int = int(os.getenv("TRENDING_CAPACITY", "100"))
+    TRENDING_LIMIT: int = int(os.getenv("TRENDING_LIMIT", "20"))
+    TRENDING_REFRESH_INTERVAL: float = float(os.getenv("TRENDING_REFRESH_INTERVAL", "10"))
+    
+    # Кеш сторінок для анонімних відвідувачів
+    # memory - окремо в кожному воркері, sqlite - спільний файл для всіх воркерів, none - вимкнено
+    PAGE_CACHE_BACKEND: str = os.getenv("PAGE_CACHE_BACKEND", "sqlite")
+    PAGE_CACHE_PATH: Optional[str] = os.getenv("PAGE_CACHE_PATH")
+    PAGE_CACHE_TTL: float = float(os.getenv("PAGE_CACHE_TTL", "60"))
+    PAGE_CACHE_MAX_ENTRIES: int = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "2000"))
+    PAGE_CACHE_MAX_BYTES: int = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    
+    # HTTP-кешування анонімних сторінок (ETag/Last-Modified, Cache-Control)
+    # max-age - для браузерів, s-maxage - для зворотного проксі/CDN
+    HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+    HTTP_CACHE_SHARED_MAX_AGE: int = int(os.getenv("HTTP_CACHE_SHARED_MAX_AGE", "30"))
+    
+    # Статичні ресурси з відбитками (збірка: flask assets build) та стиснення HTML
+    ASSETS_BUILD_ON_START: bool = os.getenv("ASSETS_BUILD_ON_START", "True").lower() == "true"
+    COMPRESS_MIN_SIZE: int = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))  # 0 - вимкнено
+    COMPRESS_LEVEL: int = int(os.getenv("COMPRESS_LEVEL", "6"))
+    
+    # Кеш знімків користувачів для user_loader (memory | sqlite | none)
+    IDENTITY_CACHE_BACKEND: str = os.getenv("IDENTITY_CACHE_BACKEND", "sqlite")
+    IDENTITY_CACHE_PATH: Optional[str] = os.getenv("IDENTITY_CACHE_PATH")
+    IDENTITY_CACHE_TTL: float = float(os.getenv("IDENTITY_CACHE_TTL", "300"))
+    IDENTITY_CACHE_MAX_ENTRIES: int = int(os.getenv("IDENTITY_CACHE_MAX_ENTRIES", "10000"))
+    
+    # Фонова генерація ШІ-резюме
+    # SUMMARY_WORKER_INPROCESS=false - виконавці запускаються окремо: flask summaries worker
+    SUMMARY_WORKER_INPROCESS: bool = os.getenv("SUMMARY_WORKER_INPROCESS", "True").lower() == "true"
+    SUMMARY_WORKER_THREADS: int = int(os.getenv("SUMMARY_WORKER_THREADS", "2"))
+    SUMMARY_WORKER_POLL_INTERVAL: float = float(os.getenv("SUMMARY_WORKER_POLL_INTERVAL", "5"))
+    SUMMARY_JOB_MAX_ATTEMPTS: int = int(os.getenv("SUMMARY_JOB_MAX_ATTEMPTS", "5"))
+    SUMMARY_JOB_RETRY_DELAY: float = float(os.getenv("SUMMARY_JOB_RETRY_DELAY", "15"))
+    
+    # Метрики запитів (SQL, шаблони, зовнішні виклики) на /internal/metrics
+    # Без METRICS_TOKEN endpoint доступний лише в debug з localhost (Bearer-токен у production)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+    METRICS_TOKEN: Optional[str] = os.getenv("METRICS_TOKEN")
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "250"))  # 0 - вимкнено
+    # Детектор N+1: однакові SELECT у межах запиту від порогу і більше
+    METRICS_N_PLUS_ONE: bool = os.getenv("METRICS_N_PLUS_ONE", "False").lower() == "true"
+    METRICS_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("METRICS_N_PLUS_ONE_THRESHOLD", "5"))
+    
+    # Періодична звірка зведених лічильників статистики (секунди; 0 - вимкнено)
+    ROLLUP_RECONCILE_INTERVAL: float = float(os.getenv("ROLLUP_RECONCILE_INTERVAL", "3600"))
 
 
@@ -1,18 +1,55 @@
 """
 Модуль для роботи з базою даних
 """
+import os
+
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_migrate import Migrate
+from sqlalchemy.dialects import postgresql, sqlite
+
+from platform_app.core.routing import replica_router
+
+
+class RoutingSession(Session):
+    """Сесія, що направляє читання view з @replica_reads на репліку (core/routing.py)"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            key = replica_router.route(self, clause)
+            if key:
+                return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
 
 # Глобальні об'єкти для БД
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 
+# Каталог міграцій Alembic (незалежно від поточної директорії)
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "migrations"
+)
+
+
+def _include_name(name, type_, parent_names) -> bool:
+    """Таблиці пошукового індексу (FTS5 та її службові) керуються міграціями вручну"""
+    return not (type_ == "table" and name and name.startswith("post_search"))
+
 
 def init_database(app: Flask) -> None:
     """Ініціалізує підключення до бази даних"""
     db.init_app(app)
-    migrate.init_app(app, db)
+    migrate.init_app(
+        app, db, directory=MIGRATIONS_DIR, render_as_batch=True, include_name=_include_name
+    )
+
+
+def dialect_insert(table):
+    """INSERT з підтримкою ON CONFLICT (PostgreSQL або SQLite)"""
+    if db.engine.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
 
 
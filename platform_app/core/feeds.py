@@ -0,0 +1,488 @@
+"""
+Стрічки RSS/Atom та карта сайту як готові файли.
+
+Артефакти (стрічки - загальна, автора, тегу; індекс sitemap.xml та його
+частини) пишуться потоково (XMLGenerator поверх курсора з yield_per) у
+каталог instance/feeds поряд зі стиснутою копією .gz і файлом стану .json.
+Запит до актуального артефакту - один запит по первинному ключу та
+send_file з ETag/Last-Modified (304 без читання файлу). Адреса сайту в
+артефактах - SITE_URL; без неї файли містять BASE_PLACEHOLDER, а адреса
+запиту підставляється під час віддачі, тож різні Host не перебудовують файли.
+
+Актуальність перевіряється за поколіннями з core/conditional.py, які
+збільшуються сигналами змін постів і профілів: загальна стрічка, стрічки
+тегів та індекс карти сайту - gen:listing, стрічка автора - gen:author:<id>.
+Частина карти сайту охоплює діапазон id постів і перебудовується лише
+тоді, коли змінилися кількість, сума id або max(updated_at) постів у ньому -
+після правки одного поста перезаписується одна частина.
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import IO, Callable, Dict, List, NamedTuple, Optional
+from urllib.parse import quote
+from xml.sax.saxutils import XMLGenerator
+
+from flask import Flask, Response, abort, request, send_file, url_for
+from sqlalchemy import func
+
+from platform_app.core.conditional import (
+    LISTING_GENERATION, ConditionalGet, author_generation_column, generation_time,
+)
+from platform_app.core.database import db
+from platform_app.core.listings import EXCERPT_LENGTH
+from platform_app.core.tags import get_tag, post_criteria_for_tag
+from platform_app.models.post import BlogPost
+from platform_app.models.rollups import PlatformCounter
+from platform_app.models.user import UserAccount
+
+RSS = "rss"
+ATOM = "atom"
+
+MIMETYPES = {
+    RSS: "application/rss+xml",
+    ATOM: "application/atom+xml",
+    "sitemap": "application/xml",
+}
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+
+# Максимум адрес в одному файлі карти сайту за протоколом sitemaps.org
+SITEMAP_MAX_URLS = 50000
+
+# Адреса в артефактах, коли SITE_URL не задано: файл і його стан не залежать
+# від заголовка Host, адреса запиту підставляється під час віддачі
+BASE_PLACEHOLDER = "http://site-url.invalid"
+
+
+class Artifact(NamedTuple):
+    """Стан готового файлу"""
+
+    name: str
+    state: str
+    etag: str
+    last_modified: Optional[datetime]
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    return value.replace(tzinfo=timezone.utc) if value else None
+
+
+def _iso(value: datetime) -> str:
+    return value.replace(microsecond=0, tzinfo=None).isoformat() + "Z"
+
+
+class _Writer:
+    """Потоковий запис XML з відступами між елементами"""
+
+    def __init__(self, out: IO[bytes]) -> None:
+        self.xml = XMLGenerator(out, encoding="utf-8", short_empty_elements=True)
+        self.xml.startDocument()
+
+    def start(self, name: str, attrs: Optional[Dict[str, str]] = None) -> None:
+        self.xml.startElement(name, attrs or {})
+        self.xml.ignorableWhitespace("\n")
+
+    def end(self, name: str) -> None:
+        self.xml.endElement(name)
+        self.xml.ignorableWhitespace("\n")
+
+    def element(self, name: str, text: Optional[str] = None,
+                attrs: Optional[Dict[str, str]] = None) -> None:
+        self.xml.startElement(name, attrs or {})
+        if text:
+            self.xml.characters(text)
+        self.xml.endElement(name)
+        self.xml.ignorableWhitespace("\n")
+
+    def close(self) -> None:
+        self.xml.endDocument()
+
+
+class FeedBuilder:
+    """Побудова, перевірка актуальності та віддача артефактів"""
+
+    def __init__(self) -> None:
+        self.root = ""
+        self.site_url: Optional[str] = None
+        self.feed_size = 20
+        self.chunk_size = 10000
+        self.max_age = 300
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self.root = app.config.get("FEEDS_PATH") or os.path.join(app.instance_path, "feeds")
+        self.site_url = app.config.get("SITE_URL")
+        self.feed_size = app.config.get("FEED_SIZE", self.feed_size)
+        self.chunk_size = min(app.config.get("SITEMAP_CHUNK_SIZE", self.chunk_size), SITEMAP_MAX_URLS)
+        self.max_age = app.config.get("FEEDS_MAX_AGE", self.max_age)
+
+    # Адреси
+
+    def base_url(self) -> str:
+        """Адреса сайту для абсолютних посилань в артефактах (SITE_URL або підстановка)"""
+        return (self.site_url or BASE_PLACEHOLDER).rstrip("/")
+
+    def _post_url_prefix(self) -> str:
+        # url_for один раз на артефакт, далі - лише екранування slug
+        return self.base_url() + url_for("posts.view_post", slug="-")[:-1]
+
+    # Файли артефактів
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def _lock(self, name: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def load(self, name: str) -> Optional[Artifact]:
+        """Стан артефакту з файлу .json (None, якщо артефакту немає)"""
+        try:
+            with open(self._path(f"{name}.json"), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.isfile(self._path(name)):
+            return None
+        modified = data.get("last_modified")
+        return Artifact(
+            name, data["state"], data["etag"],
+            datetime.fromtimestamp(modified, tz=timezone.utc) if modified else None,
+        )
+
+    def _write(self, name: str, state: str, last_modified: Optional[datetime],
+               render: Callable[[_Writer], None]) -> Artifact:
+        """Пише артефакт, його .gz і стан через тимчасові файли (атомарна заміна)"""
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(name)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(path + suffix, "wb") as out:
+            writer = _Writer(out)
+            render(writer)
+            writer.close()
+        with open(path + suffix, "rb") as src, gzip.GzipFile(
+            path + ".gz" + suffix, "wb", compresslevel=9, mtime=0
+        ) as dst:
+            shutil.copyfileobj(src, dst)
+
+        artifact = Artifact(
+            name, state, hashlib.sha1(f"{name}|{state}".encode()).hexdigest()[:20], last_modified
+        )
+        with open(path + ".json" + suffix, "w", encoding="utf-8") as f:
+            json.dump({
+                "state": state,
+                "etag": artifact.etag,
+                "last_modified": last_modified.timestamp() if last_modified else None,
+            }, f)
+
+        os.replace(path + suffix, path)
+        os.replace(path + ".gz" + suffix, path + ".gz")
+        os.replace(path + ".json" + suffix, path + ".json")
+        return artifact
+
+    def ensure(self, name: str, state: str, last_modified: Optional[datetime],
+               render: Callable[[_Writer], None]) -> Artifact:
+        """Повертає актуальний артефакт, за потреби перебудовуючи його"""
+        artifact = self.load(name)
+        if artifact is not None and artifact.state == state:
+            return artifact
+        with self._lock(name):
+            # Інший потік міг уже перебудувати артефакт, поки ми чекали
+            artifact = self.load(name)
+            if artifact is not None and artifact.state == state:
+                return artifact
+            return self._write(name, state, last_modified, render)
+
+    def serve(self, artifact: Artifact, mimetype: str) -> Response:
+        """Віддає готовий файл (стиснутий, якщо клієнт приймає gzip) з ETag та Last-Modified"""
+        if not self.site_url:
+            return self._serve_for_host(artifact, mimetype)
+        path, etag = self._path(artifact.name), artifact.etag
+        compressed = "gzip" in request.accept_encodings
+        if compressed:
+            path, etag = path + ".gz", etag + "-gz"
+
+        response = send_file(
+            path,
+            mimetype=mimetype,
+            etag=etag,
+            last_modified=artifact.last_modified,
+            max_age=self.max_age,
+            conditional=True,
+        )
+        response.cache_control.public = True
+        response.vary.add("Accept-Encoding")
+        if compressed:
+            response.headers["Content-Encoding"] = "gzip"
+        return response
+
+    def _serve_for_host(self, artifact: Artifact, mimetype: str) -> Response:
+        """Без SITE_URL: підставляє адресу запиту у файл (без .gz - режим розробки)"""
+        base = request.host_url.rstrip("/")
+        response = Response(mimetype=mimetype)
+        response.set_etag(f"{artifact.etag}-{hashlib.sha1(base.encode()).hexdigest()[:8]}")
+        response.last_modified = artifact.last_modified
+        response.cache_control.max_age = self.max_age
+        response.cache_control.public = True
+        response.make_conditional(request)
+        if response.status_code != 304:
+            with open(self._path(artifact.name), "rb") as f:
+                response.set_data(f.read().replace(BASE_PLACEHOLDER.encode(), base.encode()))
+        return response
+
+    # Стрічки
+
+    def _feed_rows(self, criteria: list):
+        return db.session.execute(
+            db.select(
+                BlogPost.slug,
+                BlogPost.title,
+                BlogPost.summary,
+                func.substr(BlogPost.content, 1, EXCERPT_LENGTH).label("excerpt"),
+                BlogPost.published_at,
+                BlogPost.updated_at,
+                UserAccount.username,
+                UserAccount.full_name,
+            )
+            .join(UserAccount, UserAccount.id == BlogPost.author_id)
+            .where(BlogPost.is_published == True, *criteria)
+            .order_by(BlogPost.published_at.desc(), BlogPost.id.desc())
+            .limit(self.feed_size)
+            .execution_options(yield_per=self.feed_size)
+        )
+
+    def _render_feed(self, kind: str, title: str, html_url: str, self_url: str,
+                     criteria: list, updated: Optional[datetime]) -> Callable[[_Writer], None]:
+        prefix = self._post_url_prefix()
+        updated = updated or datetime.now(timezone.utc)
+
+        def render_rss(out: _Writer) -> None:
+            out.start("rss", {"version": "2.0", "xmlns:atom": ATOM_NS,
+                              "xmlns:dc": "http://purl.org/dc/elements/1.1/"})
+            out.start("channel")
+            out.element("title", title)
+            out.element("link", html_url)
+            out.element("description", title)
+            out.element("language", "uk")
+            out.element("lastBuildDate", format_datetime(updated))
+            out.element("atom:link", attrs={"href": self_url, "rel": "self", "type": MIMETYPES[RSS]})
+            for row in self._feed_rows(criteria):
+                link = prefix + quote(row.slug)
+                out.start("item")
+                out.element("title", row.title)
+                out.element("link", link)
+                out.element("guid", link, {"isPermaLink": "true"})
+                out.element("pubDate", format_datetime(_utc(row.published_at)))
+                out.element("dc:creator", row.full_name or row.username)
+                out.element("description", row.summary or f"{row.excerpt}...")
+                out.end("item")
+            out.end("channel")
+            out.end("rss")
+
+        def render_atom(out: _Writer) -> None:
+            out.start("feed", {"xmlns": ATOM_NS, "xml:lang": "uk"})
+            out.element("title", title)
+            out.element("id", self_url)
+            out.element("link", attrs={"href": self_url, "rel": "self"})
+            out.element("link", attrs={"href": html_url, "rel": "alternate", "type": "text/html"})
+            out.element("updated", _iso(updated))
+            for row in self._feed_rows(criteria):
+                link = prefix + quote(row.slug)
+                out.start("entry")
+                out.element("title", row.title)
+                out.element("id", link)
+                out.element("link", attrs={"href": link, "rel": "alternate"})
+                out.element("published", _iso(row.published_at))
+                out.element("updated", _iso(row.updated_at))
+                out.start("author")
+                out.element("name", row.full_name or row.username)
+                out.end("author")
+                out.element("summary", row.summary or f"{row.excerpt}...")
+                out.end("entry")
+            out.end("feed")
+
+        return render_rss if kind == RSS else render_atom
+
+    def _feed(self, kind: str, name: str, generation: int, title: str, html_path: str,
+              self_path: str, criteria: list) -> Artifact:
+        changed = generation_time(generation)
+        base = self.base_url()
+        return self.ensure(
+            f"{name}.{kind}",
+            f"{generation}|{base}|{self.feed_size}",
+            changed,
+            self._render_feed(kind, title, base + html_path, base + self_path, criteria, changed),
+        )
+
+    def site_feed(self, kind: str) -> Artifact:
+        """Загальна стрічка останніх постів"""
+        return self._feed(
+            kind, "feed", ConditionalGet.generation(LISTING_GENERATION),
+            "Платформа для блогів", url_for("main.home"), url_for(f"feeds.site_{kind}"), [],
+        )
+
+    def author_feed(self, kind: str, username: str) -> Artifact:
+        """Стрічка автора (404, якщо користувача немає)"""
+        row = db.session.execute(
+            db.select(UserAccount.id, UserAccount.username, UserAccount.full_name, PlatformCounter.value)
+            .outerjoin(PlatformCounter, PlatformCounter.name == author_generation_column(UserAccount.id))
+            .where(UserAccount.username == username)
+        ).first()
+        if row is None:
+            abort(404)
+        return self._feed(
+            kind, f"author-{row.id}", row.value or 0,
+            f"Публікації {row.full_name or row.username}",
+            url_for("users.view_profile", username=row.username),
+            url_for(f"feeds.author_{kind}", username=row.username),
+            [BlogPost.author_id == row.id],
+        )
+
+    def tag_feed(self, kind: str, tag: str) -> Artifact:
+        """Стрічка тегу (404, якщо тегу немає)"""
+        tag_item = get_tag(tag)
+        if tag_item is None:
+            abort(404)
+        return self._feed(
+            kind, f"tag-{tag_item.id}", ConditionalGet.generation(LISTING_GENERATION),
+            f"#{tag_item.name}", url_for("posts.list_by_tag", tag=tag_item.name),
+            url_for(f"feeds.tag_{kind}", tag=tag_item.name),
+            post_criteria_for_tag(tag_item.id),
+        )
+
+    # Карта сайту
+
+    def _chunk_states(self) -> List[Dict]:
+        """Стан кожної непорожньої частини: номер, кількість, сума id, max(updated_at)"""
+        chunk = (BlogPost.id // self.chunk_size).label("chunk")
+        rows = db.session.execute(
+            db.select(
+                chunk,
+                func.count(BlogPost.id).label("posts"),
+                func.sum(BlogPost.id).label("id_sum"),
+                func.max(BlogPost.updated_at).label("updated_at"),
+            )
+            .where(BlogPost.is_published == True)
+            .group_by(chunk)
+            .order_by(chunk)
+        ).all()
+        return [
+            {
+                "chunk": int(row.chunk),
+                "state": f"{row.posts}:{row.id_sum}:{row.updated_at.isoformat()}",
+                "updated_at": row.updated_at.isoformat(),
+            }
+            for row in rows
+        ]
+
+    def sitemap_index(self) -> Artifact:
+        """Індекс карти сайту (перебудовується при зміні gen:listing)"""
+        generation = ConditionalGet.generation(LISTING_GENERATION)
+        base = self.base_url()
+        state = f"{generation}|{base}|{self.chunk_size}"
+        artifact = self.load("sitemap.xml")
+        if artifact is not None and artifact.state == state:
+            return artifact
+
+        chunks = self._chunk_states()
+        manifest = {str(item.pop("chunk")): item for item in chunks}
+
+        def render(out: _Writer) -> None:
+            out.start("sitemapindex", {"xmlns": SITEMAP_NS})
+            for chunk, item in manifest.items():
+                out.start("sitemap")
+                out.element("loc", base + url_for("feeds.sitemap_chunk", chunk=int(chunk)))
+                out.element("lastmod", _iso(datetime.fromisoformat(item["updated_at"])))
+                out.end("sitemap")
+            out.end("sitemapindex")
+
+        with self._lock("sitemap.xml"):
+            # Стани частин - окремим файлом: запит частини не повторює GROUP BY
+            os.makedirs(self.root, exist_ok=True)
+            manifest_path = self._path("sitemap-chunks.json")
+            tmp_path = f"{manifest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, manifest_path)
+            return self._write("sitemap.xml", state, generation_time(generation), render)
+
+    def sitemap_chunk(self, chunk: int) -> Artifact:
+        """Частина карти сайту: опубліковані пости з id у [chunk * size, (chunk + 1) * size)"""
+        self.sitemap_index()
+        try:
+            with open(self._path("sitemap-chunks.json"), encoding="utf-8") as f:
+                expected = json.load(f).get(str(chunk))
+        except (OSError, ValueError):
+            expected = None
+        if expected is None:
+            abort(404)
+
+        first = chunk * self.chunk_size
+        prefix = self._post_url_prefix()
+
+        def render(out: _Writer) -> None:
+            out.start("urlset", {"xmlns": SITEMAP_NS})
+            rows = db.session.execute(
+                db.select(BlogPost.slug, BlogPost.updated_at)
+                .where(BlogPost.is_published == True, BlogPost.id >= first,
+                       BlogPost.id < first + self.chunk_size)
+                .order_by(BlogPost.id)
+                .execution_options(yield_per=1000)
+            )
+            for row in rows:
+                out.start("url")
+                out.element("loc", prefix + quote(row.slug))
+                out.element("lastmod", _iso(row.updated_at))
+                out.end("url")
+            out.end("urlset")
+
+        return self.ensure(
+            f"sitemap-{chunk}.xml",
+            f"{expected['state']}|{self.base_url()}",
+            _utc(datetime.fromisoformat(expected["updated_at"])),
+            render,
+        )
+
+    # Попередня побудова
+
+    def build_all(self) -> Dict[str, int]:
+        """
+        Будує загальні стрічки, індекс і всі частини карти сайту
+        (потрібен контекст запиту - для адрес, див. `flask feeds build`)
+        """
+        for kind in (RSS, ATOM):
+            self.site_feed(kind)
+        self.sitemap_index()
+        with open(self._path("sitemap-chunks.json"), encoding="utf-8") as f:
+            chunks = [int(chunk) for chunk in json.load(f)]
+        for chunk in chunks:
+            self.sitemap_chunk(chunk)
+        return {"feeds": 2, "sitemap_chunks": len(chunks)}
+
+    def clear(self) -> int:
+        """Видаляє всі артефакти (будуть перебудовані при наступному запиті)"""
+        if not os.path.isdir(self.root):
+            return 0
+        removed = 0
+        for name in os.listdir(self.root):
+            os.remove(self._path(name))
+            removed += 1
+        return removed
+
+
+# Глобальний будівник стрічок
+feeds = FeedBuilder()
+
+
+def init_feeds(app: Flask) -> None:
+    """Налаштовує каталог та параметри стрічок і карти сайту"""
+    feeds.init_app(app)
@@ -0,0 +1,129 @@
+"""
+Кешований знімок користувача для user_loader Flask-Login.
+
+Замість завантаження UserAccount з БД на кожен запит current_user - це
+компактний UserIdentity (__slots__, тільки для читання) з полями, які
+використовують шаблони та blueprint'и. Знімки зберігаються в кеші з TTL
+(memory - на воркер, sqlite - спільний локальний файл) і позначаються
+тегом user:<id>; зміна профілю чи деактивація збільшує версію тегу.
+Обробники, що змінюють користувача, завантажують ORM-об'єкт через
+current_user.load_account().
+"""
+from typing import Dict, Optional
+
+from flask import Flask
+
+from platform_app.core.cache import CacheStats, create_cache
+from platform_app.core.database import db
+from platform_app.core.signals import user_changed
+from platform_app.models.user import UserAccount
+
+
+def identity_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+class UserIdentity:
+    """Знімок автентифікованого користувача (сумісний з інтерфейсом Flask-Login)"""
+
+    __slots__ = ("id", "username", "full_name", "is_active")
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, id: int, username: str, full_name: Optional[str], is_active: bool) -> None:
+        self.id = id
+        self.username = username
+        self.full_name = full_name
+        self.is_active = is_active
+
+    @classmethod
+    def from_account(cls, account: UserAccount) -> "UserIdentity":
+        return cls(account.id, account.username, account.full_name, account.is_active)
+
+    def as_tuple(self) -> tuple:
+        return (self.id, self.username, self.full_name, self.is_active)
+
+    def __repr__(self) -> str:
+        return f"<UserIdentity {self.username}>"
+
+    def get_id(self) -> str:
+        return str(self.id)
+
+    def get_display_name(self) -> str:
+        """Повертає ім'я для відображення"""
+        return self.full_name or self.username
+
+    def load_account(self) -> UserAccount:
+        """Повний ORM-об'єкт - для обробників, що змінюють користувача"""
+        return db.session.get(UserAccount, self.id)
+
+
+class IdentityCache:
+    """Кеш знімків користувачів з TTL та інвалідацією за версіями"""
+
+    def __init__(self) -> None:
+        self.backend = None
+        self.ttl = 300.0
+        self.stats = CacheStats()
+
+    def init_app(self, app: Flask) -> None:
+        path = app.config.get("IDENTITY_CACHE_PATH") or f"{app.instance_path}/identity_cache.sqlite"
+        self.backend = create_cache(
+            app.config.get("IDENTITY_CACHE_BACKEND", "memory"),
+            path,
+            max_entries=app.config.get("IDENTITY_CACHE_MAX_ENTRIES", 10000),
+            max_bytes=16 * 1024 * 1024,
+        )
+        self.ttl = app.config.get("IDENTITY_CACHE_TTL", self.ttl)
+        user_changed.connect(self._on_user_changed, weak=False)
+
+    def get(self, user_id: int) -> Optional[UserIdentity]:
+        """Знімок користувача з кешу або з БД (None, якщо користувача немає)"""
+        if self.backend is None:
+            return self._load(user_id)
+
+        tag = identity_tag(user_id)
+        key = f"identity:{user_id}"
+        entry = self.backend.get(key)
+        if entry is not None and self.backend.tag_versions([tag]) == entry["tags"]:
+            self.stats.hits += 1
+            return UserIdentity(*entry["fields"])
+
+        self.stats.misses += 1
+        # Версія фіксується до читання з БД, щоб не зберегти застарілий знімок
+        versions = self.backend.tag_versions([tag])
+        identity = self._load(user_id)
+        if identity is not None:
+            self.backend.set(key, {"fields": identity.as_tuple(), "tags": versions}, self.ttl)
+            self.stats.stores += 1
+        return identity
+
+    @staticmethod
+    def _load(user_id: int) -> Optional[UserIdentity]:
+        row = db.session.execute(
+            db.select(UserAccount.id, UserAccount.username, UserAccount.full_name, UserAccount.is_active)
+            .where(UserAccount.id == user_id)
+        ).first()
+        return UserIdentity(*row) if row else None
+
+    def invalidate(self, user_id: int) -> None:
+        """Робить знімок користувача неактуальним"""
+        if self.backend is None:
+            return
+        self.backend.bump_tags([identity_tag(user_id)])
+        self.backend.delete(f"identity:{user_id}")
+        self.stats.invalidations += 1
+
+    def _on_user_changed(self, sender, user_id=None, **extra) -> None:
+        self.invalidate(user_id)
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = self.stats.as_dict()
+        if self.backend is not None:
+            stats["evictions"] = self.backend.stats.evictions
+        return stats
+
+
+# Глобальний кеш знімків користувачів
+identity_cache = IdentityCache()
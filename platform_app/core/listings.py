@@ -0,0 +1,115 @@
+"""
+Легкий шлях читання для списків постів (картки на головній, у списку, профілі).
+
+Замість повних ORM-об'єктів BlogPost один запит з JOIN на автора повертає
+лише потрібні карткам колонки та перші символи тексту, без відстеження сесією.
+"""
+from typing import Iterable, List
+
+from sqlalchemy import func
+
+from platform_app.core.database import db
+from platform_app.models.post import BlogPost
+from platform_app.models.user import UserAccount
+
+# Довжина уривку тексту для карток без опису
+EXCERPT_LENGTH = 150
+
+
+class PostCard:
+    """Рядок картки поста (тільки для читання)"""
+
+    __slots__ = (
+        "id",
+        "slug",
+        "title",
+        "summary",
+        "excerpt",
+        "ai_generated",
+        "is_published",
+        "published_at",
+        "view_count",
+        "author_id",
+        "author_username",
+        "author_name",
+    )
+
+    def __init__(self, row) -> None:
+        self.id = row.id
+        self.slug = row.slug
+        self.title = row.title
+        self.summary = row.summary
+        self.excerpt = row.excerpt or ""
+        self.ai_generated = row.ai_generated
+        self.is_published = row.is_published
+        self.published_at = row.published_at
+        self.view_count = row.view_count
+        self.author_id = row.author_id
+        self.author_username = row.author_username
+        self.author_name = row.author_full_name or row.author_username
+
+    def __repr__(self) -> str:
+        return f"<PostCard {self.slug}>"
+
+    @property
+    def live_view_count(self) -> int:
+        """Кількість переглядів разом з ще не записаними в БД"""
+        from platform_app.core.view_counter import view_counter
+        return self.view_count + view_counter.pending(self.id)
+
+
+def card_select():
+    """Базовий SELECT для карток: колонки поста + ім'я автора, без повного тексту"""
+    return (
+        db.select(
+            BlogPost.id,
+            BlogPost.slug,
+            BlogPost.title,
+            BlogPost.summary,
+            func.substr(BlogPost.content, 1, EXCERPT_LENGTH).label("excerpt"),
+            BlogPost.ai_generated,
+            BlogPost.is_published,
+            BlogPost.published_at,
+            BlogPost.view_count,
+            BlogPost.author_id,
+            UserAccount.username.label("author_username"),
+            UserAccount.full_name.label("author_full_name"),
+        )
+        .join(UserAccount, UserAccount.id == BlogPost.author_id)
+    )
+
+
+def post_criteria(**filters) -> list:
+    """Умови WHERE по колонках BlogPost (аналог filter_by для SELECT з JOIN)"""
+    return [getattr(BlogPost, name) == value for name, value in filters.items()]
+
+
+def fetch_cards(stmt) -> List[PostCard]:
+    """Виконує SELECT картки та повертає список PostCard"""
+    return [PostCard(row) for row in db.session.execute(stmt)]
+
+
+def fetch_cards_by_ids(ids: Iterable[int]) -> List[PostCard]:
+    """Завантажує картки за id, зберігаючи порядок ids"""
+    ids = list(ids)
+    if not ids:
+        return []
+    by_id = {card.id: card for card in fetch_cards(card_select().where(BlogPost.id.in_(ids)))}
+    return [by_id[post_id] for post_id in ids if post_id in by_id]
+
+
+def latest_cards(limit: int, **filters) -> List[PostCard]:
+    """Останні пости за датою публікації з фільтрами по колонках BlogPost"""
+    stmt = (
+        card_select()
+        .where(*post_criteria(**filters))
+        .order_by(BlogPost.published_at.desc())
+        .limit(limit)
+    )
+    return fetch_cards(stmt)
+
+
+
+def count_select(**filters):
+    """SELECT COUNT(*) постів з тими самими фільтрами, що й post_criteria"""
+    return db.select(func.count(BlogPost.id)).where(*post_criteria(**filters))
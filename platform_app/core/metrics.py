@@ -0,0 +1,318 @@
+"""
+Інструментування запитів: SQL, рендеринг шаблонів, зовнішні HTTP-виклики.
+
+На кожен HTTP-запит у flask.g зберігається RequestMetrics; події engine
+SQLAlchemy додають кількість і час SQL-запитів, сигнали шаблонів - час
+рендерингу, TextSummarizer - час звернень до API. Після запиту значення
+потрапляють у гістограми з міткою endpoint, які віддаються у текстовому
+форматі Prometheus на /internal/metrics.
+
+Додатково:
+  - журнал повільних SQL-запитів (SLOW_QUERY_THRESHOLD_MS) - параметри не пишуться;
+  - детектор N+1 (METRICS_N_PLUS_ONE) - однакові SELECT у межах запиту;
+  - стан запобіжників зовнішніх викликів (ai/breaker.py).
+
+Метрики зберігаються в пам'яті процесу: кожен воркер gunicorn має власні
+значення, Prometheus збирає їх з кожного воркера окремо.
+"""
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from flask import Flask, Response, abort, before_render_template, current_app, g, has_request_context, request
+from flask import request_finished, request_started, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Межі гістограм
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+# Мітка endpoint для викликів поза HTTP-запитом (фонові виконавці, CLI)
+NO_ENDPOINT = "-"
+
+
+class Histogram:
+    """Гістограма з фіксованими межами для кожного набору міток"""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float],
+                 labels: Tuple[str, ...] = ("endpoint",)) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.labels = labels
+        # мітки -> [лічильники кошиків..., +Inf, сума]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for label_values, series in sorted(items):
+            base = _format_labels(self.labels, label_values)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                le_label = f'le="{le}"'
+                lines.append(f"{self.name}_bucket{_join_labels(base, le_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{_join_labels(base)} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{_join_labels(base)} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Лічильник з мітками"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ("endpoint",)) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_join_labels(_format_labels(self.labels, label_values))} {value:g}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _join_labels(*parts: str) -> str:
+    joined = ",".join(part for part in parts if part)
+    return f"{{{joined}}}" if joined else ""
+
+
+class RequestMetrics:
+    """Виміри одного HTTP-запиту"""
+
+    __slots__ = ("started", "queries", "db_time", "render_time", "render_started",
+                 "outbound_time", "statements")
+
+    def __init__(self, track_statements: bool) -> None:
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.render_started: Optional[float] = None
+        self.outbound_time = 0.0
+        self.statements: Optional[Dict[str, int]] = {} if track_statements else None
+
+
+def _current() -> Optional[RequestMetrics]:
+    if not has_request_context():
+        return None
+    return g.get("_request_metrics")
+
+
+def _endpoint() -> str:
+    if not has_request_context():
+        return NO_ENDPOINT
+    # Невідомі URL (404) - одна мітка, щоб кількість серій не росла
+    return request.endpoint or "unmatched"
+
+
+class Metrics:
+    """Реєстр метрик та обробники подій"""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.token: Optional[str] = None
+        self.slow_query_threshold = 0.25
+        self.n_plus_one = False
+        self.n_plus_one_threshold = 5
+
+        self.requests = Counter(
+            "blog_http_requests_total", "HTTP requests", ("endpoint", "method", "status"))
+        self.request_time = Histogram(
+            "blog_http_request_duration_seconds", "Total request time", TIME_BUCKETS)
+        self.query_count = Histogram(
+            "blog_db_queries_per_request", "SQL statements per request", COUNT_BUCKETS)
+        self.db_time = Histogram(
+            "blog_db_time_seconds", "Time spent in SQL per request", TIME_BUCKETS)
+        self.render_time = Histogram(
+            "blog_template_render_seconds", "Template rendering time per request", TIME_BUCKETS)
+        self.outbound_time = Histogram(
+            "blog_outbound_http_seconds", "Outbound HTTP call duration", TIME_BUCKETS,
+            ("endpoint", "target"))
+        self.slow_queries = Counter("blog_db_slow_queries_total", "Slow SQL statements")
+        self.n_plus_one_hits = Counter(
+            "blog_db_repeated_statements_total", "Requests with repeated identical SELECTs")
+        self.breaker_transitions = Counter(
+            "blog_circuit_transitions_total", "Circuit breaker state changes", ("circuit", "state"))
+        self.breaker_short_circuits = Counter(
+            "blog_circuit_short_circuited_total", "Calls rejected by an open circuit", ("circuit",))
+        self.budget_exceeded = Counter(
+            "blog_outbound_budget_exceeded_total", "Calls abandoned after the latency budget",
+            ("target",))
+        self._collectors = (
+            self.requests, self.request_time, self.query_count, self.db_time,
+            self.render_time, self.outbound_time, self.slow_queries, self.n_plus_one_hits,
+            self.breaker_transitions, self.breaker_short_circuits, self.budget_exceeded,
+        )
+
+    def init_app(self, app: Flask) -> None:
+        self.enabled = app.config.get("METRICS_ENABLED", True)
+        if not self.enabled:
+            return
+        self.token = app.config.get("METRICS_TOKEN") or None
+        self.slow_query_threshold = app.config.get("SLOW_QUERY_THRESHOLD_MS", 250) / 1000
+        self.n_plus_one = app.config.get("METRICS_N_PLUS_ONE", False)
+        self.n_plus_one_threshold = app.config.get("METRICS_N_PLUS_ONE_THRESHOLD", 5)
+
+        # Подія на класі Engine - охоплює всі engine застосунку
+        if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+        request_started.connect(self._on_request_started, app, weak=False)
+        request_finished.connect(self._on_request_finished, app, weak=False)
+        before_render_template.connect(self._on_before_render, app, weak=False)
+        template_rendered.connect(self._on_rendered, app, weak=False)
+
+        app.add_url_rule("/internal/metrics", endpoint="metrics", view_func=self.serve)
+        if not self.token and not app.debug:
+            print("METRICS_TOKEN не задано: /internal/metrics вимкнено (без токена - лише в debug з localhost)")
+
+    # Події
+
+    def _on_request_started(self, sender, **extra) -> None:
+        g._request_metrics = RequestMetrics(self.n_plus_one)
+
+    def _on_request_finished(self, sender, response, **extra) -> None:
+        state = _current()
+        if state is None:
+            return
+        endpoint = _endpoint()
+        self.requests.inc(endpoint, request.method, str(response.status_code))
+        self.request_time.observe(time.perf_counter() - state.started, endpoint)
+        self.query_count.observe(state.queries, endpoint)
+        self.db_time.observe(state.db_time, endpoint)
+        if state.render_time:
+            self.render_time.observe(state.render_time, endpoint)
+        if state.statements:
+            self._report_repeated(state.statements, endpoint)
+
+    def _on_before_render(self, sender, **extra) -> None:
+        state = _current()
+        if state is not None:
+            state.render_started = time.perf_counter()
+
+    def _on_rendered(self, sender, **extra) -> None:
+        state = _current()
+        if state is not None and state.render_started is not None:
+            state.render_time += time.perf_counter() - state.render_started
+            state.render_started = None
+
+    def record_query(self, statement: str, executemany: bool, params_count: int, elapsed: float) -> None:
+        state = _current()
+        if state is not None:
+            state.queries += 1
+            state.db_time += elapsed
+            if state.statements is not None and statement.lstrip()[:6].upper() == "SELECT":
+                state.statements[statement] = state.statements.get(statement, 0) + 1
+
+        if self.slow_query_threshold and elapsed >= self.slow_query_threshold:
+            endpoint = _endpoint()
+            self.slow_queries.inc(endpoint)
+            # Значення параметрів можуть містити персональні дані - пишемо лише їх кількість
+            sql = " ".join(statement.split())[:1000]
+            print(f"Slow query {elapsed * 1000:.1f} ms [{endpoint}]: {sql} "
+                  f"(params redacted: {params_count}{', executemany' if executemany else ''})")
+
+    def _report_repeated(self, statements: Dict[str, int], endpoint: str) -> None:
+        repeated = [(n, sql) for sql, n in statements.items() if n >= self.n_plus_one_threshold]
+        if not repeated:
+            return
+        self.n_plus_one_hits.inc(endpoint)
+        for n, sql in sorted(repeated, reverse=True):
+            print(f"Possible N+1 [{endpoint}]: {n}x {' '.join(sql.split())[:300]}")
+
+    @contextmanager
+    def outbound(self, target: str) -> Iterator[None]:
+        """Вимірює зовнішній HTTP-виклик: with metrics.outbound("summarizer"): ..."""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.outbound_time.observe(elapsed, _endpoint(), target)
+            state = _current()
+            if state is not None:
+                state.outbound_time += elapsed
+
+    # Експорт
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for collector in self._collectors:
+            lines.extend(collector.render())
+        return "\n".join(lines) + "\n"
+
+    def serve(self) -> Response:
+        """
+        Метрики у форматі Prometheus з токеном METRICS_TOKEN. Без токена - лише
+        в debug і з localhost: за проксі на тому ж хості remote_addr завжди локальний.
+        """
+        if self.token:
+            supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+            if not hmac.compare_digest(supplied, self.token):
+                abort(404)
+        elif not current_app.debug or request.remote_addr not in ("127.0.0.1", "::1"):
+            abort(404)
+        response = Response(self.render(), mimetype="text/plain")
+        response.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+        response.cache_control.no_store = True
+        return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    if started is None:
+        return
+    params_count = len(parameters) if isinstance(parameters, (list, tuple, dict)) else 0
+    metrics.record_query(statement, executemany, params_count, time.perf_counter() - started)
+
+
+# Глобальний реєстр метрик
+metrics = Metrics()
+
+
+def init_metrics(app: Flask) -> None:
+    """Підключає інструментування запитів та /internal/metrics"""
+    metrics.init_app(app)
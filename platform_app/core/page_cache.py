@@ -0,0 +1,194 @@
+"""
+Кеш готових HTML-відповідей для анонімних сторінок.
+
+Ключ - endpoint + аргументи маршруту (slug, тег, username) + аргументи
+запиту + стан автентифікації. Разом з тілом зберігаються заголовки
+відповіді (крім hop-by-hop). Кешуються лише
+анонімні GET-запити без flash-повідомлень. Записи позначаються тегами
+(listing, post:<slug>, author:<id>), які інвалідуються сигналами з
+core/signals.py після змін у постах і профілях.
+"""
+import hashlib
+from functools import wraps
+from typing import Callable, Dict, Optional
+
+from flask import Flask, Response, current_app, g, request, session
+from flask_login import current_user
+from werkzeug.http import is_hop_by_hop_header
+
+from platform_app.core.cache import CacheStats, create_cache
+from platform_app.core.signals import post_changed, user_changed
+
+LISTING_TAG = "listing"
+
+# Сторінки постів з блоком схожих постів (інвалідується повною перебудовою)
+RELATED_TAG = "related"
+
+# Заголовки, які не зберігаються з відповіддю (формуються заново при видачі)
+_UNSTORED_HEADERS = {"content-length", "set-cookie", "x-page-cache"}
+
+
+def post_tag(slug: str) -> str:
+    return f"post:{slug}"
+
+
+def author_tag(author_id: int) -> str:
+    return f"author:{author_id}"
+
+
+class PageCache:
+    """Кеш відповідей з інвалідацією за тегами"""
+
+    def __init__(self) -> None:
+        self.backend = None
+        self.ttl = 60.0
+        self.stats = CacheStats()
+
+    def init_app(self, app: Flask) -> None:
+        """Налаштовує сховище та підписується на сигнали змін"""
+        path = app.config.get("PAGE_CACHE_PATH") or f"{app.instance_path}/page_cache.sqlite"
+        self.backend = create_cache(
+            app.config.get("PAGE_CACHE_BACKEND", "memory"),
+            path,
+            max_entries=app.config.get("PAGE_CACHE_MAX_ENTRIES", 1000),
+            max_bytes=app.config.get("PAGE_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+        )
+        self.ttl = app.config.get("PAGE_CACHE_TTL", self.ttl)
+
+        post_changed.connect(self._on_post_changed, weak=False)
+        user_changed.connect(self._on_user_changed, weak=False)
+
+    # Побудова ключа та теги
+
+    @staticmethod
+    def _cacheable() -> bool:
+        """Чи можна обслужити поточний запит з кешу"""
+        if request.method != "GET":
+            return False
+        if current_user.is_authenticated:
+            return False
+        return not session.get("_flashes")
+
+    @staticmethod
+    def _make_key() -> str:
+        view_args = "&".join(f"{k}={v}" for k, v in sorted((request.view_args or {}).items()))
+        args = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+        raw = f"{request.endpoint}/{view_args}?{args}|anon"
+        return "page:" + hashlib.sha1(raw.encode()).hexdigest()
+
+    @staticmethod
+    def tag(*tags: str) -> None:
+        """Додає теги до відповіді, що зараз формується"""
+        g.setdefault("page_cache_tags", set()).update(tags)
+
+    @staticmethod
+    def set_meta(**meta) -> None:
+        """Дані, які зберігаються разом з відповіддю (передаються в on_hit)"""
+        g.setdefault("page_cache_meta", {}).update(meta)
+
+    # Декоратор
+
+    def cached(self, tags=(), on_hit: Optional[Callable[[Dict], None]] = None,
+               unless: Optional[Callable[[], bool]] = None):
+        """
+        Кешує відповідь view-функції для анонімних відвідувачів.
+
+        tags - список тегів або функція, що отримує аргументи view та повертає теги.
+        on_hit - викликається з meta збереженої відповіді при влучанні в кеш.
+        unless - якщо повертає True, запит обслуговується без кешу.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.backend is None or not self._cacheable():
+                    return view(*args, **kwargs)
+                if unless is not None and unless():
+                    return view(*args, **kwargs)
+
+                key = self._make_key()
+                entry = self.backend.get(key)
+                if entry is not None and self._is_fresh(entry):
+                    self.stats.hits += 1
+                    if on_hit is not None:
+                        on_hit(entry["meta"])
+                    response = Response(entry["body"], status=entry["status"], headers=entry["headers"])
+                    response.headers["X-Page-Cache"] = "HIT"
+                    return response
+
+                self.stats.misses += 1
+                # Версії тегів фіксуються до читання даних, щоб не зберегти
+                # застарілу сторінку при одночасній інвалідації
+                static_tags = tags(**kwargs) if callable(tags) else tags
+                versions = self.backend.tag_versions(static_tags)
+                response = current_app.make_response(view(*args, **kwargs))
+                if self._storable(response):
+                    self._store(key, response, versions)
+                response.headers["X-Page-Cache"] = "MISS"
+                return response
+
+            return wrapper
+
+        return decorator
+
+    def _is_fresh(self, entry: dict) -> bool:
+        """Запис актуальний, якщо версії його тегів не змінилися"""
+        return self.backend.tag_versions(entry["tags"]) == entry["tags"]
+
+    @staticmethod
+    def _storable(response: Response) -> bool:
+        return (
+            response.status_code == 200
+            and not response.direct_passthrough
+            and "Set-Cookie" not in response.headers
+        )
+
+    def _store(self, key: str, response: Response, versions: Dict[str, int]) -> None:
+        dynamic_tags = g.get("page_cache_tags", set()) - versions.keys()
+        versions = {**versions, **self.backend.tag_versions(dynamic_tags)}
+        body = response.get_data()
+        entry = {
+            "body": body,
+            "status": response.status_code,
+            "headers": [
+                (name, value) for name, value in response.headers.items()
+                if name.lower() not in _UNSTORED_HEADERS and not is_hop_by_hop_header(name)
+            ],
+            "tags": versions,
+            "meta": g.get("page_cache_meta", {}),
+        }
+        self.backend.set(key, entry, self.ttl, size=len(body))
+        self.stats.stores += 1
+
+    # Інвалідація
+
+    def invalidate(self, *tags: str) -> None:
+        """Робить неактуальними всі сторінки з вказаними тегами"""
+        if self.backend is None or not tags:
+            return
+        self.backend.bump_tags(tags)
+        self.stats.invalidations += len(tags)
+
+    def _on_post_changed(self, sender, post_id=None, slug=None, author_id=None,
+                         action=None, old_slug=None, **extra) -> None:
+        tags = [LISTING_TAG, post_tag(slug)]
+        if old_slug and old_slug != slug:
+            tags.append(post_tag(old_slug))
+        self.invalidate(*tags)
+
+    def _on_user_changed(self, sender, user_id=None, **extra) -> None:
+        self.invalidate(author_tag(user_id))
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = self.stats.as_dict()
+        if self.backend is not None:
+            stats["evictions"] = self.backend.stats.evictions
+        return stats
+
+
+# Глобальний кеш сторінок
+page_cache = PageCache()
+
+
+def init_page_cache(app: Flask) -> None:
+    """Ініціалізує кеш сторінок"""
+    page_cache.init_app(app)
@@ -0,0 +1,159 @@
+"""
+Курсорна (keyset) пагінація списків постів.
+
+Сторінка вибирається умовою (published_at, id) < (курсор) замість OFFSET,
+тому сторінка N коштує стільки ж, скільки перша. Курсори непрозорі
+(base64 від JSON), загальна кількість - наближена, з кешу з TTL.
+Старі посилання ?page=N без курсора відкриваються через OFFSET, а посилання
+на сусідні сторінки з них - уже курсори.
+"""
+import base64
+import json
+import threading
+import time
+from datetime import datetime
+from math import ceil
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import tuple_
+
+from platform_app.core.database import db
+from platform_app.core.listings import fetch_cards
+from platform_app.models.post import BlogPost
+
+# Скільки секунд зберігається кешована кількість записів
+COUNT_CACHE_TTL = 60.0
+
+_count_cache: Dict[str, Tuple[int, float]] = {}
+_count_lock = threading.Lock()
+
+
+def encode_cursor(published_at: datetime, post_id: int, page: int, direction: str) -> str:
+    """Кодує позицію в списку у непрозорий рядок"""
+    payload = json.dumps([published_at.isoformat(), post_id, page, direction], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[dict]:
+    """Розбирає курсор; повертає None для порожнього або пошкодженого значення"""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        published_at, post_id, page, direction = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ("next", "prev"):
+            return None
+        return {
+            "published_at": datetime.fromisoformat(published_at),
+            "id": int(post_id),
+            "page": max(int(page), 1),
+            "direction": direction,
+        }
+    except (ValueError, TypeError):
+        return None
+
+
+def cached_count(key: str, count_stmt, ttl: float = COUNT_CACHE_TTL) -> int:
+    """Виконує COUNT не частіше ніж раз на ttl секунд для кожного ключа"""
+    now = time.monotonic()
+    cached = _count_cache.get(key)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    total = db.session.execute(count_stmt).scalar() or 0
+    with _count_lock:
+        _count_cache[key] = (total, now + ttl)
+    return total
+
+
+def invalidate_counts() -> None:
+    """Скидає кеш кількостей (після створення або видалення постів)"""
+    with _count_lock:
+        _count_cache.clear()
+
+
+class KeysetPage:
+    """Сторінка результатів з курсорами на сусідні сторінки"""
+
+    def __init__(self, items: list, page: int, per_page: int, total: Optional[int],
+                 has_prev: bool, has_next: bool) -> None:
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.has_prev = has_prev and page > 1
+        self.has_next = has_next
+        self.prev_cursor = None
+        self.next_cursor = None
+        if items and self.has_prev:
+            first = items[0]
+            self.prev_cursor = encode_cursor(first.published_at, first.id, page - 1, "prev")
+        if items and self.has_next:
+            last = items[-1]
+            self.next_cursor = encode_cursor(last.published_at, last.id, page + 1, "next")
+
+    def __iter__(self):
+        return iter(self.items)
+
+    @property
+    def pages(self) -> int:
+        """Наближена кількість сторінок"""
+        if not self.total:
+            return 0
+        return ceil(self.total / self.per_page)
+
+
+def paginate_keyset(stmt, cursor: Optional[str], per_page: int,
+                    count_key: Optional[str] = None, count_stmt=None,
+                    page: Optional[int] = None) -> KeysetPage:
+    """
+    Повертає сторінку карток для SELECT з card_select().
+
+    Сортування - від нових до старих за (published_at, id).
+    Якщо передано count_key та count_stmt, total береться з кешу кількостей.
+    page - номер сторінки зі старого посилання ?page=N (лише без курсора).
+    """
+    position = decode_cursor(cursor)
+    key = tuple_(BlogPost.published_at, BlogPost.id)
+
+    if position is None and page and page > 1:
+        rows = fetch_cards(
+            stmt.order_by(BlogPost.published_at.desc(), BlogPost.id.desc())
+            .offset((page - 1) * per_page)
+            .limit(per_page + 1)
+        )
+        has_prev, has_next = True, len(rows) > per_page
+        rows = rows[:per_page]
+    elif position is None:
+        page = 1
+        rows = fetch_cards(
+            stmt.order_by(BlogPost.published_at.desc(), BlogPost.id.desc()).limit(per_page + 1)
+        )
+        has_prev, has_next = False, len(rows) > per_page
+        rows = rows[:per_page]
+    elif position["direction"] == "next":
+        page = position["page"]
+        rows = fetch_cards(
+            stmt.where(key < (position["published_at"], position["id"]))
+            .order_by(BlogPost.published_at.desc(), BlogPost.id.desc())
+            .limit(per_page + 1)
+        )
+        has_prev, has_next = True, len(rows) > per_page
+        rows = rows[:per_page]
+    else:
+        page = position["page"]
+        rows = fetch_cards(
+            stmt.where(key > (position["published_at"], position["id"]))
+            .order_by(BlogPost.published_at.asc(), BlogPost.id.asc())
+            .limit(per_page + 1)
+        )
+        has_prev, has_next = len(rows) > per_page, True
+        rows = list(reversed(rows[:per_page]))
+        if not has_prev:
+            page = 1
+
+    total = None
+    if count_key and count_stmt is not None:
+        total = cached_count(count_key, count_stmt)
+
+    return KeysetPage(rows, page, per_page, total, has_prev, has_next)
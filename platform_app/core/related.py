@@ -0,0 +1,594 @@
+"""
+Схожі пости: попередньо обчислені сусіди за косинусною подібністю.
+
+Вектор поста - хешований мішок слів (заголовок і теги з більшою вагою)
+з вагами TF-IDF, спроєктований знаковим хешуванням у DIMENSIONS вимірів і
+нормований. Повна перебудова (`flask related rebuild`):
+  1. один прохід по опублікованих постах - хешовані терми в масиви NumPy;
+  2. IDF за частотами термів, вектори блоками через np.bincount;
+  3. сферичний k-means на вибірці та кластер кожного поста;
+  4. сусіди кожного поста серед його кластера та PROBES найближчих -
+     блокове множення матриць (BLAS) і np.argpartition, без повного n x n;
+  5. списки сусідів (related_posts) та вектори (post_vectors) пакетами.
+
+Після створення чи редагування поста (сигнал post_changed) його сусіди
+шукаються серед постів найближчих кластерів, а сам пост додається в списки
+своїх сусідів; видалений пост прибирається зі списків у транзакції
+видалення. Сторінка поста читає список одним запитом по первинному
+ключу related_posts.
+"""
+import hashlib
+import os
+import re
+import time
+import zlib
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from flask import Flask
+from sqlalchemy import delete, func, insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from platform_app.ai.extractive import STEM_LENGTH, STOPWORDS
+from platform_app.core.database import db
+from platform_app.core.listings import PostCard, card_select, fetch_cards
+from platform_app.core.routing import replica_router
+from platform_app.core.signals import post_changed
+from platform_app.core.tags import parse_tags
+from platform_app.models.post import BlogPost
+from platform_app.models.related import PostVector, RelatedModel, RelatedPost
+
+MODEL_NAME = "default"
+
+# Хешування термів та проєкція
+HASH_BITS = 18
+HASH_SIZE = 1 << HASH_BITS
+DIMENSIONS = 256
+PROJECTIONS = 2  # позицій вектора на терм (менше шуму від колізій)
+PROJECTION_SEED = 20261018
+
+# Вага слів заголовка та тегів відносно слів тексту
+TITLE_WEIGHT = 3
+TAG_WEIGHT = 3
+
+# Текст поста враховується до MAX_CHARS символів, з нього - MAX_TERMS найчастіших термів
+MAX_CHARS = 3000
+MAX_TERMS = 64
+
+# Сусідів у списку та мінімальна подібність
+NEIGHBORS = 10
+MIN_SCORE = 0.05
+
+# Кластеризація: скільки найближчих кластерів переглядається при пошуку сусідів
+PROBES = 3
+MAX_CLUSTERS = 2048
+KMEANS_SAMPLE = 50000
+KMEANS_ITERATIONS = 8
+
+# Максимум елементів матриці подібності в одному блоці (пам'ять ~4 байти на елемент)
+BLOCK_ELEMENTS = 8_000_000
+
+_WORD_RE = re.compile(r"[^\W\d_]+(?:['’ʼ][^\W\d_]+)*", re.UNICODE)
+
+
+# Вектори
+
+def _words(text: str) -> Counter:
+    """Частоти основ слів; фільтр та обрізання застосовуються лише до унікальних слів"""
+    stems: Counter = Counter()
+    for word, count in Counter(_WORD_RE.findall(text.lower())).items():
+        if len(word) > 2 and word not in STOPWORDS:
+            stems[word[:STEM_LENGTH]] += count
+    return stems
+
+
+def _bucket(term: str) -> int:
+    """Стабільний між процесами хеш терму (hash() рандомізований)"""
+    return zlib.crc32(term.encode()) & (HASH_SIZE - 1)
+
+
+def _hashed_counts(title: str, content: str, tags: Optional[str],
+                   buckets: Optional[Dict[str, int]] = None) -> Dict[int, int]:
+    """{хеш терму: кількість} поста; buckets - кеш хешів на час перебудови"""
+    counts = _words(content[:MAX_CHARS])
+    for word, count in _words(title).items():
+        counts[word] += TITLE_WEIGHT * count
+    for tag in parse_tags(tags):
+        counts[f"#{tag}"] += TAG_WEIGHT
+
+    merged: Dict[int, int] = {}
+    for term, count in counts.most_common(MAX_TERMS):
+        if buckets is None:
+            bucket = _bucket(term)
+        else:
+            bucket = buckets.get(term)
+            if bucket is None:
+                bucket = buckets[term] = _bucket(term)
+        merged[bucket] = merged.get(bucket, 0) + count
+    return merged
+
+
+def term_counts(title: str, content: str, tags: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(хешовані терми, кількості) поста"""
+    merged = _hashed_counts(title, content, tags)
+    return (
+        np.fromiter(merged.keys(), dtype=np.int32, count=len(merged)),
+        np.fromiter(merged.values(), dtype=np.float32, count=len(merged)),
+    )
+
+
+def source_digest(title: str, content: str, tags: Optional[str]) -> str:
+    """Хеш даних, з яких будується вектор - щоб не перераховувати незмінений пост"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (title, content[:MAX_CHARS], tags or ""):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _projection() -> Tuple[np.ndarray, np.ndarray]:
+    """Позиції та знаки проєкції для кожного хешу (детерміновані)"""
+    rng = np.random.default_rng(PROJECTION_SEED)
+    positions = rng.integers(0, DIMENSIONS, size=(PROJECTIONS, HASH_SIZE), dtype=np.int64)
+    signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), size=(PROJECTIONS, HASH_SIZE))
+    return positions, signs / np.float32(np.sqrt(PROJECTIONS))
+
+
+def embed(rows: np.ndarray, buckets: np.ndarray, counts: np.ndarray, idf: np.ndarray,
+          n_rows: int) -> np.ndarray:
+    """Нормовані вектори n_rows документів з трійок (рядок, хеш, кількість)"""
+    positions, signs = _projection()
+    weights = (1.0 + np.log(counts)) * idf[buckets]
+    flat = rows.astype(np.int64) * DIMENSIONS
+    dense = np.zeros(n_rows * DIMENSIONS, dtype=np.float64)
+    for p in range(PROJECTIONS):
+        dense += np.bincount(
+            flat + positions[p][buckets], weights=weights * signs[p][buckets],
+            minlength=n_rows * DIMENSIONS,
+        )
+    vectors = dense.reshape(n_rows, DIMENSIONS).astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def compute_idf(buckets: np.ndarray, documents: int) -> np.ndarray:
+    """Згладжений IDF за кількістю документів з кожним хешем"""
+    df = np.bincount(buckets, minlength=HASH_SIZE)
+    return (np.log((1.0 + documents) / (1.0 + df)) + 1.0).astype(np.float32)
+
+
+# Кластери та сусіди
+
+def _top_columns(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """k найбільших значень кожного рядка (впорядковані за спаданням)"""
+    k = min(k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def nearest_clusters(vectors: np.ndarray, centroids: np.ndarray, probes: int = 1) -> np.ndarray:
+    """Індекси probes найближчих центроїдів для кожного вектора (блоками)"""
+    result = np.empty((len(vectors), min(probes, len(centroids))), dtype=np.int64)
+    block = max(1, BLOCK_ELEMENTS // len(centroids))
+    for start in range(0, len(vectors), block):
+        result[start:start + block] = _top_columns(vectors[start:start + block] @ centroids.T, probes)[0]
+    return result
+
+
+def kmeans(vectors: np.ndarray, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Сферичний k-means на вибірці; повертає нормовані центроїди"""
+    sample = vectors[rng.choice(len(vectors), size=min(len(vectors), KMEANS_SAMPLE), replace=False)]
+    centroids = sample[rng.choice(len(sample), size=clusters, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        labels = nearest_clusters(sample, centroids)[:, 0]
+        order = np.argsort(labels, kind="stable")
+        sorted_labels = labels[order]
+        starts = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]])
+        sums = np.add.reduceat(sample[order], starts, axis=0)
+        # Порожні кластери зберігають попередній центроїд
+        centroids[sorted_labels[starts]] = sums / np.maximum(
+            np.linalg.norm(sums, axis=1, keepdims=True), 1e-12
+        )
+    return centroids
+
+
+def cluster_count(documents: int) -> int:
+    return int(min(MAX_CLUSTERS, max(1, np.sqrt(documents))))
+
+
+def all_neighbors(vectors: np.ndarray, labels: np.ndarray, centroids: np.ndarray,
+                  k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Сусіди кожного вектора: кандидати - пости кластера та PROBES-1 найближчих
+    до нього кластерів. Повертає (індекси (n, k), подібності (n, k)); -1 - немає.
+    """
+    n = len(vectors)
+    neighbor_ids = np.full((n, k), -1, dtype=np.int64)
+    neighbor_scores = np.zeros((n, k), dtype=np.float32)
+
+    order = np.argsort(labels, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=len(centroids)))))
+    near = _top_columns(centroids @ centroids.T, PROBES)[0]
+
+    for cluster in range(len(centroids)):
+        members = order[bounds[cluster]:bounds[cluster + 1]]
+        if not len(members):
+            continue
+        # Пости самого кластера - першими: позиція запиту в пулі = його позиція в members
+        others = [c for c in near[cluster] if c != cluster][:PROBES - 1]
+        pool = np.concatenate([members] + [order[bounds[c]:bounds[c + 1]] for c in others])
+        take = min(k, len(pool) - 1)
+        if take <= 0:
+            continue
+        pool_vectors = vectors[pool]
+        block = max(1, BLOCK_ELEMENTS // len(pool))
+        for start in range(0, len(members), block):
+            queries = members[start:start + block]
+            scores = vectors[queries] @ pool_vectors.T
+            own = np.arange(len(queries))
+            scores[own, start + own] = -np.inf
+            top, top_scores = _top_columns(scores, take)
+            neighbor_ids[queries, :take] = pool[top]
+            neighbor_scores[queries, :take] = top_scores
+
+    neighbor_ids[neighbor_scores < MIN_SCORE] = -1
+    return neighbor_ids, neighbor_scores
+
+
+# Запис списків
+
+def _replace_lists(lists: Dict[int, Sequence[Tuple[int, float]]], now: datetime) -> None:
+    """Замінює списки сусідів вказаних постів"""
+    if not lists:
+        return
+    table = RelatedPost.__table__
+    db.session.execute(delete(table).where(table.c.post_id.in_(list(lists))))
+    rows = [
+        {"post_id": post_id, "rank": rank, "related_id": related_id, "score": float(score),
+         "computed_at": now}
+        for post_id, entries in lists.items()
+        for rank, (related_id, score) in enumerate(entries)
+    ]
+    if rows:
+        db.session.execute(insert(table), rows)
+
+
+def _replace_vectors(rows: List[Dict]) -> None:
+    if not rows:
+        return
+    table = PostVector.__table__
+    db.session.execute(delete(table).where(table.c.post_id.in_([row["post_id"] for row in rows])))
+    db.session.execute(insert(table), rows)
+
+
+def _load_lists(post_ids: Sequence[int]) -> Dict[int, List[Tuple[int, float]]]:
+    lists: Dict[int, List[Tuple[int, float]]] = {post_id: [] for post_id in post_ids}
+    if post_ids:
+        for row in db.session.execute(
+            db.select(RelatedPost.post_id, RelatedPost.related_id, RelatedPost.score)
+            .where(RelatedPost.post_id.in_(list(post_ids)))
+            .order_by(RelatedPost.post_id, RelatedPost.rank)
+        ):
+            lists[row.post_id].append((row.related_id, row.score))
+    return lists
+
+
+# Повна перебудова
+
+# Кеш хешів термів на час перебудови (окремий у кожному процесі-виконавці)
+_vocabulary: Dict[str, int] = {}
+
+
+def _batch_terms(rows: Sequence[Tuple[str, str, Optional[str]]]):
+    """Дайджести та хешовані терми пакета постів (виконується і в дочірніх процесах)"""
+    digests: List[str] = []
+    lengths, buckets, counts = array("i"), array("i"), array("f")
+    for title, content, tags in rows:
+        merged = _hashed_counts(title, content, tags, _vocabulary)
+        digests.append(source_digest(title, content, tags))
+        lengths.append(len(merged))
+        buckets.extend(merged.keys())
+        counts.extend(merged.values())
+    return digests, lengths, buckets, counts
+
+
+def _collect(batch_size: int, workers: int, report: Callable[[str], None]):
+    """
+    Один прохід по опублікованих постах: id, дайджести та хешовані терми (CSR).
+    Токенізація - найдорожчий етап, тому пакети розподіляються між workers процесами.
+    """
+    post_ids: List[int] = []
+    digests: List[str] = []
+    lengths = array("i")
+    all_buckets = array("i")
+    all_counts = array("f")
+
+    def add(ids: List[int], terms) -> None:
+        post_ids.extend(ids)
+        digests.extend(terms[0])
+        lengths.extend(terms[1])
+        all_buckets.extend(terms[2])
+        all_counts.extend(terms[3])
+        if len(post_ids) // (batch_size * 10) != (len(post_ids) - len(ids)) // (batch_size * 10):
+            report(f"  терми: {len(post_ids)} постів")
+
+    result = db.session.execute(
+        db.select(
+            BlogPost.id, BlogPost.title, func.substr(BlogPost.content, 1, MAX_CHARS).label("content"),
+            BlogPost.tags,
+        )
+        .where(BlogPost.is_published == True)
+        .order_by(BlogPost.id)
+        .execution_options(yield_per=batch_size)
+    )
+    batches = (
+        ([row.id for row in part], [(row.title, row.content, row.tags) for row in part])
+        for part in result.partitions()
+    )
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Обмежена кількість пакетів у черзі - пам'ять не залежить від розміру таблиці
+            pending: Deque = deque()
+            for ids, rows in batches:
+                pending.append((ids, pool.submit(_batch_terms, rows)))
+                if len(pending) >= workers * 2:
+                    ids, future = pending.popleft()
+                    add(ids, future.result())
+            for ids, future in pending:
+                add(ids, future.result())
+    else:
+        for ids, rows in batches:
+            add(ids, _batch_terms(rows))
+    _vocabulary.clear()
+
+    rows = np.repeat(np.arange(len(post_ids), dtype=np.int32), np.frombuffer(lengths, dtype=np.int32))
+    buckets = np.frombuffer(all_buckets, dtype=np.int32)
+    counts = np.frombuffer(all_counts, dtype=np.float32)
+    return np.array(post_ids, dtype=np.int64), digests, rows, buckets, counts
+
+
+@replica_router.primary()
+def rebuild_related(neighbors: int = NEIGHBORS, batch_size: int = 2000, workers: Optional[int] = None,
+                    seed: int = 0, report: Callable[[str], None] = lambda message: None) -> Dict[str, float]:
+    """
+    Перебудовує вектори, кластери та списки сусідів усіх опублікованих постів.
+    workers - процесів для токенізації (за замовчуванням - кількість CPU, до 8).
+    """
+    if workers is None:
+        workers = min(os.cpu_count() or 1, 8)
+    from platform_app.core.page_cache import RELATED_TAG, page_cache
+
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    post_ids, digests, rows, buckets, counts = _collect(batch_size, workers, report)
+    n = len(post_ids)
+    timings["terms"] = time.perf_counter() - started
+    report(f"Терми: {n} постів за {timings['terms']:.1f} с")
+
+    started = time.perf_counter()
+    idf = compute_idf(buckets, n)
+    vectors = np.empty((n, DIMENSIONS), dtype=np.float32)
+    # Межі блоків у масивах CSR: рядки відсортовані, тож блок документів - суцільний діапазон
+    bounds = np.searchsorted(rows, np.arange(0, n + batch_size * 10, batch_size * 10))
+    for i, start in enumerate(range(0, n, batch_size * 10)):
+        lo, hi = bounds[i], bounds[i + 1]
+        size = min(batch_size * 10, n - start)
+        vectors[start:start + size] = embed(rows[lo:hi] - start, buckets[lo:hi], counts[lo:hi], idf, size)
+    del rows, buckets, counts
+    timings["vectors"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    centroids = kmeans(vectors, cluster_count(n), rng) if n else np.zeros((1, DIMENSIONS), np.float32)
+    labels = nearest_clusters(vectors, centroids)[:, 0] if n else np.zeros(0, dtype=np.int64)
+    timings["clusters"] = time.perf_counter() - started
+    report(f"Кластери: {len(centroids)} за {timings['clusters']:.1f} с")
+
+    started = time.perf_counter()
+    neighbor_ids, neighbor_scores = all_neighbors(vectors, labels, centroids, neighbors)
+    timings["neighbors"] = time.perf_counter() - started
+    report(f"Сусіди: {timings['neighbors']:.1f} с")
+
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    vectors16 = vectors.astype(np.float16)
+    for start in range(0, n, batch_size):
+        end = min(start + batch_size, n)
+        lists = {}
+        for i in range(start, end):
+            valid = neighbor_ids[i] >= 0
+            lists[int(post_ids[i])] = list(zip(
+                post_ids[neighbor_ids[i][valid]].tolist(), neighbor_scores[i][valid].tolist()
+            ))
+        _replace_lists(lists, now)
+        _replace_vectors([
+            {"post_id": int(post_ids[i]), "cluster": int(labels[i]), "digest": digests[i],
+             "vector": vectors16[i].tobytes()}
+            for i in range(start, end)
+        ])
+        db.session.commit()
+
+    # Пости, що більше не опубліковані або видалені
+    published = db.select(BlogPost.id).where(BlogPost.is_published == True)
+    stale = [
+        delete(RelatedPost).where(RelatedPost.computed_at < now),
+        delete(RelatedPost).where(RelatedPost.related_id.not_in(published)),
+        delete(PostVector).where(PostVector.post_id.not_in(published)),
+    ]
+    for statement in stale:
+        db.session.execute(statement, execution_options={"synchronize_session": False})
+
+    db.session.execute(delete(RelatedModel).where(RelatedModel.name == MODEL_NAME))
+    db.session.add(RelatedModel(
+        name=MODEL_NAME, dimensions=DIMENSIONS, documents=n, idf=idf.tobytes(),
+        centroids=centroids.astype(np.float32).tobytes(), built_at=now,
+    ))
+    db.session.commit()
+    timings["write"] = time.perf_counter() - started
+
+    page_cache.invalidate(RELATED_TAG)
+    return timings
+
+
+# Інкрементні оновлення
+
+# Параметри моделі в пам'яті процесу: (built_at, idf, centroids)
+_model_cache: Optional[Tuple[datetime, np.ndarray, np.ndarray]] = None
+
+
+def _load_model() -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """IDF та центроїди (перечитуються лише після нової перебудови)"""
+    global _model_cache
+    built_at = db.session.execute(
+        db.select(RelatedModel.built_at).where(RelatedModel.name == MODEL_NAME)
+    ).scalar()
+    if built_at is None:
+        return None
+    if _model_cache is None or _model_cache[0] != built_at:
+        model = db.session.get(RelatedModel, MODEL_NAME)
+        _model_cache = (
+            built_at,
+            np.frombuffer(model.idf, dtype=np.float32),
+            np.frombuffer(model.centroids, dtype=np.float32).reshape(-1, model.dimensions),
+        )
+    return _model_cache[1], _model_cache[2]
+
+
+def _update_membership(post_id: int, similarity: Dict[int, float], extra: Sequence[int],
+                     now: datetime) -> List[int]:
+    """
+    Оновлює місце post_id у списках інших постів: прибирає його зі списків, що
+    його містять, і додає (з новою подібністю) туди, де він входить у топ.
+    """
+    containing = db.session.execute(
+        db.select(RelatedPost.post_id).where(RelatedPost.related_id == post_id)
+    ).scalars().all()
+    owners = sorted(set(containing) | set(extra))
+    changed = {}
+    for owner, entries in _load_lists(owners).items():
+        updated = [(related_id, score) for related_id, score in entries if related_id != post_id]
+        score = similarity.get(owner)
+        if score is not None and score >= MIN_SCORE:
+            updated.append((post_id, score))
+        updated = sorted(updated, key=lambda entry: -entry[1])[:NEIGHBORS]
+        if updated != entries:
+            changed[owner] = updated
+    _replace_lists(changed, now)
+    return list(changed)
+
+
+@replica_router.primary()
+def update_post(post_id: int) -> List[int]:
+    """
+    Перераховує вектор і сусідів поста в поточній транзакції.
+    Повертає id постів, чиї списки сусідів змінилися.
+    """
+    model = _load_model()
+    if model is None:
+        return []
+    idf, centroids = model
+
+    row = db.session.execute(
+        db.select(
+            BlogPost.id, BlogPost.title, func.substr(BlogPost.content, 1, MAX_CHARS).label("content"),
+            BlogPost.tags, BlogPost.is_published,
+        ).where(BlogPost.id == post_id)
+    ).first()
+    if row is None or not row.is_published:
+        return remove_post(post_id)
+
+    digest = source_digest(row.title, row.content, row.tags)
+    stored = db.session.execute(
+        db.select(PostVector.digest).where(PostVector.post_id == post_id)
+    ).scalar()
+    if stored == digest:
+        return []
+
+    buckets, counts = term_counts(row.title, row.content, row.tags)
+    vector = embed(np.zeros(len(buckets), dtype=np.int64), buckets, counts, idf, 1)[0]
+    probes = _top_columns((centroids @ vector)[None, :], PROBES)[0][0]
+
+    candidates = db.session.execute(
+        db.select(PostVector.post_id, PostVector.vector)
+        .where(PostVector.cluster.in_(probes.tolist()), PostVector.post_id != post_id)
+    ).all()
+    similarity: Dict[int, float] = {}
+    entries: List[Tuple[int, float]] = []
+    if candidates:
+        ids = np.array([c.post_id for c in candidates], dtype=np.int64)
+        matrix = np.frombuffer(b"".join(c.vector for c in candidates), dtype=np.float16)
+        scores = matrix.reshape(len(candidates), -1).astype(np.float32) @ vector
+        similarity = dict(zip(ids.tolist(), scores.tolist()))
+        top, top_scores = _top_columns(scores[None, :], NEIGHBORS)
+        entries = [
+            (int(ids[i]), float(s)) for i, s in zip(top[0], top_scores[0]) if s >= MIN_SCORE
+        ]
+
+    now = datetime.utcnow()
+    _replace_vectors([{
+        "post_id": post_id, "cluster": int(probes[0]), "digest": digest,
+        "vector": vector.astype(np.float16).tobytes(),
+    }])
+    _replace_lists({post_id: entries}, now)
+    changed = _update_membership(post_id, similarity, [related_id for related_id, _ in entries], now)
+    return [post_id] + changed
+
+
+@replica_router.primary()
+def remove_post(post_id: int) -> List[int]:
+    """Прибирає пост з індексу та зі списків інших постів (у поточній транзакції)"""
+    now = datetime.utcnow()
+    db.session.execute(delete(PostVector).where(PostVector.post_id == post_id))
+    db.session.execute(delete(RelatedPost).where(RelatedPost.post_id == post_id))
+    return _update_membership(post_id, {}, [], now)
+
+
+# Читання
+
+def related_cards(post_id: int, limit: int) -> List[PostCard]:
+    """Картки схожих постів (один запит по первинному ключу related_posts)"""
+    return fetch_cards(
+        card_select()
+        .join(RelatedPost, RelatedPost.related_id == BlogPost.id)
+        .where(RelatedPost.post_id == post_id, BlogPost.is_published == True)
+        .order_by(RelatedPost.rank)
+        .limit(limit)
+    )
+
+
+# Сигнали
+
+def _on_post_changed(sender, post_id=None, action=None, related_changed=(), **extra) -> None:
+    from platform_app.core.page_cache import page_cache, post_tag
+
+    if action == "deleted":
+        # Рядки вже прибрано в транзакції видалення (remove_post)
+        changed = list(related_changed)
+    else:
+        try:
+            changed = update_post(post_id)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            print(f"Related posts update error (post {post_id}): {e}")
+            return
+
+    others = [other for other in changed if other != post_id]
+    if others:
+        slugs = db.session.execute(
+            db.select(BlogPost.slug).where(BlogPost.id.in_(others))
+        ).scalars().all()
+        page_cache.invalidate(*(post_tag(slug) for slug in slugs))
+
+
+def init_related(app: Flask) -> None:
+    """Підключає інкрементне оновлення схожих постів до змін постів"""
+    post_changed.connect(_on_post_changed, weak=False)
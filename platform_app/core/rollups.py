@@ -0,0 +1,329 @@
+"""
+Зведені лічильники для глобальної статистики.
+
+Таблиці platform_counters, author_stats і top_posts оновлюються інкрементально
+в тих самих транзакціях, що й зміни даних (створення/видалення поста,
+реєстрація, запис переглядів). Міграція 0002 заповнює їх уперше, а
+команда `flask rollups rebuild` і періодична звірка (в одному воркері, що
+тримає оренду) перераховують їх з базових таблиць.
+Сторінка глобальної статистики лише читає ці невеликі таблиці.
+"""
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import Flask
+from sqlalchemy import delete, func, update
+
+from platform_app.core.database import db, dialect_insert
+from platform_app.core.listings import PostCard, card_select, fetch_cards
+from platform_app.core.routing import replica_router
+from platform_app.models.post import BlogPost
+from platform_app.models.rollups import AuthorStats, PlatformCounter, TopPost
+from platform_app.models.user import UserAccount
+
+# Скільки кандидатів у популярні пости зберігається (показується 10)
+TOP_POSTS_CAPACITY = 50
+
+COUNTER_USERS = "users"
+COUNTER_POSTS = "posts"
+COUNTER_VIEWS = "views"
+COUNTER_AI_POSTS = "ai_posts"
+COUNTERS = (COUNTER_USERS, COUNTER_POSTS, COUNTER_VIEWS, COUNTER_AI_POSTS)
+
+# Рядок platform_counters з часом закінчення оренди звірки (unix-секунди)
+RECONCILE_LEASE = "lease:rollup_reconcile"
+
+
+# Інкрементальні оновлення (викликаються до commit)
+
+def _add_counters(**deltas: int) -> None:
+    params = [{"counter": name, "delta": delta} for name, delta in deltas.items() if delta]
+    if not params:
+        return
+    table = PlatformCounter.__table__
+    db.session.execute(
+        update(table)
+        .where(table.c.name == db.bindparam("counter"))
+        .values(value=table.c.value + db.bindparam("delta")),
+        params,
+    )
+
+
+def _add_author_stats(author_id: int, posts: int = 0, views: int = 0) -> None:
+    if not posts and not views:
+        return
+    stmt = dialect_insert(AuthorStats.__table__).values(
+        author_id=author_id, post_count=posts, view_count=views
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["author_id"],
+        set_={
+            "post_count": AuthorStats.__table__.c.post_count + posts,
+            "view_count": AuthorStats.__table__.c.view_count + views,
+        },
+    )
+    db.session.execute(stmt)
+
+
+def user_created() -> None:
+    """Новий користувач"""
+    _add_counters(**{COUNTER_USERS: 1})
+
+
+def post_created(post: BlogPost) -> None:
+    """Новий пост"""
+    if not post.is_published:
+        return
+    _add_counters(**{COUNTER_POSTS: 1, COUNTER_AI_POSTS: int(bool(post.ai_generated))})
+    _add_author_stats(post.author_id, posts=1)
+    _offer_top_posts([(post.id, post.view_count or 0)])
+
+
+def post_deleted(post: BlogPost) -> None:
+    """Пост видаляється (викликати до db.session.delete)"""
+    views = post.view_count or 0
+    if post.is_published:
+        _add_counters(**{
+            COUNTER_POSTS: -1,
+            COUNTER_VIEWS: -views,
+            COUNTER_AI_POSTS: -int(bool(post.ai_generated)),
+        })
+        _add_author_stats(post.author_id, posts=-1, views=-views)
+    else:
+        _add_counters(**{COUNTER_VIEWS: -views})
+    db.session.execute(delete(TopPost).where(TopPost.post_id == post.id))
+
+
+def ai_posts_changed(delta: int) -> None:
+    """Змінилася кількість опублікованих постів з ШІ-резюме"""
+    _add_counters(**{COUNTER_AI_POSTS: delta})
+
+
+@replica_router.primary()
+def views_added(batch: Dict[int, int]) -> None:
+    """Перегляди, щойно записані лічильником (викликається з ViewCounter.flush)"""
+    rows = db.session.execute(
+        db.select(BlogPost.id, BlogPost.author_id, BlogPost.view_count, BlogPost.is_published)
+        .where(BlogPost.id.in_(list(batch)))
+    ).all()
+    if not rows:
+        return
+
+    _add_counters(**{COUNTER_VIEWS: sum(batch[row.id] for row in rows)})
+
+    per_author: Dict[int, int] = {}
+    for row in rows:
+        if row.is_published:
+            per_author[row.author_id] = per_author.get(row.author_id, 0) + batch[row.id]
+    for author_id, views in sorted(per_author.items()):
+        _add_author_stats(author_id, views=views)
+
+    _offer_top_posts((row.id, row.view_count) for row in rows if row.is_published)
+
+
+def _offer_top_posts(candidates: Iterable[Tuple[int, int]]) -> None:
+    """Оновлює таблицю top_posts, зберігаючи не більше TOP_POSTS_CAPACITY рядків"""
+    current = dict(db.session.execute(db.select(TopPost.post_id, TopPost.view_count)).all())
+    merged = dict(current)
+    merged.update(candidates)
+
+    keep = dict(sorted(merged.items(), key=lambda item: (-item[1], item[0]))[:TOP_POSTS_CAPACITY])
+
+    removed = [post_id for post_id in current if post_id not in keep]
+    if removed:
+        db.session.execute(delete(TopPost).where(TopPost.post_id.in_(removed)))
+
+    changed = [
+        {"post_id": post_id, "view_count": views}
+        for post_id, views in keep.items()
+        if current.get(post_id) != views
+    ]
+    if changed:
+        stmt = dialect_insert(TopPost.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["post_id"], set_={"view_count": stmt.excluded.view_count}
+        )
+        db.session.execute(stmt, changed)
+
+
+# Повний перерахунок
+
+def compute_totals() -> Dict[str, int]:
+    """Загальні лічильники, пораховані з blog_posts та user_accounts (лише читання)"""
+    published = BlogPost.is_published == True
+    totals = {
+        COUNTER_USERS: db.session.execute(db.select(func.count(UserAccount.id))).scalar() or 0,
+        COUNTER_POSTS: db.session.execute(
+            db.select(func.count(BlogPost.id)).where(published)
+        ).scalar() or 0,
+        COUNTER_VIEWS: db.session.execute(
+            db.select(func.coalesce(func.sum(BlogPost.view_count), 0))
+        ).scalar() or 0,
+        COUNTER_AI_POSTS: db.session.execute(
+            db.select(func.count(BlogPost.id)).where(published, BlogPost.ai_generated == True)
+        ).scalar() or 0,
+    }
+    return {name: int(value) for name, value in totals.items()}
+
+
+@replica_router.primary()
+def rebuild_rollups() -> Dict[str, int]:
+    """Перераховує всі зведені таблиці з blog_posts та user_accounts"""
+    published = BlogPost.is_published == True
+    totals = compute_totals()
+
+    stmt = dialect_insert(PlatformCounter.__table__)
+    stmt = stmt.on_conflict_do_update(index_elements=["name"], set_={"value": stmt.excluded.value})
+    db.session.execute(stmt, [{"name": name, "value": value} for name, value in totals.items()])
+
+    db.session.execute(delete(AuthorStats))
+    db.session.execute(
+        AuthorStats.__table__.insert().from_select(
+            ["author_id", "post_count", "view_count"],
+            db.select(
+                BlogPost.author_id,
+                func.count(BlogPost.id),
+                func.coalesce(func.sum(BlogPost.view_count), 0),
+            )
+            .where(published)
+            .group_by(BlogPost.author_id),
+        )
+    )
+
+    db.session.execute(delete(TopPost))
+    db.session.execute(
+        TopPost.__table__.insert().from_select(
+            ["post_id", "view_count"],
+            db.select(BlogPost.id, BlogPost.view_count)
+            .where(published)
+            .order_by(BlogPost.view_count.desc(), BlogPost.id)
+            .limit(TOP_POSTS_CAPACITY),
+        )
+    )
+
+    db.session.commit()
+    return totals
+
+
+def acquire_lease(name: str, seconds: float) -> bool:
+    """
+    Захоплює оренду в platform_counters (value - час закінчення) на seconds.
+    Умовний UPDATE атомарний: з кількох воркерів оренду отримує лише один.
+    """
+    now = int(time.time())
+    table = PlatformCounter.__table__
+    db.session.execute(
+        dialect_insert(table).values(name=name, value=0).on_conflict_do_nothing(index_elements=["name"])
+    )
+    result = db.session.execute(
+        update(table)
+        .where(table.c.name == name, table.c.value <= now)
+        .values(value=now + max(int(seconds), 1))
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+# Читання
+
+def platform_totals() -> Dict[str, int]:
+    """Загальні лічильники платформи (один запит по первинному ключу)"""
+    values = dict(db.session.execute(
+        db.select(PlatformCounter.name, PlatformCounter.value)
+        .where(PlatformCounter.name.in_(COUNTERS))
+    ).all())
+    if len(values) < len(COUNTERS):
+        # Таблиці не заповнені: рахуємо без запису (заповнює `flask rollups rebuild`)
+        return compute_totals()
+    return {name: int(values[name]) for name in COUNTERS}
+
+
+def popular_cards(limit: int = 10) -> List[PostCard]:
+    """Картки найпопулярніших постів (з таблиці top_posts)"""
+    return fetch_cards(
+        card_select()
+        .join(TopPost, TopPost.post_id == BlogPost.id)
+        .where(BlogPost.is_published == True)
+        .order_by(TopPost.view_count.desc(), TopPost.post_id)
+        .limit(limit)
+    )
+
+
+def active_authors(limit: int = 10) -> list:
+    """(UserAccount, post_count, total_views) авторів з найбільшою кількістю постів"""
+    return (
+        db.session.query(UserAccount, AuthorStats.post_count, AuthorStats.view_count)
+        .join(AuthorStats, AuthorStats.author_id == UserAccount.id)
+        .filter(AuthorStats.post_count > 0)
+        .order_by(AuthorStats.post_count.desc(), UserAccount.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def author_totals(author_id: int) -> Tuple[int, int]:
+    """(кількість опублікованих постів, перегляди) автора"""
+    row = db.session.execute(
+        db.select(AuthorStats.post_count, AuthorStats.view_count)
+        .where(AuthorStats.author_id == author_id)
+    ).first()
+    return (row.post_count, int(row.view_count)) if row else (0, 0)
+
+
+class RollupReconciler:
+    """
+    Фонова періодична звірка зведених таблиць.
+    Потік є в кожному воркері, але перераховує лише той, хто захопив оренду
+    RECONCILE_LEASE на interval секунд - один перерахунок за інтервал.
+    """
+
+    def __init__(self) -> None:
+        self._app: Optional[Flask] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.interval = 0.0
+
+    def init_app(self, app: Flask) -> None:
+        self._app = app
+        self.interval = app.config.get("ROLLUP_RECONCILE_INTERVAL", 0.0)
+
+    def start(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name="rollup-reconcile", daemon=True).start()
+
+    def stop(self) -> None:
+        """Зупиняє фоновий потік (після поточної ітерації)"""
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                with self._app.app_context():
+                    if acquire_lease(RECONCILE_LEASE, self.interval):
+                        rebuild_rollups()
+            except Exception as e:
+                print(f"Rollup reconcile error: {e}")
+
+
+# Глобальний виконавець звірки
+rollup_reconciler = RollupReconciler()
+
+
+def init_rollups(app: Flask) -> None:
+    """Підключає оновлення зведених таблиць до лічильника переглядів і запускає звірку"""
+    from platform_app.core.view_counter import view_counter
+
+    view_counter.on_flush(views_added)
+    rollup_reconciler.init_app(app)
+
+    @app.before_request
+    def _start_rollup_reconciler() -> None:
+        rollup_reconciler.start()
@@ -0,0 +1,233 @@
+"""
+Маршрутизація читань на репліки БД.
+
+Репліки задаються SQLALCHEMY_REPLICA_URLS (через кому) і реєструються як
+binds replica_0, replica_1... Flask-SQLAlchemy. View, позначені
+@replica_router.replica_reads, виконують SELECT на репліці; усе інше -
+записи, читання в інших view, фонові потоки та CLI - іде на основну БД.
+
+Узгодженість:
+  - після першого запису в межах запиту всі наступні запити йдуть на основну БД;
+  - після запиту з записом сесія користувача REPLICA_STICKY_SECONDS читає з
+    основної БД (read-your-writes: редирект на щойно створений пост);
+  - репліка з помилкою з'єднання виключається на REPLICA_RETRY_INTERVAL секунд,
+    а view, що впав на ній, один раз повторюється на основній БД;
+  - читання, за якими йде запис (перерахунки, read-modify-write), виконуються
+    в блоці `with replica_router.primary():` або з execution_options(primary=True).
+"""
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional
+
+from flask import Flask, current_app, g, has_request_context, session
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.sql.elements import TextClause
+
+REPLICA_BIND_PREFIX = "replica_"
+
+# Ключ у сесії Flask: до якого часу читати з основної БД
+STICKY_SESSION_KEY = "_db_primary_until"
+
+# Execution option оператора, що має виконатися на основній БД
+PRIMARY_OPTION = "primary"
+
+
+def replica_binds(urls: Optional[str]) -> Dict[str, str]:
+    """SQLALCHEMY_BINDS для списку URL реплік через кому"""
+    from platform_app.core.config import normalize_database_url
+
+    return {
+        f"{REPLICA_BIND_PREFIX}{i}": normalize_database_url(url.strip())
+        for i, url in enumerate(part for part in (urls or "").split(",") if part.strip())
+    }
+
+
+def _is_read(clause) -> bool:
+    """Чи є оператор читанням, яке можна виконати на репліці"""
+    if clause is None:
+        return False
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip()[:6].upper() == "SELECT"
+    return bool(getattr(clause, "is_select", False))
+
+
+def _is_write(clause) -> bool:
+    if clause is None:
+        return False
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip()[:6].upper() != "SELECT"
+    return bool(getattr(clause, "is_dml", False))
+
+
+class ReplicaRouter:
+    """Вибір engine для запитів сесії та стан здоров'я реплік"""
+
+    def __init__(self) -> None:
+        self.bind_keys: List[str] = []
+        self.sticky_seconds = 5.0
+        self.retry_interval = 30.0
+        self._down_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._round_robin = itertools.count()
+        self.stats = {"replica_reads": 0, "primary_fallbacks": 0, "failures": 0, "retries": 0}
+
+    def init_app(self, app: Flask) -> None:
+        self.bind_keys = sorted(
+            key for key in (app.config.get("SQLALCHEMY_BINDS") or {})
+            if key.startswith(REPLICA_BIND_PREFIX)
+        )
+        self.sticky_seconds = app.config.get("REPLICA_STICKY_SECONDS", self.sticky_seconds)
+        self.retry_interval = app.config.get("REPLICA_RETRY_INTERVAL", self.retry_interval)
+        if not self.bind_keys:
+            return
+
+        with app.app_context():
+            engines = app.extensions["sqlalchemy"].engines
+            for key in self.bind_keys:
+                event.listen(engines[key], "handle_error", self._error_handler(key))
+
+        app.after_request(self._remember_write)
+
+    # Вибір engine
+
+    def route(self, session, clause) -> Optional[str]:
+        """Ключ bind репліки для оператора або None (основна БД)"""
+        if not has_request_context():
+            return None
+        if session._flushing or _is_write(clause):
+            g._db_wrote = True
+            return None
+        if (
+            not self.bind_keys
+            or not g.get("_db_replica_route")
+            or g.get("_db_primary")
+            or g.get("_db_wrote")
+            or not _is_read(clause)
+            or clause.get_execution_options().get(PRIMARY_OPTION)
+            or self._sticky()
+        ):
+            return None
+
+        key = g.get("_db_replica")
+        if key is None:
+            key = g._db_replica = self._choose() or ""
+            if key:
+                self.stats["replica_reads"] += 1
+            else:
+                self.stats["primary_fallbacks"] += 1
+        return key or None
+
+    @contextmanager
+    def primary(self):
+        """
+        Усі оператори блоку - на основній БД, навіть у view з @replica_reads.
+        Для читань, результат яких записується (репліка може відставати).
+        Працює і як декоратор: @replica_router.primary().
+        """
+        if not has_request_context():
+            yield
+            return
+        previous = g.get("_db_primary", False)
+        g._db_primary = True
+        try:
+            yield
+        finally:
+            g._db_primary = previous
+
+    def _choose(self) -> Optional[str]:
+        now = time.monotonic()
+        healthy = [key for key in self.bind_keys if self._down_until.get(key, 0) <= now]
+        if not healthy:
+            return None
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    def _sticky(self) -> bool:
+        sticky = g.get("_db_sticky")
+        if sticky is None:
+            until = session.get(STICKY_SESSION_KEY)
+            sticky = g._db_sticky = bool(until and until > time.time())
+        return sticky
+
+    def _remember_write(self, response):
+        if g.get("_db_wrote"):
+            session[STICKY_SESSION_KEY] = time.time() + self.sticky_seconds
+        elif STICKY_SESSION_KEY in session and not self._sticky():
+            session.pop(STICKY_SESSION_KEY)
+        return response
+
+    # Здоров'я реплік
+
+    def mark_down(self, key: str, reason: str) -> None:
+        with self._lock:
+            already_down = self._down_until.get(key, 0) > time.monotonic()
+            self._down_until[key] = time.monotonic() + self.retry_interval
+            self.stats["failures"] += 1
+        if not already_down:
+            print(f"Replica {key} unavailable for {self.retry_interval:.0f} s: {reason}")
+
+    def is_down(self, key: str) -> bool:
+        return self._down_until.get(key, 0) > time.monotonic()
+
+    def _error_handler(self, key: str):
+        def handle_error(context) -> None:
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+                self.mark_down(key, str(context.original_exception).splitlines()[0])
+        return handle_error
+
+    def probe(self, key: str) -> Dict:
+        """Перевіряє репліку (для CLI): затримка SELECT 1 та відставання на PostgreSQL"""
+        engine = current_app.extensions["sqlalchemy"].engines[key]
+        started = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                lag = None
+                if engine.dialect.name == "postgresql":
+                    lag = conn.execute(text(
+                        "SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+                    )).scalar()
+        except DBAPIError as e:
+            return {"ok": False, "error": str(e.orig).splitlines()[0]}
+        return {
+            "ok": True,
+            "latency_ms": (time.perf_counter() - started) * 1000,
+            "lag_seconds": float(lag) if lag is not None else None,
+        }
+
+    # Декоратор
+
+    def replica_reads(self, view):
+        """View лише читає: SELECT виконуються на репліці (з поверненням на основну БД)"""
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g._db_replica_route = True
+            try:
+                return view(*args, **kwargs)
+            except DBAPIError:
+                key = g.get("_db_replica")
+                if not key or g.get("_db_wrote"):
+                    raise
+                # Репліка відмовила посеред запиту - повторюємо view на основній БД
+                from platform_app.core.database import db
+
+                db.session.rollback()
+                self.mark_down(key, "error during request")
+                self.stats["retries"] += 1
+                g._db_replica = ""
+                return view(*args, **kwargs)
+
+        return wrapper
+
+
+# Глобальний маршрутизатор
+replica_router = ReplicaRouter()
+
+
+def init_replica_routing(app: Flask) -> None:
+    """Підключає маршрутизацію читань на репліки (якщо вони налаштовані)"""
+    replica_router.init_app(app)
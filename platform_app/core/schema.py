@@ -0,0 +1,73 @@
+"""
+Перевірка версії схеми БД при старті застосунку.
+
+Схема створюється та змінюється міграціями Alembic (каталог migrations/)
+окремим кроком деплою: `flask --app run db upgrade`. Воркери при старті
+не виконують DDL - лише один SELECT з alembic_version, а ревізія head
+читається з файлів міграцій один раз на процес.
+"""
+import os
+from functools import lru_cache
+from typing import FrozenSet, Set, Tuple
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from flask import Flask
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from platform_app.core.database import MIGRATIONS_DIR, db
+
+# Успішні перевірки в межах процесу: (url БД, head)
+_checked: Set[Tuple[str, FrozenSet[str]]] = set()
+
+
+class SchemaOutdatedError(RuntimeError):
+    """Схема БД не на останній ревізії міграцій"""
+
+
+@lru_cache(maxsize=1)
+def head_revisions() -> FrozenSet[str]:
+    """Ревізії head з каталогу migrations/"""
+    config = Config(os.path.join(MIGRATIONS_DIR, "alembic.ini"))
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    return frozenset(ScriptDirectory.from_config(config).get_heads())
+
+
+def current_revisions() -> FrozenSet[str]:
+    """Ревізії, записані в таблиці alembic_version (порожньо, якщо міграції не виконувались)"""
+    try:
+        with db.engine.connect() as conn:
+            return frozenset(conn.execute(text("SELECT version_num FROM alembic_version")).scalars())
+    except SQLAlchemyError:
+        return frozenset()
+
+
+def schema_is_current() -> bool:
+    """Чи збігається версія схеми з head (успішний результат кешується на процес)"""
+    key = (db.engine.url.render_as_string(hide_password=True), head_revisions())
+    if key in _checked:
+        return True
+    if current_revisions() != key[1]:
+        return False
+    _checked.add(key)
+    return True
+
+
+def check_schema(app: Flask) -> None:
+    """
+    Перевіряє версію схеми при старті.
+    SCHEMA_CHECK: warn - попередження в лог, strict - помилка запуску, off - без перевірки.
+    """
+    mode = app.config.get("SCHEMA_CHECK", "warn")
+    if mode == "off":
+        return
+
+    with app.app_context():
+        if schema_is_current():
+            return
+
+    message = "Схема БД не на останній ревізії - виконайте `flask --app run db upgrade`"
+    if mode == "strict":
+        raise SchemaOutdatedError(message)
+    print(f"⚠ {message}")
@@ -0,0 +1,234 @@
+"""
+Повнотекстовий пошук по постах.
+
+PostgreSQL: таблиця post_search з колонкою tsvector та GIN-індексом.
+SQLite: віртуальна таблиця FTS5 (rowid = id поста).
+Індекс оновлюється в тій самій транзакції, що й сам пост.
+Таблиця створюється міграцією 0002_performance_tables.
+"""
+import re
+from typing import Dict, List, Tuple
+
+from markupsafe import Markup, escape
+from flask_sqlalchemy.pagination import Pagination
+from sqlalchemy import text
+
+from platform_app.core.database import db
+
+SEARCH_TABLE = "post_search"
+
+# Маркери підсвічування, які не зустрічаються у звичайному тексті
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+
+# Максимальна кількість слів у пошуковому запиті
+MAX_QUERY_TERMS = 8
+
+_TERM_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def _dialect() -> str:
+    """Повертає назву діалекту поточної БД"""
+    return db.engine.dialect.name
+
+
+def _query_terms(query: str) -> List[str]:
+    """Розбиває запит на безпечні для FTS слова"""
+    return _TERM_RE.findall(query.lower())[:MAX_QUERY_TERMS]
+
+
+def _build_match(terms: List[str]) -> str:
+    """Формує вираз пошуку з префіксним збігом для кожного слова"""
+    if _dialect() == "postgresql":
+        return " & ".join(f"{term}:*" for term in terms)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def render_snippet(raw: str) -> Markup:
+    """Екранує фрагмент і замінює маркери на <mark>"""
+    if not raw:
+        return Markup("")
+    return (
+        escape(raw)
+        .replace(HIGHLIGHT_START, Markup("<mark>"))
+        .replace(HIGHLIGHT_END, Markup("</mark>"))
+    )
+
+
+def index_post(post) -> None:
+    """
+    Додає або оновлює пост у пошуковому індексі.
+    Викликається до commit, щоб індекс змінювався разом з постом.
+    """
+    if post.id is None:
+        db.session.flush()
+
+    params = {"post_id": post.id, "title": post.title, "content": post.content}
+
+    if _dialect() == "postgresql":
+        db.session.execute(text(f"""
+            INSERT INTO {SEARCH_TABLE} (post_id, document)
+            VALUES (
+                :post_id,
+                setweight(to_tsvector('simple', :title), 'A')
+                || setweight(to_tsvector('simple', :content), 'B')
+            )
+            ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document
+        """), params)
+    else:
+        db.session.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :post_id"), params
+        )
+        db.session.execute(text(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, content) "
+            f"VALUES (:post_id, :title, :content)"
+        ), params)
+
+
+def remove_post(post_id: int) -> None:
+    """Видаляє пост з пошукового індексу"""
+    column = "post_id" if _dialect() == "postgresql" else "rowid"
+    db.session.execute(
+        text(f"DELETE FROM {SEARCH_TABLE} WHERE {column} = :post_id"),
+        {"post_id": post_id},
+    )
+
+
+def insert_documents(params: List[Dict]) -> None:
+    """
+    Пакетно додає документи постів, яких ще немає в індексі
+    (params - [{"post_id", "title", "content"}], executemany).
+    """
+    if not params:
+        return
+    if _dialect() == "postgresql":
+        db.session.execute(text(f"""
+            INSERT INTO {SEARCH_TABLE} (post_id, document)
+            VALUES (
+                :post_id,
+                setweight(to_tsvector('simple', :title), 'A')
+                || setweight(to_tsvector('simple', :content), 'B')
+            )
+        """), params)
+    else:
+        db.session.execute(text(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, content) "
+            f"VALUES (:post_id, :title, :content)"
+        ), params)
+
+
+def rebuild_search_index(batch_size: int = 500) -> int:
+    """Повністю перебудовує індекс з таблиці blog_posts. Повертає кількість постів."""
+    from platform_app.models.post import BlogPost
+
+    db.session.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+
+    total = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            db.select(BlogPost.id, BlogPost.title, BlogPost.content)
+            .where(BlogPost.id > last_id)
+            .order_by(BlogPost.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        insert_documents([{"post_id": r.id, "title": r.title, "content": r.content} for r in rows])
+
+        total += len(rows)
+        last_id = rows[-1].id
+        db.session.commit()
+
+    if _dialect() != "postgresql":
+        db.session.execute(text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')"))
+        db.session.commit()
+
+    return total
+
+
+def _search_ids(match: str, limit: int, offset: int) -> List[Tuple[int, str]]:
+    """Повертає (id, фрагмент) для сторінки результатів, відсортованих за релевантністю"""
+    params = {"match": match, "limit": limit, "offset": offset}
+
+    if _dialect() == "postgresql":
+        rows = db.session.execute(text(f"""
+            WITH hits AS (
+                SELECT p.id, p.content, q.query, ts_rank_cd(s.document, q.query) AS rank,
+                       p.published_at
+                FROM {SEARCH_TABLE} s
+                JOIN blog_posts p ON p.id = s.post_id,
+                     to_tsquery('simple', :match) AS q(query)
+                WHERE s.document @@ q.query AND p.is_published
+                ORDER BY rank DESC, p.published_at DESC
+                LIMIT :limit OFFSET :offset
+            )
+            SELECT id, ts_headline(
+                'simple', content, query,
+                'StartSel="\x02", StopSel="\x03", MaxFragments=2, MaxWords=25, MinWords=10'
+            ) AS snippet
+            FROM hits
+            ORDER BY rank DESC, published_at DESC
+        """), params).all()
+    else:
+        rows = db.session.execute(text(f"""
+            SELECT {SEARCH_TABLE}.rowid AS id,
+                   snippet({SEARCH_TABLE}, 1, char(2), char(3), '…', 24) AS snippet
+            FROM {SEARCH_TABLE}
+            JOIN blog_posts p ON p.id = {SEARCH_TABLE}.rowid
+            WHERE {SEARCH_TABLE} MATCH :match AND p.is_published = 1
+            ORDER BY bm25({SEARCH_TABLE}, 10.0, 1.0), p.published_at DESC
+            LIMIT :limit OFFSET :offset
+        """), params).all()
+
+    return [(row.id, row.snippet) for row in rows]
+
+
+def _count_hits(match: str) -> int:
+    """Кількість опублікованих постів, що відповідають запиту"""
+    if _dialect() == "postgresql":
+        sql = f"""
+            SELECT count(*) FROM {SEARCH_TABLE} s
+            JOIN blog_posts p ON p.id = s.post_id
+            WHERE s.document @@ to_tsquery('simple', :match) AND p.is_published
+        """
+    else:
+        sql = f"""
+            SELECT count(*) FROM {SEARCH_TABLE}
+            JOIN blog_posts p ON p.id = {SEARCH_TABLE}.rowid
+            WHERE {SEARCH_TABLE} MATCH :match AND p.is_published = 1
+        """
+    return db.session.execute(text(sql), {"match": match}).scalar() or 0
+
+
+class SearchPagination(Pagination):
+    """Пагінація результатів пошуку з фрагментами тексту (snippets)"""
+
+    snippets: Dict[int, Markup]
+
+    def _query_items(self) -> list:
+        from platform_app.core.listings import fetch_cards_by_ids
+
+        match = self._query_args["match"]
+        self.snippets = {}
+        if match is None:
+            return []
+
+        hits = _search_ids(match, self.per_page, self._query_offset)
+        self.snippets = {post_id: render_snippet(raw) for post_id, raw in hits}
+        if not hits:
+            return []
+
+        return fetch_cards_by_ids(post_id for post_id, _ in hits)
+
+    def _query_count(self) -> int:
+        match = self._query_args["match"]
+        return _count_hits(match) if match is not None else 0
+
+
+def search_posts(query: str, page: int, per_page: int) -> SearchPagination:
+    """Шукає опубліковані пости за запитом, з ранжуванням та підсвічуванням"""
+    terms = _query_terms(query)
+    match = _build_match(terms) if terms else None
+    return SearchPagination(page=page, per_page=per_page, error_out=False, match=match)
@@ -0,0 +1,16 @@
+"""
+Сигнали про зміну контенту.
+
+Відправляються після commit, щоб кеші та похідні дані могли оновитися
+без прямої залежності blueprint'ів від кожної підсистеми.
+"""
+from blinker import Namespace
+
+_signals = Namespace()
+
+# post_changed.send(app, post_id=..., slug=..., author_id=..., action="created|updated|deleted",
+#                   old_slug=...)
+post_changed = _signals.signal("post-changed")
+
+# user_changed.send(app, user_id=..., username=...)
+user_changed = _signals.signal("user-changed")
@@ -0,0 +1,129 @@
+"""
+Агрегатні SQL-запити для статистики автора.
+
+Всі підрахунки (суми, гістограми по днях і місяцях, топ постів) виконуються
+в БД через GROUP BY, тож обсяг переданих даних і час не залежать від
+кількості постів автора.
+"""
+from datetime import datetime, timedelta
+from typing import Dict
+
+from sqlalchemy import func, String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+from platform_app.core.database import db
+from platform_app.core.listings import card_select, fetch_cards
+from platform_app.models.post import BlogPost
+
+# Кількість днів у гістограмі активності
+ACTIVITY_DAYS = 30
+
+
+class date_bucket(FunctionElement):
+    """
+    Округлення дати до рядка-періоду. Компілюється окремо для кожного діалекту;
+    конкретний період задають підкласи day_bucket ('YYYY-MM-DD') та month_bucket ('YYYY-MM').
+    """
+
+    type = String()
+    inherit_cache = True
+    unit = "day"
+
+
+class day_bucket(date_bucket):
+    inherit_cache = True
+    name = "day_bucket"
+    unit = "day"
+
+
+class month_bucket(date_bucket):
+    inherit_cache = True
+    name = "month_bucket"
+    unit = "month"
+
+
+_SQLITE_FORMATS = {"day": "%Y-%m-%d", "month": "%Y-%m"}
+_POSTGRES_FORMATS = {"day": "YYYY-MM-DD", "month": "YYYY-MM"}
+
+
+@compiles(date_bucket, "sqlite")
+def _date_bucket_sqlite(element, compiler, **kw):
+    column = compiler.process(list(element.clauses)[0], **kw)
+    return f"strftime('{_SQLITE_FORMATS[element.unit]}', {column})"
+
+
+@compiles(date_bucket, "postgresql")
+def _date_bucket_postgresql(element, compiler, **kw):
+    column = compiler.process(list(element.clauses)[0], **kw)
+    return f"to_char({column}, '{_POSTGRES_FORMATS[element.unit]}')"
+
+
+@compiles(date_bucket)
+def _date_bucket_default(element, compiler, **kw):
+    # Стандартний SQL: CAST дати до рядка та обрізання
+    column = compiler.process(list(element.clauses)[0], **kw)
+    length = 10 if element.unit == "day" else 7
+    return f"SUBSTRING(CAST({column} AS VARCHAR(32)) FROM 1 FOR {length})"
+
+
+def author_dashboard(author_id: int) -> Dict:
+    """Контекст шаблону statistics/dashboard.html для автора"""
+    author_filter = BlogPost.author_id == author_id
+
+    # По місяцях: кількість, перегляди та ШІ-пости; загальні підсумки - сума по місяцях
+    month = month_bucket(BlogPost.published_at).label("month")
+    monthly_rows = db.session.execute(
+        db.select(
+            month,
+            func.count(BlogPost.id).label("posts"),
+            func.coalesce(func.sum(BlogPost.view_count), 0).label("views"),
+            func.count(BlogPost.id).filter(BlogPost.ai_generated == True).label("ai_posts"),
+        )
+        .where(author_filter)
+        .group_by(month)
+        .order_by(month)
+    ).all()
+
+    monthly_data = {
+        row.month: {"posts": row.posts, "views": int(row.views)} for row in monthly_rows
+    }
+    total_posts = sum(row.posts for row in monthly_rows)
+    total_views = sum(int(row.views) for row in monthly_rows)
+    ai_generated_count = sum(row.ai_posts for row in monthly_rows)
+
+    # Активність по днях (останні 30 днів, від сьогодні назад)
+    today = datetime.utcnow().date()
+    days_data = {
+        (today - timedelta(days=i)).isoformat(): 0 for i in range(ACTIVITY_DAYS)
+    }
+    since = datetime.combine(today - timedelta(days=ACTIVITY_DAYS - 1), datetime.min.time())
+    day = day_bucket(BlogPost.published_at).label("day")
+    for row in db.session.execute(
+        db.select(day, func.count(BlogPost.id).label("posts"))
+        .where(author_filter, BlogPost.published_at >= since)
+        .group_by(day)
+    ):
+        if row.day in days_data:
+            days_data[row.day] = row.posts
+
+    # Найпопулярніші пости
+    top_posts = fetch_cards(
+        card_select()
+        .where(author_filter)
+        .order_by(BlogPost.view_count.desc(), BlogPost.id)
+        .limit(5)
+    )
+
+    return {
+        "total_posts": total_posts,
+        "total_views": total_views,
+        "ai_generated_count": ai_generated_count,
+        "days_data": days_data,
+        "top_posts": top_posts,
+        "ai_usage": {
+            "with_ai": ai_generated_count,
+            "without_ai": total_posts - ai_generated_count,
+        },
+        "monthly_data": monthly_data,
+    }
@@ -0,0 +1,153 @@
+"""
+Нормалізований індекс тегів.
+
+Теги поста зберігаються в таблицях tags та post_tags (рядок BlogPost.tags
+лишається лише як введений автором текст для форми редагування).
+Пошук постів за тегом - вибірка по індексу (tag_id, post_id), хмара тегів -
+GROUP BY по тому ж індексу.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func
+
+from platform_app.core.database import db, dialect_insert
+from platform_app.models.post import BlogPost
+from platform_app.models.tag import Tag, post_tags
+
+# Максимальна довжина назви тегу (як у колонці tags.name)
+MAX_TAG_LENGTH = 100
+
+
+def normalize_tag(name: str) -> str:
+    """Нормалізує назву тегу: без '#', нижній регістр, один пробіл між словами"""
+    name = " ".join(name.strip().lstrip("#").split()).lower()
+    return name[:MAX_TAG_LENGTH]
+
+
+def parse_tags(raw: Optional[str]) -> List[str]:
+    """Розбирає рядок тегів через кому в список унікальних нормалізованих назв"""
+    if not raw:
+        return []
+    names: Dict[str, None] = {}
+    for part in re.split(r"[,;]", raw):
+        name = normalize_tag(part)
+        if name:
+            names.setdefault(name)
+    return list(names)
+
+
+def _upsert_tags(names: Iterable[str]) -> Dict[str, int]:
+    """Створює відсутні теги одним пакетним INSERT та повертає {назва: id}"""
+    names = sorted(set(names))
+    if not names:
+        return {}
+    stmt = dialect_insert(Tag.__table__).on_conflict_do_nothing(index_elements=["name"])
+    db.session.execute(stmt, [{"name": name} for name in names])
+    return dict(db.session.execute(
+        db.select(Tag.name, Tag.id).where(Tag.name.in_(names))
+    ).all())
+
+
+def set_post_tags(post: BlogPost, raw: Optional[str]) -> List[str]:
+    """
+    Синхронізує теги поста з рядком raw у поточній транзакції.
+    Пост має бути вже збережений у сесії (потрібен id).
+    """
+    if post.id is None:
+        db.session.flush()
+
+    names = parse_tags(raw)
+    tag_ids = _upsert_tags(names)
+
+    current = set(db.session.execute(
+        db.select(post_tags.c.tag_id).where(post_tags.c.post_id == post.id)
+    ).scalars())
+    wanted = set(tag_ids.values())
+
+    if current - wanted:
+        db.session.execute(
+            delete(post_tags)
+            .where(post_tags.c.post_id == post.id)
+            .where(post_tags.c.tag_id.in_(current - wanted))
+        )
+    if wanted - current:
+        stmt = dialect_insert(post_tags).on_conflict_do_nothing()
+        db.session.execute(
+            stmt, [{"post_id": post.id, "tag_id": tag_id} for tag_id in sorted(wanted - current)]
+        )
+    return names
+
+
+def replace_post_tags(parsed: Dict[int, List[str]]) -> None:
+    """Пакетно замінює теги постів: {post_id: [назви]} (у транзакції викликача)"""
+    if not parsed:
+        return
+    tag_ids = _upsert_tags(name for names in parsed.values() for name in names)
+    links = [
+        {"post_id": post_id, "tag_id": tag_ids[name]}
+        for post_id, names in parsed.items()
+        for name in names
+    ]
+    db.session.execute(delete(post_tags).where(post_tags.c.post_id.in_(list(parsed))))
+    if links:
+        db.session.execute(post_tags.insert(), links)
+
+
+def remove_post_tags(post_id: int) -> None:
+    """Видаляє зв'язки поста з тегами (у транзакції викликача)"""
+    db.session.execute(delete(post_tags).where(post_tags.c.post_id == post_id))
+
+
+def get_tag(name: str) -> Optional[Tag]:
+    """Тег за назвою (з нормалізацією)"""
+    name = normalize_tag(name)
+    if not name:
+        return None
+    return db.session.execute(db.select(Tag).where(Tag.name == name)).scalar_one_or_none()
+
+
+def post_criteria_for_tag(tag_id: int) -> list:
+    """Умови WHERE для постів з тегом (підзапит по індексу post_tags)"""
+    return [
+        BlogPost.id.in_(db.select(post_tags.c.post_id).where(post_tags.c.tag_id == tag_id)),
+        BlogPost.is_published == True,
+    ]
+
+
+def tag_cloud(limit: int = 100) -> List[Tuple[str, int]]:
+    """(назва, кількість опублікованих постів) для найуживаніших тегів, за абеткою"""
+    rows = db.session.execute(
+        db.select(Tag.name, func.count(post_tags.c.post_id).label("post_count"))
+        .join(post_tags, post_tags.c.tag_id == Tag.id)
+        .join(BlogPost, BlogPost.id == post_tags.c.post_id)
+        .where(BlogPost.is_published == True)
+        .group_by(Tag.id, Tag.name)
+        .order_by(func.count(post_tags.c.post_id).desc(), Tag.name)
+        .limit(limit)
+    ).all()
+    return sorted(((row.name, row.post_count) for row in rows), key=lambda item: item[0])
+
+
+def backfill_tags(batch_size: int = 500) -> int:
+    """Заповнює post_tags з рядкової колонки BlogPost.tags. Повертає кількість постів."""
+    total = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            db.select(BlogPost.id, BlogPost.tags)
+            .where(BlogPost.id > last_id)
+            .where(BlogPost.tags.isnot(None))
+            .order_by(BlogPost.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        replace_post_tags({row.id: parse_tags(row.tags) for row in rows})
+        db.session.commit()
+
+        total += len(rows)
+        last_id = rows[-1].id
+    return total
+
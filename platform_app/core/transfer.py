@@ -0,0 +1,460 @@
+"""
+Потоковий імпорт та експорт користувачів і постів (JSONL / CSV).
+
+Експорт читає таблицю через yield_per (на PostgreSQL - серверний курсор),
+тож пам'ять не залежить від розміру таблиці. Імпорт обробляє файл пакетами:
+slug'и генеруються та перевіряються на унікальність одним запитом на пакет,
+рядки вставляються одним executemany (на PostgreSQL з psycopg - COPY у
+тимчасову таблицю та INSERT ... SELECT), пошуковий індекс і теги
+оновлюються в тій самій транзакції. З defer_indexes вторинні індекси
+видаляються на час завантаження і будуються один раз наприкінці.
+
+Пости посилаються на автора за username, тож файли переносні між БД.
+Записи, що вже існують (username/email користувача, slug поста з файлу),
+пропускаються - повторний імпорт того самого файлу нічого не дублює.
+"""
+import csv
+import itertools
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+
+from platform_app.core import search
+from platform_app.core import tags as tag_index
+from platform_app.core.database import db, dialect_insert
+from platform_app.models.post import BlogPost
+from platform_app.models.tag import post_tags
+from platform_app.models.user import UserAccount
+
+USER_FIELDS = (
+    "username", "email", "password_hash", "full_name", "about", "avatar_url",
+    "is_active", "registered_at", "last_login",
+)
+POST_FIELDS = (
+    "slug", "title", "content", "summary", "author", "is_published", "published_at",
+    "updated_at", "view_count", "tags", "featured_image", "ai_summary", "ai_generated",
+)
+
+_BOOL_FIELDS = {"is_active", "is_published", "ai_generated"}
+_DATETIME_FIELDS = {"registered_at", "last_login", "published_at", "updated_at"}
+_INT_FIELDS = {"view_count"}
+
+# Хеш, з яким вхід неможливий (check_password_hash повертає False)
+UNUSABLE_PASSWORD = "!"
+
+# Розмір списку IN (...) при перевірці існуючих slug'ів та авторів
+LOOKUP_CHUNK = 500
+
+# Що робити з постом, slug якого з файлу вже зайнятий
+ON_CONFLICT_SKIP = "skip"      # пропустити (повторний імпорт ідемпотентний)
+ON_CONFLICT_RENAME = "rename"  # додати як новий пост зі slug base-2, base-3...
+ON_CONFLICT_MODES = (ON_CONFLICT_SKIP, ON_CONFLICT_RENAME)
+
+# Тимчасова таблиця для COPY (PostgreSQL)
+STAGING_TABLE = "bulk_posts_staging"
+
+# GIN-індекс пошуку (PostgreSQL), див. міграцію 0002
+SEARCH_GIN_INDEX = f"ix_{search.SEARCH_TABLE}_document"
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    """Формат файлу: явно вказаний або за розширенням (.csv, інакше jsonl)"""
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def _batches(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+# Серіалізація
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def write_rows(stream, fmt: str, fields: Sequence[str], rows: Iterable[Sequence]) -> int:
+    """Пише рядки у потік. Повертає кількість записів."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow([_csv_value(value) for value in row])
+            count += 1
+    else:
+        for row in rows:
+            record = dict(zip(fields, (_json_value(value) for value in row)))
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def read_rows(stream, fmt: str) -> Iterator[Dict]:
+    """Читає записи з потоку по одному"""
+    if fmt == "csv":
+        # У CSV порожній рядок означає NULL
+        for record in csv.DictReader(stream):
+            yield {key: (value if value != "" else None) for key, value in record.items()}
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _parse_value(field: str, value):
+    if value is None:
+        return None
+    if field in _BOOL_FIELDS:
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "yes", "t")
+        return bool(value)
+    if field in _DATETIME_FIELDS:
+        return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    if field in _INT_FIELDS:
+        return int(value)
+    return value
+
+
+def _parse_record(record: Dict, fields: Sequence[str]) -> Dict:
+    return {field: _parse_value(field, record.get(field)) for field in fields}
+
+
+# Експорт
+
+
+def export_users(stream, fmt: str, batch_size: int = 1000) -> int:
+    """Експортує всіх користувачів. Повертає кількість."""
+    columns = [getattr(UserAccount, field) for field in USER_FIELDS]
+    result = db.session.execute(
+        db.select(*columns).order_by(UserAccount.id).execution_options(yield_per=batch_size)
+    )
+    return write_rows(stream, fmt, USER_FIELDS, result)
+
+
+def export_posts(stream, fmt: str, batch_size: int = 1000) -> int:
+    """Експортує всі пости (автор - username). Повертає кількість."""
+    columns = [
+        UserAccount.username.label("author") if field == "author" else getattr(BlogPost, field)
+        for field in POST_FIELDS
+    ]
+    result = db.session.execute(
+        db.select(*columns)
+        .join(UserAccount, UserAccount.id == BlogPost.author_id)
+        .order_by(BlogPost.id)
+        .execution_options(yield_per=batch_size)
+    )
+    return write_rows(stream, fmt, POST_FIELDS, result)
+
+
+# Імпорт
+
+
+@dataclass
+class ImportStats:
+    """Прогрес імпорту"""
+
+    read: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    started: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self) -> float:
+        elapsed = self.elapsed
+        return self.inserted / elapsed if elapsed > 0 else 0.0
+
+
+def import_users(stream, fmt: str, batch_size: int = 5000,
+                 report: Optional[Callable[[ImportStats], None]] = None) -> ImportStats:
+    """Імпортує користувачів; існуючі username/email пропускаються"""
+    from platform_app.core.rollups import rebuild_rollups
+
+    stats = ImportStats(started=time.perf_counter())
+    table = UserAccount.__table__
+    stmt = dialect_insert(table).on_conflict_do_nothing().returning(table.c.id)
+    now = datetime.utcnow()
+
+    for batch in _batches(read_rows(stream, fmt), batch_size):
+        stats.read += len(batch)
+        params = []
+        for record in batch:
+            row = _parse_record(record, USER_FIELDS)
+            if not row["username"] or not row["email"]:
+                stats.skipped += 1
+                continue
+            row["password_hash"] = row["password_hash"] or UNUSABLE_PASSWORD
+            row["is_active"] = True if row["is_active"] is None else row["is_active"]
+            row["registered_at"] = row["registered_at"] or now
+            params.append(row)
+
+        inserted = len(db.session.execute(stmt, params).all()) if params else 0
+        db.session.commit()
+        stats.inserted += inserted
+        stats.skipped += len(params) - inserted
+        if report:
+            report(stats)
+
+    rebuild_rollups()
+    return stats
+
+
+def _with_suffix(base: str, n: int) -> str:
+    return base if n == 1 else f"{base[:340]}-{n}"
+
+
+def _existing(column, values: Iterable[str]) -> Dict[str, int]:
+    """{значення: id} для значень, що вже є в колонці (пакетами IN)"""
+    values = list(values)
+    model = column.class_
+    found: Dict[str, int] = {}
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        chunk = values[start:start + LOOKUP_CHUNK]
+        found.update(db.session.execute(
+            db.select(column, model.id).where(column.in_(chunk))
+        ).tuples().all())
+    return found
+
+
+def unique_slugs(bases: List[str], reserved: Iterable[str] = ()) -> List[str]:
+    """
+    Унікальні slug'и для пакета: base, base-2, base-3... з урахуванням БД,
+    інших постів пакета та reserved. Один запит до БД на раунд, зазвичай 1-2 раунди.
+    """
+    result: List[Optional[str]] = [None] * len(bases)
+    suffix = [1] * len(bases)
+    next_suffix: Dict[str, int] = {}
+    taken = set(reserved)
+    pending = list(range(len(bases)))
+
+    while pending:
+        candidates = {i: _with_suffix(bases[i], suffix[i]) for i in pending}
+        existing = _existing(BlogPost.slug, set(candidates.values()))
+        retry = []
+        for i in pending:
+            slug = candidates[i]
+            if slug in existing or slug in taken:
+                base = bases[i]
+                suffix[i] = next_suffix.get(base, max(suffix[i], 1) + 1)
+                next_suffix[base] = suffix[i] + 1
+                retry.append(i)
+            else:
+                taken.add(slug)
+                result[i] = slug
+        pending = retry
+    return result
+
+
+class _AuthorLookup:
+    """username -> id з обмеженим кешем (пам'ять не росте з розміром файлу)"""
+
+    MAX_ENTRIES = 100000
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, Optional[int]] = {}
+
+    def resolve(self, usernames: Iterable[str]) -> Dict[str, Optional[int]]:
+        wanted = {name for name in usernames if name}
+        missing = wanted - self._ids.keys()
+        if missing:
+            if len(self._ids) + len(missing) > self.MAX_ENTRIES:
+                self._ids.clear()
+            found = _existing(UserAccount.username, missing)
+            for name in missing:
+                self._ids[name] = found.get(name)
+        return {name: self._ids.get(name) for name in wanted}
+
+
+def _use_copy() -> bool:
+    return db.engine.dialect.name == "postgresql" and db.engine.dialect.driver == "psycopg"
+
+
+def _insert_posts(params: List[Dict], use_copy: bool) -> List[Tuple[int, str]]:
+    """Вставляє пакет постів; повертає (id, slug) вставлених"""
+    table = BlogPost.__table__
+    if not use_copy:
+        stmt = (
+            dialect_insert(table)
+            .on_conflict_do_nothing(index_elements=["slug"])
+            .returning(table.c.id, table.c.slug)
+        )
+        return db.session.execute(stmt, params).tuples().all()
+
+    columns = list(params[0])
+    names = ", ".join(columns)
+    conn = db.session.connection()
+    conn.exec_driver_sql(
+        f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} AS "
+        f"SELECT {names} FROM {table.name} WITH NO DATA"
+    )
+    conn.exec_driver_sql(f"TRUNCATE {STAGING_TABLE}")
+    raw = conn.connection.driver_connection
+    with raw.cursor() as cursor:
+        with cursor.copy(f"COPY {STAGING_TABLE} ({names}) FROM STDIN") as copy:
+            for row in params:
+                copy.write_row([row[column] for column in columns])
+    return conn.execute(text(
+        f"INSERT INTO {table.name} ({names}) SELECT {names} FROM {STAGING_TABLE} "
+        f"ON CONFLICT (slug) DO NOTHING RETURNING id, slug"
+    )).tuples().all()
+
+
+@contextmanager
+def deferred_indexes(enabled: bool = True) -> Iterator[None]:
+    """Видаляє вторинні індекси постів і тегів на час завантаження та будує їх після"""
+    if not enabled:
+        yield
+        return
+
+    indexes = [
+        index for table in (BlogPost.__table__, post_tags)
+        for index in table.indexes if not index.unique
+    ]
+    is_postgresql = db.engine.dialect.name == "postgresql"
+
+    conn = db.session.connection()
+    for index in indexes:
+        index.drop(conn, checkfirst=True)
+    if is_postgresql:
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {SEARCH_GIN_INDEX}")
+    db.session.commit()
+    try:
+        yield
+    finally:
+        db.session.rollback()
+        conn = db.session.connection()
+        for index in indexes:
+            index.create(conn, checkfirst=True)
+        if is_postgresql:
+            conn.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS {SEARCH_GIN_INDEX} "
+                f"ON {search.SEARCH_TABLE} USING GIN (document)"
+            )
+        db.session.commit()
+
+
+def _notify_imported(author_ids: Iterable[int]) -> None:
+    """Інвалідує кеші списків та сторінок авторів після імпорту"""
+    from platform_app.core.conditional import LISTING_GENERATION, author_generation, conditional_get
+    from platform_app.core.page_cache import LISTING_TAG, author_tag, page_cache
+    from platform_app.core.pagination import invalidate_counts
+
+    author_ids = sorted(author_ids)
+    invalidate_counts()
+    conditional_get.bump(LISTING_GENERATION, *(author_generation(a) for a in author_ids))
+    page_cache.invalidate(LISTING_TAG, *(author_tag(a) for a in author_ids))
+
+
+def _assign_slugs(rows: List[Dict], on_conflict: str) -> List[Dict]:
+    """
+    Slug'и пакета. Slug з файлу лишається як є (зайнятий - ON CONFLICT пропускає
+    пост), а з on_conflict=rename теж робиться унікальним. Згенеровані з
+    заголовка slug'и завжди отримують суфікс, якщо зайняті.
+    Повертає рядки для вставки: повтори slug у межах пакета відкидаються.
+    """
+    if on_conflict == ON_CONFLICT_RENAME:
+        renamed, reserved = rows, set()
+    else:
+        renamed = [row for row in rows if not row["slug"]]
+        reserved = {row["slug"] for row in rows if row["slug"]}
+    bases = [row["slug"] or BlogPost.generate_slug(row["title"]) or "post" for row in renamed]
+    for row, slug in zip(renamed, unique_slugs(bases, reserved)):
+        row["slug"] = slug
+
+    seen = set()
+    unique_rows = []
+    for row in rows:
+        if row["slug"] not in seen:
+            seen.add(row["slug"])
+            unique_rows.append(row)
+    return unique_rows
+
+
+def import_posts(stream, fmt: str, batch_size: int = 5000, defer_indexes: bool = False,
+                 use_copy: Optional[bool] = None, on_conflict: str = ON_CONFLICT_SKIP,
+                 report: Optional[Callable[[ImportStats], None]] = None) -> ImportStats:
+    """
+    Імпортує пости. Автор шукається за username (рядки з невідомим автором
+    пропускаються). Slug береться з файлу (пост із зайнятим slug пропускається,
+    з on_conflict=rename - перейменовується) або генерується з заголовка і
+    робиться унікальним.
+    """
+    from platform_app.core.rollups import rebuild_rollups
+
+    if on_conflict not in ON_CONFLICT_MODES:
+        raise ValueError(f"on_conflict must be one of {ON_CONFLICT_MODES}")
+    if use_copy is None:
+        use_copy = _use_copy()
+    stats = ImportStats(started=time.perf_counter())
+    authors = _AuthorLookup()
+    touched_authors = set()
+    now = datetime.utcnow()
+
+    with deferred_indexes(defer_indexes):
+        for batch in _batches(read_rows(stream, fmt), batch_size):
+            stats.read += len(batch)
+            records = [_parse_record(record, POST_FIELDS) for record in batch]
+            author_ids = authors.resolve(record["author"] for record in records)
+
+            rows = []
+            for record in records:
+                author_id = author_ids.get(record.pop("author"))
+                if author_id is None or not record["title"] or not record["content"]:
+                    stats.skipped += 1
+                    continue
+                record["author_id"] = author_id
+                record["is_published"] = True if record["is_published"] is None else record["is_published"]
+                record["published_at"] = record["published_at"] or now
+                record["updated_at"] = record["updated_at"] or record["published_at"]
+                record["view_count"] = record["view_count"] or 0
+                record["ai_generated"] = bool(record["ai_generated"])
+                rows.append(record)
+
+            if rows:
+                insert_rows = _assign_slugs(rows, on_conflict)
+                inserted = dict((slug, post_id) for post_id, slug in _insert_posts(insert_rows, use_copy))
+                new_rows = [row for row in insert_rows if row["slug"] in inserted]
+                search.insert_documents([
+                    {"post_id": inserted[row["slug"]], "title": row["title"], "content": row["content"]}
+                    for row in new_rows
+                ])
+                tag_index.replace_post_tags({
+                    inserted[row["slug"]]: tag_index.parse_tags(row["tags"])
+                    for row in new_rows if row["tags"]
+                })
+                touched_authors.update(row["author_id"] for row in new_rows)
+                stats.inserted += len(new_rows)
+                stats.skipped += len(rows) - len(new_rows)
+            db.session.commit()
+            if report:
+                report(stats)
+
+    rebuild_rollups()
+    _notify_imported(touched_authors)
+    return stats
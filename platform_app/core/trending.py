@@ -0,0 +1,252 @@
+"""
+Популярне зараз: рейтинг постів зі згасанням у часі.
+
+Перегляди, записані лічильником (ViewCounter.flush -> on_flush), додаються
+в погодинні кошики post_view_hours - шлях перегляду поста не отримує
+жодного нового запису в БД. Внесок перегляду згасає експоненційно з
+періодом напіврозпаду TRENDING_HALF_LIFE_HOURS. Оцінка зберігається в
+логарифмічній шкалі відносно початку епохи:
+
+    score = log(sum(views_h * exp(decay * h)))
+
+Вона лише зростає з новими переглядами і не потребує періодичного
+перерахунку всіх постів: порядок за score у будь-який момент збігається з
+порядком за згаслою оцінкою, а поточна оцінка - exp(score - decay * now).
+
+Найкращі TRENDING_CAPACITY постів зберігаються в таблиці trending_posts і
+в пам'яті воркера; сторінка /posts/trending читає лише K рядків.
+Кошики старші за TRENDING_WINDOW_HOURS видаляються.
+"""
+import math
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import Flask
+from sqlalchemy import delete
+
+from platform_app.core.database import db, dialect_insert
+from platform_app.core.listings import PostCard, fetch_cards_by_ids
+from platform_app.core.routing import replica_router
+from platform_app.core.signals import post_changed
+from platform_app.models.post import BlogPost
+from platform_app.models.trending import PostViewHour, TrendingPost
+
+# Сторінки зі списком популярного зараз
+TRENDING_TAG = "trending"
+
+
+def current_hour() -> int:
+    """Номер поточної години від початку епохи Unix"""
+    return int(time.time() // 3600)
+
+
+def log_score(buckets: Iterable[Tuple[int, int]], decay: float) -> float:
+    """log(sum(views * exp(decay * hour))) без переповнення (log-sum-exp)"""
+    terms = [math.log(views) + decay * hour for hour, views in buckets if views > 0]
+    if not terms:
+        return float("-inf")
+    peak = max(terms)
+    return peak + math.log(sum(math.exp(term - peak) for term in terms))
+
+
+class TrendingTracker:
+    """Згасаючий рейтинг постів з обмеженим top-K у БД та в пам'яті"""
+
+    def __init__(self) -> None:
+        self._app: Optional[Flask] = None
+        self._lock = threading.Lock()
+        self._top: List[Tuple[int, float]] = []
+        self._loaded_at = 0.0
+        self._pruned_hour = 0
+        self.half_life = 12.0
+        self.window = 72
+        self.capacity = 100
+        self.refresh_interval = 10.0
+
+    def init_app(self, app: Flask) -> None:
+        self._app = app
+        self.half_life = app.config.get("TRENDING_HALF_LIFE_HOURS", self.half_life)
+        self.window = app.config.get("TRENDING_WINDOW_HOURS", self.window)
+        self.capacity = app.config.get("TRENDING_CAPACITY", self.capacity)
+        self.refresh_interval = app.config.get("TRENDING_REFRESH_INTERVAL", self.refresh_interval)
+
+    @property
+    def decay(self) -> float:
+        """Швидкість згасання за годину"""
+        return math.log(2) / self.half_life
+
+    def _floor(self, hour: int) -> float:
+        """Мінімальна оцінка: один перегляд на межі вікна"""
+        return self.decay * (hour - self.window)
+
+    # Запис (викликається з ViewCounter.flush до commit)
+
+    @replica_router.primary()
+    def views_added(self, batch: Dict[int, int]) -> None:
+        """Додає пакет {post_id: delta} у кошик поточної години та оновлює top-K"""
+        hour = current_hour()
+        # Перегляди видалених чи знятих з публікації постів у рейтинг не потрапляють
+        published = set(db.session.execute(
+            db.select(BlogPost.id).where(BlogPost.id.in_(list(batch)), BlogPost.is_published == True)
+        ).scalars())
+        rows = [
+            {"post_id": post_id, "hour": hour, "views": delta}
+            for post_id, delta in sorted(batch.items()) if delta > 0 and post_id in published
+        ]
+        if not rows:
+            return
+
+        table = PostViewHour.__table__
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["post_id", "hour"], set_={"views": table.c.views + stmt.excluded.views}
+        )
+        db.session.execute(stmt, rows)
+
+        # Оцінка з кошиків, а не read-modify-write: воркери не перезаписують внески один одного
+        per_post: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for row in db.session.execute(
+            db.select(PostViewHour.post_id, PostViewHour.hour, PostViewHour.views)
+            .where(PostViewHour.post_id.in_(list(published)), PostViewHour.hour > hour - self.window)
+        ):
+            per_post[row.post_id].append((row.hour, row.views))
+        self._offer({post_id: log_score(buckets, self.decay) for post_id, buckets in per_post.items()})
+
+        if self._pruned_hour != hour:
+            self._prune(hour)
+            self._pruned_hour = hour
+
+    def _offer(self, candidates: Dict[int, float]) -> None:
+        """Оновлює trending_posts, зберігаючи не більше capacity рядків"""
+        from platform_app.core.page_cache import page_cache
+
+        current = dict(db.session.execute(db.select(TrendingPost.post_id, TrendingPost.score)).all())
+        merged = dict(current)
+        merged.update(candidates)
+        top = sorted(merged.items(), key=lambda item: (-item[1], item[0]))[:self.capacity]
+        keep = dict(top)
+
+        removed = [post_id for post_id in current if post_id not in keep]
+        if removed:
+            db.session.execute(delete(TrendingPost).where(TrendingPost.post_id.in_(removed)))
+        changed = [
+            {"post_id": post_id, "score": score, "updated_at": datetime.utcnow()}
+            for post_id, score in keep.items()
+            if current.get(post_id) != score
+        ]
+        if changed:
+            stmt = dialect_insert(TrendingPost.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["post_id"],
+                set_={"score": stmt.excluded.score, "updated_at": stmt.excluded.updated_at},
+            )
+            db.session.execute(stmt, changed)
+
+        with self._lock:
+            previous = [post_id for post_id, _ in self._top]
+            self._top, self._loaded_at = top, time.monotonic()
+        if previous != [post_id for post_id, _ in top]:
+            page_cache.invalidate(TRENDING_TAG)
+
+    def _prune(self, hour: int) -> None:
+        """Видаляє кошики поза вікном та пости, що вже не набирають мінімальної оцінки"""
+        db.session.execute(
+            delete(PostViewHour).where(PostViewHour.hour <= hour - self.window),
+            execution_options={"synchronize_session": False},
+        )
+        db.session.execute(
+            delete(TrendingPost).where(TrendingPost.score < self._floor(hour)),
+            execution_options={"synchronize_session": False},
+        )
+
+    def post_deleted(self, post_id: int) -> None:
+        """Прибирає видалений пост з кошиків та top-K (у поточній транзакції)"""
+        db.session.execute(delete(PostViewHour).where(PostViewHour.post_id == post_id))
+        db.session.execute(delete(TrendingPost).where(TrendingPost.post_id == post_id))
+        with self._lock:
+            self._top = [entry for entry in self._top if entry[0] != post_id]
+
+    # Повний перерахунок
+
+    @replica_router.primary()
+    def rebuild(self) -> int:
+        """Перераховує top-K з кошиків (після зміни періоду напіврозпаду чи вікна)"""
+        hour = current_hour()
+        self._prune(hour)
+        per_post: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for row in db.session.execute(
+            db.select(PostViewHour.post_id, PostViewHour.hour, PostViewHour.views)
+            .join(BlogPost, BlogPost.id == PostViewHour.post_id)
+            .where(BlogPost.is_published == True, PostViewHour.hour > hour - self.window)
+            .execution_options(yield_per=5000)
+        ):
+            per_post[row.post_id].append((row.hour, row.views))
+        scores = {post_id: log_score(buckets, self.decay) for post_id, buckets in per_post.items()}
+
+        db.session.execute(delete(TrendingPost))
+        self._offer(scores)
+        db.session.commit()
+        return len(scores)
+
+    # Читання
+
+    def top(self, limit: int) -> List[Tuple[int, float]]:
+        """
+        (post_id, поточна згасла оцінка) найпопулярніших зараз постів.
+        Список у пам'яті оновлюється з trending_posts не частіше refresh_interval.
+        """
+        with self._lock:
+            stale = time.monotonic() - self._loaded_at >= self.refresh_interval
+        if stale:
+            top = [
+                (row.post_id, row.score)
+                for row in db.session.execute(
+                    db.select(TrendingPost.post_id, TrendingPost.score)
+                    .order_by(TrendingPost.score.desc(), TrendingPost.post_id)
+                    .limit(self.capacity)
+                )
+            ]
+            with self._lock:
+                self._top, self._loaded_at = top, time.monotonic()
+
+        now = time.time() / 3600
+        floor = self._floor(current_hour())
+        with self._lock:
+            entries = self._top[:limit]
+        return [
+            (post_id, math.exp(score - self.decay * now))
+            for post_id, score in entries
+            if score >= floor
+        ]
+
+    def cards(self, limit: int) -> List[Tuple[PostCard, float]]:
+        """Картки популярних зараз опублікованих постів разом з оцінкою"""
+        entries = self.top(limit)
+        heat = dict(entries)
+        cards = fetch_cards_by_ids(post_id for post_id, _ in entries)
+        return [(card, heat[card.id]) for card in cards if card.is_published]
+
+    # Сигнали
+
+    def _on_post_changed(self, sender, post_id=None, action=None, **extra) -> None:
+        from platform_app.core.page_cache import page_cache
+
+        # Кошики та top-K прибирає post_deleted у транзакції видалення
+        if action == "deleted":
+            page_cache.invalidate(TRENDING_TAG)
+
+
+# Глобальний рейтинг
+trending = TrendingTracker()
+
+
+def init_trending(app: Flask) -> None:
+    """Підключає рейтинг до записів лічильника переглядів та видалення постів"""
+    from platform_app.core.view_counter import view_counter
+
+    trending.init_app(app)
+    view_counter.on_flush(trending.views_added)
+    post_changed.connect(trending._on_post_changed, weak=False)
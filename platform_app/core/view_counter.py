@@ -0,0 +1,126 @@
+"""
+Відкладений (write-behind) лічильник переглядів постів.
+
+Перегляди накопичуються в пам'яті воркера і записуються в БД пакетами:
+UPDATE blog_posts SET view_count = view_count + n WHERE id = ...
+за інтервалом часу або після досягнення порогу кількості переглядів.
+Слухачі on_flush отримують записаний пакет у тій самій транзакції.
+"""
+import atexit
+import os
+import threading
+from typing import Callable, Dict, List
+
+from flask import Flask
+from sqlalchemy import text
+
+from platform_app.core.database import db
+
+
+class ViewCounter:
+    """Буфер переглядів з фоновим скиданням у БД"""
+
+    def __init__(self) -> None:
+        self._pending: Dict[int, int] = {}
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._app = None
+        self._listeners: List[Callable[[Dict[int, int]], None]] = []
+        self.flush_interval = 5.0
+        self.flush_threshold = 500
+
+    def init_app(self, app: Flask) -> None:
+        """Підключає лічильник до застосунку"""
+        self._app = app
+        self.flush_interval = app.config.get("VIEW_COUNTER_FLUSH_INTERVAL", self.flush_interval)
+        self.flush_threshold = app.config.get("VIEW_COUNTER_FLUSH_THRESHOLD", self.flush_threshold)
+        atexit.register(self.flush)
+
+    def on_flush(self, listener: Callable[[Dict[int, int]], None]) -> None:
+        """Реєструє функцію, що викликається з пакетом {post_id: delta} перед commit"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def record(self, post_id: int, count: int = 1) -> None:
+        """Реєструє перегляд поста без звернення до БД"""
+        self._ensure_worker()
+        with self._lock:
+            self._pending[post_id] = self._pending.get(post_id, 0) + count
+            self._pending_total += count
+            should_flush = self._pending_total >= self.flush_threshold
+
+        if self.flush_interval <= 0:
+            # Режим без буферизації (наприклад, для тестів)
+            self.flush()
+        elif should_flush:
+            self._wake.set()
+
+    def pending(self, post_id: int) -> int:
+        """Кількість ще не записаних переглядів поста"""
+        return self._pending.get(post_id, 0)
+
+    def flush(self) -> int:
+        """Записує накопичені перегляди в БД. Повертає кількість оновлених постів."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            self._pending_total = 0
+
+        # Сортування за id зменшує ризик взаємних блокувань між воркерами
+        params = [{"post_id": post_id, "delta": delta} for post_id, delta in sorted(batch.items())]
+
+        try:
+            with self._app.app_context():
+                db.session.execute(
+                    text("UPDATE blog_posts SET view_count = view_count + :delta WHERE id = :post_id"),
+                    params,
+                )
+                for listener in self._listeners:
+                    listener(batch)
+                db.session.commit()
+        except Exception as e:
+            print(f"View counter flush error: {e}")
+            # Повертаємо перегляди в буфер, щоб не втратити їх
+            with self._lock:
+                for post_id, delta in batch.items():
+                    self._pending[post_id] = self._pending.get(post_id, 0) + delta
+                    self._pending_total += delta
+            return 0
+
+        return len(batch)
+
+    def _ensure_worker(self) -> None:
+        """Запускає фоновий потік (повторно після fork у воркері gunicorn)"""
+        if self.flush_interval <= 0 or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Дочірній процес успадкував чужий буфер - він уже належить батьку
+                self._pending, self._pending_total = {}, 0
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="view-counter-flush", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Цикл фонового скидання"""
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+# Глобальний лічильник
+view_counter = ViewCounter()
+
+
+def init_view_counter(app: Flask) -> None:
+    """Ініціалізує відкладений лічильник переглядів"""
+    view_counter.init_app(app)
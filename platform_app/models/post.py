@@ -29,20 +29,49 @@ class BlogPost(db.Model):
     view_count = db.Column(db.Integer, default=0, nullable=False)
     
     # SEO та додатково
-    tags = db.Column(db.String(500), nullable=True)  # Через кому
+    tags = db.Column(db.String(500), nullable=True)  # Через кому, як ввів автор (індекс - post_tags)
     featured_image = db.Column(db.String(500), nullable=True)
     
     # ШІ генерація
     ai_summary = db.Column(db.Text, nullable=True)  # Резюме, згенероване ШІ
     ai_generated = db.Column(db.Boolean, default=False, nullable=False)  # Чи використано ШІ
+    ai_status = db.Column(db.String(20), nullable=True)  # pending / done / failed (фонова генерація)
+    
+    # Завдання фонової генерації резюме
+    summary_jobs = db.relationship(
+        "SummaryJob",
+        backref="post",
+        lazy="select",
+        cascade="all, delete-orphan",
+    )
+    
+    # Нормалізовані теги (запис - через core/tags.py::set_post_tags)
+    tag_items = db.relationship(
+        "Tag",
+        secondary="post_tags",
+        lazy="select",
+        order_by="Tag.name",
+        viewonly=True,
+    )
+    
+    __table_args__ = (
+        # Курсорна пагінація постів автора: WHERE author_id ORDER BY (published_at, id)
+        db.Index("ix_blog_posts_author_published", "author_id", "published_at", "id"),
+    )
     
     def __repr__(self) -> str:
         return f"<BlogPost {self.slug}>"
     
     def increment_views(self) -> None:
-        """Збільшує лічильник переглядів"""
-        self.view_count += 1
-        db.session.commit()
+        """Реєструє перегляд (запис у БД відкладений, див. core/view_counter.py)"""
+        from platform_app.core.view_counter import view_counter
+        view_counter.record(self.id)
+    
+    @property
+    def live_view_count(self) -> int:
+        """Кількість переглядів разом з ще не записаними в БД"""
+        from platform_app.core.view_counter import view_counter
+        return self.view_count + view_counter.pending(self.id)
     
     @staticmethod
     def generate_slug(title: str) -> str:
@@ -54,9 +83,7 @@ class BlogPost(db.Model):
         return slug[:350]
     
     def get_tags_list(self) -> list:
-        """Повертає список тегів"""
-        if not self.tags:
-            return []
-        return [tag.strip() for tag in self.tags.split(",") if tag.strip()]
+        """Повертає список тегів (з індексу тегів)"""
+        return [tag.name for tag in self.tag_items]
 
 
@@ -0,0 +1,57 @@
+"""
+Моделі схожих постів: вектори постів, списки сусідів та параметри моделі
+"""
+from datetime import datetime
+
+from platform_app.core.database import db
+
+
+class RelatedPost(db.Model):
+    """Сусід поста за косинусною подібністю (rank 0 - найсхожіший)"""
+
+    __tablename__ = "related_posts"
+
+    post_id = db.Column(
+        db.Integer, db.ForeignKey("blog_posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    rank = db.Column(db.SmallInteger, primary_key=True)
+    related_id = db.Column(
+        db.Integer, db.ForeignKey("blog_posts.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    score = db.Column(db.Float, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<RelatedPost {self.post_id}#{self.rank} -> {self.related_id}>"
+
+
+class PostVector(db.Model):
+    """Нормований вектор поста (float16) та його кластер - для інкрементних оновлень"""
+
+    __tablename__ = "post_vectors"
+
+    post_id = db.Column(
+        db.Integer, db.ForeignKey("blog_posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    cluster = db.Column(db.Integer, nullable=False, index=True)
+    digest = db.Column(db.String(32), nullable=False)  # хеш заголовка, тексту та тегів
+    vector = db.Column(db.LargeBinary, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<PostVector {self.post_id} c{self.cluster}>"
+
+
+class RelatedModel(db.Model):
+    """Параметри, отримані при повній перебудові: IDF хешованих термів та центроїди кластерів"""
+
+    __tablename__ = "related_models"
+
+    name = db.Column(db.String(50), primary_key=True)
+    dimensions = db.Column(db.Integer, nullable=False)
+    documents = db.Column(db.Integer, nullable=False)
+    idf = db.Column(db.LargeBinary, nullable=False)
+    centroids = db.Column(db.LargeBinary, nullable=False)
+    built_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<RelatedModel {self.name}: {self.documents} docs>"
@@ -0,0 +1,45 @@
+"""
+Моделі зведених (інкрементально оновлюваних) лічильників статистики
+"""
+from platform_app.core.database import db
+
+
+class PlatformCounter(db.Model):
+    """Загальний лічильник платформи (users, posts, views, ai_posts)"""
+    
+    __tablename__ = "platform_counters"
+    
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, default=0, nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<PlatformCounter {self.name}={self.value}>"
+
+
+class AuthorStats(db.Model):
+    """Кількість опублікованих постів і переглядів автора"""
+    
+    __tablename__ = "author_stats"
+    
+    author_id = db.Column(
+        db.Integer, db.ForeignKey("user_accounts.id", ondelete="CASCADE"), primary_key=True
+    )
+    post_count = db.Column(db.Integer, default=0, nullable=False, index=True)
+    view_count = db.Column(db.BigInteger, default=0, nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<AuthorStats {self.author_id}: {self.post_count} posts>"
+
+
+class TopPost(db.Model):
+    """Кандидати в найпопулярніші пости (обмежена кількість рядків)"""
+    
+    __tablename__ = "top_posts"
+    
+    post_id = db.Column(
+        db.Integer, db.ForeignKey("blog_posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    view_count = db.Column(db.Integer, default=0, nullable=False, index=True)
+    
+    def __repr__(self) -> str:
+        return f"<TopPost {self.post_id}: {self.view_count}>"
@@ -0,0 +1,20 @@
+"""
+Модель постійного кешу ШІ-резюме
+"""
+from datetime import datetime
+
+from platform_app.core.database import db
+
+
+class SummaryCacheEntry(db.Model):
+    """Збережене резюме, ключ - хеш (модель, текст, max_length, min_length)"""
+    
+    __tablename__ = "ai_summary_cache"
+    
+    key = db.Column(db.String(64), primary_key=True)
+    model = db.Column(db.String(200), nullable=False)
+    summary = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<SummaryCacheEntry {self.key[:12]}>"
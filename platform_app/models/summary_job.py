@@ -0,0 +1,43 @@
+"""
+Модель завдання фонової генерації резюме
+"""
+from datetime import datetime
+
+from platform_app.core.database import db
+
+
+class SummaryJob(db.Model):
+    """Завдання на генерацію ШІ-резюме для поста"""
+    
+    __tablename__ = "summary_jobs"
+    
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    post_id = db.Column(
+        db.Integer, db.ForeignKey("blog_posts.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    
+    # Стан виконання
+    status = db.Column(db.String(20), default=STATUS_PENDING, nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    last_error = db.Column(db.Text, nullable=True)
+    
+    # Параметри генерації
+    max_length = db.Column(db.Integer, default=200, nullable=False)
+    min_length = db.Column(db.Integer, default=50, nullable=False)
+    
+    # Планування
+    run_after = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        db.Index("ix_summary_jobs_status_run_after", "status", "run_after"),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<SummaryJob {self.id} post={self.post_id} {self.status}>"
@@ -0,0 +1,25 @@
+"""
+Модель тегу та зв'язку пост-тег
+"""
+from platform_app.core.database import db
+
+
+# Зв'язок багато-до-багатьох; індекс (tag_id, post_id) - для вибірки постів за тегом
+post_tags = db.Table(
+    "post_tags",
+    db.Column("post_id", db.Integer, db.ForeignKey("blog_posts.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("tag_id", db.Integer, db.ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    db.Index("ix_post_tags_tag_post", "tag_id", "post_id"),
+)
+
+
+class Tag(db.Model):
+    """Тег (нормалізована назва: нижній регістр, без зайвих пробілів)"""
+    
+    __tablename__ = "tags"
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    name = db.Column(db.String(100), unique=True, nullable=False, index=True)
+    
+    def __repr__(self) -> str:
+        return f"<Tag {self.name}>"
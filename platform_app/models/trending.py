@@ -0,0 +1,36 @@
+"""
+Моделі рейтингу "Популярне зараз": погодинні кошики переглядів та top-K постів
+"""
+from datetime import datetime
+
+from platform_app.core.database import db
+
+
+class PostViewHour(db.Model):
+    """Перегляди поста за годину (hour - години від початку епохи Unix)"""
+
+    __tablename__ = "post_view_hours"
+
+    post_id = db.Column(
+        db.Integer, db.ForeignKey("blog_posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    hour = db.Column(db.Integer, primary_key=True, index=True)
+    views = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<PostViewHour {self.post_id}@{self.hour}: {self.views}>"
+
+
+class TrendingPost(db.Model):
+    """Пост з найвищою згаслою оцінкою (обмежена кількість рядків)"""
+
+    __tablename__ = "trending_posts"
+
+    post_id = db.Column(
+        db.Integer, db.ForeignKey("blog_posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    score = db.Column(db.Float, nullable=False, index=True)  # логарифмічна шкала, див. core/trending.py
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<TrendingPost {self.post_id}: {self.score:.3f}>"
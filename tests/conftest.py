@@ -0,0 +1,74 @@
+"""
+Спільні фікстури тестів: застосунок на тимчасовій SQLite БД.
+
+Розширення (page_cache, view_counter, replica_router...) - глобальні
+об'єкти, тож кожен модуль тестів створює свій застосунок, і вони
+переналаштовуються на нього.
+"""
+import flask_migrate
+import pytest
+
+from platform_app import create_application
+from platform_app.core.config import AppConfig
+from platform_app.core.database import db
+
+TEST_CONFIG = {
+    "SCHEMA_CHECK": "off",
+    "PAGE_CACHE_BACKEND": "memory",
+    "IDENTITY_CACHE_BACKEND": "none",
+    "SUMMARY_WORKER_INPROCESS": False,
+    "ASSETS_BUILD_ON_START": False,
+    "ROLLUP_RECONCILE_INTERVAL": 0.0,
+    "VIEW_COUNTER_FLUSH_INTERVAL": 0.0,
+    "METRICS_ENABLED": False,
+}
+
+
+def create_test_app(root, migrate: bool = True, **config):
+    """Застосунок з БД root/app.db; config перекриває атрибути AppConfig"""
+    settings = {
+        **TEST_CONFIG,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{root / 'app.db'}",
+        "SQLALCHEMY_BINDS": {},
+        "FEEDS_PATH": str(root / "feeds"),
+        **config,
+    }
+    with pytest.MonkeyPatch.context() as mp:
+        for name, value in settings.items():
+            mp.setattr(AppConfig, name, value)
+        mp.setenv("SUMMARIZER_BREAKER_BACKEND", "memory")
+        app = create_application()
+    app.config["TESTING"] = True
+    if migrate:
+        with app.app_context():
+            flask_migrate.upgrade()
+    return app
+
+
+def dispose_app(app) -> None:
+    with app.app_context():
+        db.session.remove()
+        for engine in app.extensions["sqlalchemy"].engines.values():
+            engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    app = create_test_app(tmp_path_factory.mktemp("app"))
+    yield app
+    dispose_app(app)
+
+
+def register(client, username: str = "alice") -> None:
+    """Реєструє користувача (клієнт після цього автентифікований)"""
+    response = client.post("/auth/register", data={
+        "username": username, "email": f"{username}@example.com",
+        "password": "secret1", "password_confirm": "secret1", "full_name": username.title(),
+    })
+    assert response.status_code == 302, response.text[:500]
+
+
+def create_post(client, title: str, content: str, tags: str = "") -> None:
+    """Створює пост від імені автентифікованого клієнта"""
+    response = client.post("/posts/create", data={"title": title, "content": content, "tags": tags})
+    assert response.status_code == 302, response.text[:500]
@@ -0,0 +1,164 @@
+"""
+Масова генерація резюме (run_backfill) проти локального HTTP-заглушки API.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from platform_app.ai.backfill import run_backfill
+from platform_app.ai.breaker import CircuitBreaker
+from platform_app.ai.summarizer import TextSummarizer
+from platform_app.ai.summary_cache import SummaryCache
+from platform_app.core.database import db
+from platform_app.models.post import BlogPost
+from tests.conftest import create_post, register
+
+POSTS = 12
+FAIL_MARKER = "FAILME"
+
+
+class StubAPI:
+    """Заглушка Inference API: пакетні inputs, затримка, збої за маркером у тексті"""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.batches = []
+        self.active = 0
+        self.max_active = 0
+        self.fail_marker = None
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                inputs = payload["inputs"]
+                with stub.lock:
+                    stub.batches.append(inputs)
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                time.sleep(0.05)
+                with stub.lock:
+                    stub.active -= 1
+                if stub.fail_marker and any(stub.fail_marker in text for text in inputs):
+                    status, body = 500, {"error": "boom"}
+                else:
+                    status, body = 200, [{"summary_text": f"summary: {text[:12]}"} for text in inputs]
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def reset(self) -> None:
+        self.batches, self.max_active, self.fail_marker = [], 0, None
+
+    @property
+    def sent(self) -> int:
+        return sum(len(batch) for batch in self.batches)
+
+
+@pytest.fixture(scope="module")
+def stub():
+    stub = StubAPI()
+    yield stub
+    stub.server.shutdown()
+
+
+@pytest.fixture(scope="module")
+def post_ids(app):
+    client = app.test_client()
+    register(client)
+    body = "Текст поста для масової генерації резюме. " * 4
+    for number in range(1, POSTS + 1):
+        marker = FAIL_MARKER if number == 5 else ""
+        create_post(client, f"Backfill post {number}", f"{body} {marker} номер {number}")
+    with app.app_context():
+        return db.session.execute(db.select(BlogPost.id).order_by(BlogPost.id)).scalars().all()
+
+
+@pytest.fixture
+def summarizer(app, stub, post_ids):
+    with app.app_context():
+        db.session.execute(db.update(BlogPost).values(ai_summary=None, ai_generated=False))
+        db.session.commit()
+    stub.reset()
+    summarizer = TextSummarizer(
+        api_token="test",
+        engine="huggingface",
+        cache=SummaryCache(persistent=False),
+        breaker=CircuitBreaker("test-backfill", failure_threshold=100),
+    )
+    summarizer.base_url = stub.url
+    return summarizer
+
+
+def _summarized(app) -> dict:
+    with app.app_context():
+        return dict(db.session.execute(db.select(BlogPost.id, BlogPost.ai_summary)).all())
+
+
+def test_batches_are_multi_input_and_concurrency_is_bounded(app, stub, summarizer, tmp_path):
+    with app.app_context():
+        stats = run_backfill(
+            chunk_size=6, batch_size=3, concurrency=2, resume=False,
+            progress_path=str(tmp_path / "progress.json"), summarizer=summarizer,
+        )
+    assert (stats.processed, stats.summarized, stats.failed) == (POSTS, POSTS, 0)
+    assert [len(batch) for batch in stub.batches] == [3] * (POSTS // 3)
+    assert stub.max_active == 2
+    assert all(summary and summary.startswith("summary:") for summary in _summarized(app).values())
+
+
+def test_resume_restarts_from_first_failed_batch(app, stub, summarizer, post_ids, tmp_path):
+    progress = tmp_path / "progress.json"
+    stub.fail_marker = FAIL_MARKER
+    with app.app_context():
+        stats = run_backfill(
+            chunk_size=6, batch_size=3, concurrency=2, resume=False,
+            progress_path=str(progress), summarizer=summarizer,
+        )
+    # Пакет з 4-м, 5-м і 6-м постами впав; прогрес - перед ним, хоча далі все вдалося
+    failed_batch = post_ids[3:6]
+    assert stats.failed == 3 and stats.first_failed_id == failed_batch[0]
+    assert json.loads(progress.read_text())["last_id"] == failed_batch[0] - 1
+    assert [post_id for post_id, summary in _summarized(app).items() if summary is None] == failed_batch
+
+    stub.reset()
+    with app.app_context():
+        stats = run_backfill(
+            chunk_size=6, batch_size=3, concurrency=2, resume=True,
+            progress_path=str(progress), summarizer=summarizer,
+        )
+    assert stub.sent == 3 and stats.summarized == 3
+    assert all(_summarized(app).values())
+    assert json.loads(progress.read_text())["last_id"] == failed_batch[-1]
+
+
+def test_open_circuit_stops_without_processing_chunk(app, stub, summarizer, post_ids, tmp_path):
+    progress = tmp_path / "progress.json"
+
+    def open_after_first_chunk(stats) -> None:
+        summarizer.breaker.open(60, "test")
+
+    with app.app_context():
+        stats = run_backfill(
+            chunk_size=6, batch_size=3, concurrency=2, resume=False,
+            progress_path=str(progress), summarizer=summarizer, report=open_after_first_chunk,
+        )
+    assert stats.stopped and stats.processed == 6
+    assert json.loads(progress.read_text())["last_id"] == post_ids[5]
+    summaries = _summarized(app)
+    assert all(summaries[post_id] for post_id in post_ids[:6])
+    assert all(summaries[post_id] is None for post_id in post_ids[6:])
+    assert stub.sent == 6
@@ -0,0 +1,42 @@
+"""
+Стрічки без SITE_URL: адреса запиту підставляється під час віддачі,
+тож запити з різними Host не перебудовують готові файли.
+"""
+import os
+
+import pytest
+
+from platform_app.core.feeds import BASE_PLACEHOLDER, feeds
+from tests.conftest import create_post, register
+
+
+@pytest.fixture(scope="module")
+def client(app):
+    author = app.test_client()
+    register(author)
+    create_post(author, "Post for the feeds", "Текст поста для стрічок. " * 10)
+    return app.test_client()
+
+
+def test_hosts_share_one_artifact(client):
+    first = client.get("/feed.xml", base_url="http://one.example")
+    path = os.path.join(feeds.root, "feed.rss")
+    built = os.stat(path).st_mtime_ns
+    second = client.get("/feed.xml", base_url="http://two.example")
+
+    assert os.stat(path).st_mtime_ns == built
+    assert "http://one.example/posts/post-for-the-feeds" in first.text
+    assert "http://two.example/posts/post-for-the-feeds" in second.text
+    assert BASE_PLACEHOLDER not in first.text + second.text
+    assert first.headers["ETag"] != second.headers["ETag"]
+
+    again = client.get("/feed.xml", base_url="http://one.example",
+                       headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304 and not again.data
+
+
+def test_sitemap_links_use_request_host(client):
+    index = client.get("/sitemap.xml", base_url="http://two.example")
+    assert "<loc>http://two.example/sitemap-0.xml</loc>" in index.text
+    chunk = client.get("/sitemap-0.xml", base_url="http://one.example")
+    assert "<loc>http://one.example/posts/post-for-the-feeds</loc>" in chunk.text
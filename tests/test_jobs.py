@@ -0,0 +1,104 @@
+"""
+Черга генерації резюме: непередбачені помилки витрачають спроби, завдання
+закривається після SUMMARY_JOB_MAX_ATTEMPTS, завдання без поста - failed.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from platform_app.ai import jobs
+from platform_app.ai.jobs import STALE_JOB_TIMEOUT, claim_jobs, enqueue_summary, summary_worker
+from platform_app.core.database import db
+from platform_app.models.post import BlogPost
+from platform_app.models.summary_job import SummaryJob
+from tests.conftest import create_post, create_test_app, dispose_app, register
+
+MAX_ATTEMPTS = 3
+
+
+class BrokenSummarizer:
+    """Summarizer, що падає не з SummarizerError"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def request_summary(self, text, max_length=200, min_length=50):
+        self.calls += 1
+        raise RuntimeError("unexpected failure")
+
+    def summarize_fallback(self, text, max_sentences=3):
+        return "fallback summary"
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    app = create_test_app(
+        tmp_path_factory.mktemp("jobs"), SUMMARY_JOB_MAX_ATTEMPTS=MAX_ATTEMPTS, SUMMARY_JOB_RETRY_DELAY=0.0,
+    )
+    client = app.test_client()
+    register(client)
+    create_post(client, "Post for the summary queue", "Текст поста для черги резюме. " * 10)
+    yield app
+    dispose_app(app)
+
+
+@pytest.fixture
+def job_id(app):
+    with app.app_context():
+        db.session.execute(db.delete(SummaryJob))
+        post = db.session.execute(db.select(BlogPost)).scalars().first()
+        job = enqueue_summary(post)
+        db.session.commit()
+        return job.id
+
+
+def _job(app, job_id):
+    with app.app_context():
+        job = db.session.get(SummaryJob, job_id)
+        return job.status, job.attempts, job.last_error, job.post.ai_status
+
+
+def test_unexpected_error_is_retried_then_failed(app, job_id, monkeypatch):
+    summarizer = BrokenSummarizer()
+    monkeypatch.setattr(jobs, "get_summarizer", lambda: summarizer)
+
+    for attempt in range(1, MAX_ATTEMPTS):
+        assert summary_worker.run_pending() == 1
+        status, attempts, last_error, _ = _job(app, job_id)
+        assert (status, attempts) == (SummaryJob.STATUS_PENDING, attempt)
+        assert "unexpected failure" in last_error
+
+    assert summary_worker.run_pending() == 1
+    assert _job(app, job_id)[:2] == (SummaryJob.STATUS_FAILED, MAX_ATTEMPTS)
+    assert _job(app, job_id)[3] == SummaryJob.STATUS_FAILED
+    assert summary_worker.run_pending() == 0
+    assert summarizer.calls == MAX_ATTEMPTS
+
+
+def test_abandoned_job_with_exhausted_attempts_is_failed(app, job_id):
+    with app.app_context():
+        db.session.execute(
+            db.update(SummaryJob).where(SummaryJob.id == job_id).values(
+                status=SummaryJob.STATUS_RUNNING, attempts=MAX_ATTEMPTS,
+                updated_at=datetime.utcnow() - STALE_JOB_TIMEOUT - timedelta(minutes=1),
+            )
+        )
+        db.session.commit()
+
+    assert summary_worker.run_pending() == 0
+    status, _, _, post_status = _job(app, job_id)
+    assert (status, post_status) == (SummaryJob.STATUS_FAILED, SummaryJob.STATUS_FAILED)
+
+
+def test_job_of_deleted_post_is_failed(app, job_id, monkeypatch):
+    summarizer = BrokenSummarizer()
+    monkeypatch.setattr(jobs, "get_summarizer", lambda: summarizer)
+    with app.app_context():
+        # Рядок завдання без поста (як після видалення на SQLite без каскаду FK)
+        db.session.execute(db.update(SummaryJob).where(SummaryJob.id == job_id).values(post_id=-1))
+        db.session.commit()
+        assert claim_jobs(10) == [job_id]
+        jobs.process_job(job_id, app)
+        job = db.session.get(SummaryJob, job_id)
+        assert job.status == SummaryJob.STATUS_FAILED
+    assert summarizer.calls == 0
@@ -0,0 +1,47 @@
+"""
+Доступ до /internal/metrics: Bearer-токен METRICS_TOKEN; без токена - лише в debug з localhost.
+"""
+import pytest
+
+from platform_app.core.metrics import metrics
+from tests.conftest import create_test_app, dispose_app
+
+TOKEN = "metrics-secret"
+
+
+@pytest.fixture
+def make_app(tmp_path_factory):
+    apps = []
+
+    def make(**config):
+        app = create_test_app(tmp_path_factory.mktemp("metrics"), METRICS_ENABLED=True, **config)
+        apps.append(app)
+        return app
+
+    yield make
+    for app in apps:
+        dispose_app(app)
+    metrics.enabled = False
+
+
+def test_token_is_required(make_app):
+    client = make_app(METRICS_TOKEN=TOKEN).test_client()
+    assert client.get("/internal/metrics").status_code == 404
+    assert client.get("/internal/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 404
+    response = client.get("/internal/metrics", headers={"Authorization": f"Bearer {TOKEN}"})
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+
+
+def test_loopback_without_token_is_rejected_outside_debug(make_app):
+    client = make_app(METRICS_TOKEN=None).test_client()
+    # За проксі на тому ж хості remote_addr кожного запиту - 127.0.0.1
+    assert client.get("/internal/metrics", environ_base={"REMOTE_ADDR": "127.0.0.1"}).status_code == 404
+
+
+def test_loopback_without_token_is_allowed_in_debug(make_app):
+    app = make_app(METRICS_TOKEN=None)
+    app.debug = True
+    client = app.test_client()
+    assert client.get("/internal/metrics", environ_base={"REMOTE_ADDR": "127.0.0.1"}).status_code == 200
+    assert client.get("/internal/metrics", environ_base={"REMOTE_ADDR": "203.0.113.5"}).status_code == 404
@@ -0,0 +1,76 @@
+"""
+Кеш сторінок: окремі записи для різних slug/тегів, зарахування переглядів
+з кешу та збереження заголовків відповіді.
+"""
+import pytest
+from flask import make_response
+
+from platform_app.core.database import db
+from platform_app.core.page_cache import page_cache
+from platform_app.models.post import BlogPost
+from tests.conftest import create_post, register
+
+CONTENT = "Текст поста для перевірки кешу сторінок. " * 5
+
+
+@pytest.fixture(scope="module")
+def client(app):
+    @page_cache.cached()
+    def with_headers():
+        response = make_response("headers")
+        response.headers["Cache-Control"] = "public, max-age=120"
+        response.headers["Content-Language"] = "uk"
+        response.headers["Vary"] = "Accept-Language"
+        return response
+
+    app.add_url_rule("/_test/headers", "test_headers", with_headers)
+
+    author = app.test_client()
+    register(author)
+    for number in (3, 4):
+        create_post(author, f"Post number {number} about python", CONTENT + str(number), tags="python")
+    create_post(author, "Post about the web platform", CONTENT + "web", tags="web")
+    return app.test_client()
+
+
+def _view_counts(app) -> dict:
+    with app.app_context():
+        return dict(db.session.execute(db.select(BlogPost.slug, BlogPost.view_count)).all())
+
+
+def test_post_pages_are_cached_per_slug(app, client):
+    first = client.get("/posts/post-number-3-about-python")
+    second = client.get("/posts/post-number-4-about-python")
+    assert first.headers["X-Page-Cache"] == "MISS"
+    assert second.headers["X-Page-Cache"] == "MISS"
+    assert "Post number 3 about python" in first.text
+    assert "Post number 4 about python" in second.text
+
+    again = client.get("/posts/post-number-3-about-python")
+    assert again.headers["X-Page-Cache"] == "HIT"
+    assert again.data == first.data
+
+    views = _view_counts(app)
+    assert views["post-number-3-about-python"] == 2
+    assert views["post-number-4-about-python"] == 1
+
+
+def test_tag_pages_are_cached_per_tag(client):
+    python = client.get("/posts/tag/python")
+    web = client.get("/posts/tag/web")
+    assert web.headers["X-Page-Cache"] == "MISS"
+    assert "Post number 3 about python" in python.text
+    assert "Post number 3 about python" not in web.text
+    assert "Post about the web platform" in web.text
+
+    again = client.get("/posts/tag/web")
+    assert again.headers["X-Page-Cache"] == "HIT"
+    assert again.data == web.data
+
+
+def test_hit_keeps_response_headers(client):
+    miss = client.get("/_test/headers")
+    hit = client.get("/_test/headers")
+    assert (miss.headers["X-Page-Cache"], hit.headers["X-Page-Cache"]) == ("MISS", "HIT")
+    for name in ("Cache-Control", "Content-Language", "Vary", "Content-Type"):
+        assert hit.headers.get(name) == miss.headers.get(name), name
@@ -0,0 +1,33 @@
+"""
+Старі посилання ?page=N на списках постів (шлях OFFSET поряд з курсорами).
+"""
+import pytest
+
+from platform_app.core.config import AppConfig
+from tests.conftest import create_post, create_test_app, dispose_app, register
+
+PER_PAGE = 2
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    app = create_test_app(tmp_path_factory.mktemp("pagination"))
+    author = app.test_client()
+    register(author)
+    for number in range(1, 2 * PER_PAGE + 2):
+        create_post(author, f"Paged post {number}", "Текст поста для пагінації. " * 10, tags="paged")
+    # Views читають AppConfig.POSTS_PER_PAGE під час запиту
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(AppConfig, "POSTS_PER_PAGE", PER_PAGE)
+        yield app.test_client()
+    dispose_app(app)
+
+
+@pytest.mark.parametrize("url", ["/posts/", "/posts/tag/paged"])
+def test_legacy_page_links(client, url):
+    first = client.get(url).text
+    second = client.get(f"{url}?page=2").text
+    last = client.get(f"{url}?page=3").text
+    assert "Paged post 5" in first and "Paged post 3" not in first
+    assert "Paged post 3" in second and "Paged post 5" not in second
+    assert "Paged post 1" in last and "Paged post 2" not in last
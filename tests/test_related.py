@@ -0,0 +1,122 @@
+"""
+Схожі пости: повна перебудова на малому корпусі, інкрементне оновлення та
+видалення поста (без залишків у related_posts, post_vectors і trending).
+"""
+import pytest
+
+from platform_app.core import related
+from platform_app.core.database import db
+from platform_app.models.post import BlogPost
+from platform_app.models.related import PostVector, RelatedPost
+from platform_app.models.trending import PostViewHour, TrendingPost
+from tests.conftest import create_post, register
+
+PYTHON = [
+    ("Python generators and iterators", "Python generators yield values lazily; iterators, itertools and generator expressions in python code."),
+    ("Python decorators explained", "Python decorators wrap functions; closures, functools.wraps and decorator syntax in python code."),
+    ("Python asyncio basics", "Python asyncio runs coroutines; await, event loop and async generators in python code."),
+]
+COOKING = [
+    ("Baking sourdough bread", "Sourdough bread needs flour, water, salt and a starter; bake the loaf in a hot oven."),
+    ("Homemade pizza dough", "Pizza dough needs flour, water, yeast and salt; bake the pizza in a very hot oven."),
+    ("Simple tomato soup", "Tomato soup with garlic, onion, olive oil and basil; simmer the soup and season with salt."),
+]
+
+
+@pytest.fixture(scope="module")
+def corpus(app):
+    client = app.test_client()
+    register(client)
+    for title, content in PYTHON:
+        create_post(client, title, content * 3, tags="python")
+    for title, content in COOKING:
+        create_post(client, title, content * 3, tags="cooking")
+    with app.app_context():
+        ids = dict(db.session.execute(db.select(BlogPost.title, BlogPost.id)).all())
+        related.rebuild_related(workers=1)
+    return client, [ids[title] for title, _ in PYTHON], [ids[title] for title, _ in COOKING]
+
+
+def _lists(app) -> dict:
+    with app.app_context():
+        lists = {}
+        for row in db.session.execute(
+            db.select(RelatedPost.post_id, RelatedPost.rank, RelatedPost.related_id)
+            .order_by(RelatedPost.post_id, RelatedPost.rank)
+        ):
+            lists.setdefault(row.post_id, []).append((row.rank, row.related_id))
+        return lists
+
+
+def _assert_consistent(lists: dict) -> None:
+    for owner, entries in lists.items():
+        ranks = [rank for rank, _ in entries]
+        neighbors = [related_id for _, related_id in entries]
+        assert ranks == list(range(len(entries))), owner
+        assert owner not in neighbors and len(set(neighbors)) == len(neighbors), owner
+
+
+def test_rebuild_finds_obviously_similar_posts(app, corpus):
+    _, python_ids, cooking_ids = corpus
+    lists = _lists(app)
+    _assert_consistent(lists)
+    for group in (python_ids, cooking_ids):
+        for post_id in group:
+            top = [related_id for _, related_id in lists[post_id][:2]]
+            assert sorted(top) == sorted(other for other in group if other != post_id), post_id
+
+
+def test_update_then_remove_keeps_other_lists_consistent(app, corpus):
+    client, python_ids, _ = corpus
+    create_post(client, "Python type hints", ("Python type hints annotate functions; typing, generics and "
+                                              "mypy checks in python code. ") * 3, tags="python")
+    with app.app_context():
+        post_id = db.session.execute(
+            db.select(BlogPost.id).where(BlogPost.title == "Python type hints")
+        ).scalar_one()
+        # Сигнал post_changed уже оновив сусідів; повторний виклик нічого не змінює
+        assert related.update_post(post_id) == []
+        db.session.commit()
+
+    lists = _lists(app)
+    _assert_consistent(lists)
+    assert {related_id for _, related_id in lists[post_id][:3]} == set(python_ids)
+    assert all(post_id in [related_id for _, related_id in lists[other]] for other in python_ids)
+
+    with app.app_context():
+        changed = related.remove_post(post_id)
+        db.session.commit()
+        assert set(python_ids) <= set(changed)
+        assert db.session.get(PostVector, post_id) is None
+
+    lists = _lists(app)
+    _assert_consistent(lists)
+    assert post_id not in lists
+    assert all(post_id not in [related_id for _, related_id in entries] for entries in lists.values())
+    for other in python_ids:
+        top = [related_id for _, related_id in lists[other][:2]]
+        assert sorted(top) == sorted(python_id for python_id in python_ids if python_id != other)
+
+
+def test_delete_route_removes_related_and_trending_rows(app, corpus):
+    client, python_ids, _ = corpus
+    post_id = python_ids[0]
+    with app.app_context():
+        slug = db.session.get(BlogPost, post_id).slug
+    assert client.get(f"/posts/{slug}").status_code == 200
+    with app.app_context():
+        assert db.session.execute(
+            db.select(TrendingPost.post_id).where(TrendingPost.post_id == post_id)
+        ).scalar() == post_id
+
+    assert client.post(f"/posts/{slug}/delete").status_code == 302
+
+    with app.app_context():
+        for statement in (
+            db.select(RelatedPost).where((RelatedPost.post_id == post_id) | (RelatedPost.related_id == post_id)),
+            db.select(PostVector).where(PostVector.post_id == post_id),
+            db.select(TrendingPost).where(TrendingPost.post_id == post_id),
+            db.select(PostViewHour).where(PostViewHour.post_id == post_id),
+        ):
+            assert db.session.execute(statement).first() is None, statement
+    _assert_consistent(_lists(app))
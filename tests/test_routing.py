@@ -0,0 +1,146 @@
+"""
+Маршрутизація читань на репліку: дві тимчасові SQLite БД (основна та replica_0).
+
+Рядок test:primary є лише в основній БД, тож відповідь view (кількість
+рядків) показує, з якої БД він читав: 1 - основна, 0 - репліка.
+"""
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy import func
+
+from platform_app.core.database import db
+from platform_app.core.routing import STICKY_SESSION_KEY, replica_router
+from platform_app.models.rollups import PlatformCounter
+from tests.conftest import create_test_app, dispose_app
+
+TEST_PREFIX = "test:"
+
+
+def _count_rows() -> str:
+    return str(db.session.execute(
+        db.select(func.count()).select_from(PlatformCounter)
+        .where(PlatformCounter.name.startswith(TEST_PREFIX))
+    ).scalar_one())
+
+
+def _add_test_routes(app) -> None:
+    @replica_router.replica_reads
+    def replica_count():
+        return _count_rows()
+
+    @replica_router.replica_reads
+    def primary_block_count():
+        with replica_router.primary():
+            return _count_rows()
+
+    @replica_router.replica_reads
+    def primary_option_count():
+        return str(db.session.execute(
+            db.select(func.count()).select_from(PlatformCounter)
+            .where(PlatformCounter.name.startswith(TEST_PREFIX))
+            .execution_options(primary=True)
+        ).scalar_one())
+
+    def write_row():
+        db.session.add(PlatformCounter(name=f"{TEST_PREFIX}{time.time_ns()}", value=1))
+        db.session.commit()
+        return "ok"
+
+    app.add_url_rule("/_test/count", "test_count", replica_count)
+    app.add_url_rule("/_test/primary-block", "test_primary_block", primary_block_count)
+    app.add_url_rule("/_test/primary-option", "test_primary_option", primary_option_count)
+    app.add_url_rule("/_test/write", "test_write", write_row, methods=["POST"])
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    root = tmp_path_factory.mktemp("routing")
+    primary_path, replica_path = root / "primary.db", root / "replica.db"
+    app = create_test_app(
+        root,
+        migrate=False,
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{primary_path}",
+        SQLALCHEMY_BINDS={"replica_0": f"sqlite:///{replica_path}"},
+        REPLICA_STICKY_SECONDS=60.0,
+        PAGE_CACHE_BACKEND="none",
+    )
+    _add_test_routes(app)
+
+    with app.app_context():
+        db.create_all(bind_key=None)
+        # Репліка - копія основної БД до появи тестового рядка
+        source, target = sqlite3.connect(primary_path), sqlite3.connect(replica_path)
+        source.backup(target)
+        source.close()
+        target.close()
+        db.session.add(PlatformCounter(name=f"{TEST_PREFIX}primary", value=1))
+        db.session.commit()
+
+    app.replica_path = replica_path
+    yield app
+    dispose_app(app)
+
+
+@pytest.fixture
+def client(app):
+    replica_router._down_until.clear()
+    for name in replica_router.stats:
+        replica_router.stats[name] = 0
+    with app.app_context():
+        db.session.execute(
+            db.delete(PlatformCounter).where(PlatformCounter.name != f"{TEST_PREFIX}primary")
+        )
+        db.session.commit()
+    return app.test_client()
+
+
+def test_replica_reads_go_to_replica(client):
+    assert client.get("/_test/count").text == "0"
+    assert replica_router.stats["replica_reads"] == 1
+
+
+def test_primary_block_and_option_override_replica(client):
+    assert client.get("/_test/primary-block").text == "1"
+    assert client.get("/_test/primary-option").text == "1"
+    assert replica_router.stats["replica_reads"] == 0
+
+
+def test_session_sticks_to_primary_after_write(client):
+    assert client.post("/_test/write").text == "ok"
+    with client.session_transaction() as sess:
+        assert sess[STICKY_SESSION_KEY] > time.time()
+
+    # Щойно записаний рядок видно: читання з основної БД
+    assert client.get("/_test/count").text == "2"
+
+    with client.session_transaction() as sess:
+        sess[STICKY_SESSION_KEY] = time.time() - 1
+    assert client.get("/_test/count").text == "0"
+    with client.session_transaction() as sess:
+        assert STICKY_SESSION_KEY not in sess
+
+
+def test_marked_down_replica_falls_back_to_primary(client):
+    replica_router.mark_down("replica_0", "test")
+    assert replica_router.is_down("replica_0")
+    assert client.get("/_test/count").text == "1"
+    assert replica_router.stats["primary_fallbacks"] == 1
+
+    replica_router._down_until.clear()
+    assert client.get("/_test/count").text == "0"
+
+
+def test_failed_replica_view_is_retried_on_primary(app, client):
+    replica = sqlite3.connect(app.replica_path)
+    replica.execute("ALTER TABLE platform_counters RENAME TO platform_counters_hidden")
+    replica.commit()
+    try:
+        assert client.get("/_test/count").text == "1"
+        assert replica_router.stats["retries"] == 1
+        assert replica_router.is_down("replica_0")
+    finally:
+        replica.execute("ALTER TABLE platform_counters_hidden RENAME TO platform_counters")
+        replica.commit()
+        replica.close()
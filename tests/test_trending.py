@@ -0,0 +1,31 @@
+"""
+Популярне зараз: умовні запити до /posts/trending (ETag за top-K та updated_at).
+"""
+import pytest
+
+from tests.conftest import create_post, register
+
+
+@pytest.fixture(scope="module")
+def client(app):
+    author = app.test_client()
+    register(author)
+    for number in (1, 2):
+        create_post(author, f"Trending post {number}", "Текст популярного поста. " * 10)
+    return app.test_client()
+
+
+def test_trending_is_revalidated_by_top_posts(client):
+    client.get("/posts/trending-post-1")
+    first = client.get("/posts/trending")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and "Trending post 1" in first.text
+
+    again = client.get("/posts/trending", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and not again.data
+
+    # Новий перегляд змінює рейтинг - старий ETag більше не підходить
+    client.get("/posts/trending-post-2")
+    changed = client.get("/posts/trending", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert "Trending post 2" in changed.text